@@ -0,0 +1,67 @@
+"""
+Compare two pytest-benchmark JSON files and flag regressions
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 10]
+        [--stat median]
+
+Exits with status 1 if any benchmark present in both files got slower by more than
+the threshold (in percent) on the chosen statistic.
+
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict
+
+
+def load(path: str, stat: str) -> Dict[str, float]:
+    """Load the chosen statistic of each benchmark in a pytest-benchmark JSON file"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {bench["fullname"]: bench["stats"][stat] for bench in data["benchmarks"]}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline", help="baseline results saved by --benchmark-save")
+    parser.add_argument("current", help="current results saved by --benchmark-save")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="slowdown in percent above which a benchmark is flagged (default: 10)",
+    )
+    parser.add_argument(
+        "--stat",
+        default="median",
+        choices=("min", "median", "mean"),
+        help="statistic to compare (default: median)",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load(args.baseline, args.stat)
+    current = load(args.current, args.stat)
+    regressions = 0
+    width = max((len(name) for name in current), default=0)
+    for name in sorted(current):
+        if name not in baseline:
+            print(f"{name:<{width}}  {current[name]:12.6f}s  (new)")
+            continue
+        change = 100.0 * (current[name] / baseline[name] - 1.0)
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<{width}}  {current[name]:12.6f}s  {change:+7.1f}%{flag}")
+    for name in sorted(set(baseline) - set(current)):
+        print(f"{name:<{width}}  (missing)")
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed by more than {args.threshold}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from explorecourses import CourseParser
+from explorecourses.synthetic import SyntheticCatalog
+
+# Catalog sizes in number of courses; a real catalog year has about 13,000 courses
+SIZES = [
+    int(size)
+    for size in os.environ.get("EXPLORECOURSES_BENCH_SIZES", "1000,13000").split(",")
+]
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}courses")
+def catalog(request):
+    return SyntheticCatalog(request.param, seed=0)
+
+
+@pytest.fixture(scope="session")
+def document(catalog):
+    return catalog.document()
+
+
+@pytest.fixture(scope="session")
+def courses(document):
+    return CourseParser(maxsize=0).parse(document)
@@ -0,0 +1,60 @@
+from operator import attrgetter
+
+import pytest
+
+from explorecourses import Course, TermIndex, merge_crosslistings
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_merge_crosslistings(benchmark, courses):
+    benchmark(merge_crosslistings, courses)
+
+
+def test_hash_courses(benchmark, courses):
+    benchmark(lambda: set(courses))
+
+
+def test_sort_courses(benchmark, courses):
+    shuffled = sorted(courses, key=Course.__hash__)
+
+    benchmark(sorted, shuffled)
+
+
+def test_sort_by_enrollment(benchmark, courses):
+    for course in courses:
+        course.num_enrolled
+
+    benchmark(sorted, courses, key=attrgetter("num_enrolled"))
+
+
+def test_sort_by_enrollment_uncached(benchmark, courses):
+    # Walking the sections for every sort, as before the aggregates were cached
+    benchmark(
+        sorted,
+        courses,
+        key=lambda course: sum(section.num_enrolled for section in course.sections),
+    )
+
+
+def test_term_index(benchmark, courses):
+    benchmark(TermIndex, courses)
+
+
+def test_term_query(benchmark, courses):
+    # Sections of each course offered in the busiest term, from the partition
+    index = TermIndex(courses)
+    term = max(index, key=len)
+
+    benchmark(lambda: [term.sections(course) for course in term])
+
+
+def test_term_query_scan(benchmark, courses):
+    # The same query, filtering every course's sections on the fly
+    term_id = max(TermIndex(courses), key=len).term_id
+
+    def query():
+        sections = ([s for s in c.sections if s.term_id == term_id] for c in courses)
+        return [found for found in sections if found]
+
+    benchmark(query)
@@ -0,0 +1,40 @@
+import pytest
+
+from explorecourses import CourseConnection
+from explorecourses.fixture_server import FixtureServer
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module")
+def server(catalog):
+    with FixtureServer(catalog.documents) as server:
+        for subject in catalog.subjects:
+            catalog.document(subject)
+        yield server
+
+
+def crawl(connection):
+    return sum(len(courses) for _, courses in connection.crawl())
+
+
+def test_crawl_cold(benchmark, server):
+    benchmark.pedantic(
+        lambda: crawl(CourseConnection(server.url, cache=False, memo_size=0)),
+        rounds=3,
+    )
+
+
+def test_crawl_warm(benchmark, server):
+    connection = CourseConnection(server.url)
+    crawl(connection)
+
+    benchmark.pedantic(crawl, args=(connection,), rounds=3)
+
+
+def test_crawl_pipeline(benchmark, server):
+    def crawl_pipeline():
+        connection = CourseConnection(server.url, cache=False, memo_size=0)
+        return sum(len(courses) for _, courses in connection.crawl(pipeline=True))
+
+    benchmark.pedantic(crawl_pipeline, rounds=3)
@@ -0,0 +1,47 @@
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from explorecourses import Course, CourseParser
+from explorecourses.synthetic import SyntheticCatalog
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_course_from_xml(benchmark):
+    catalog = SyntheticCatalog(100, seed=0)
+    elements = [
+        ET.fromstring(element)
+        for i in range(100)
+        for element in catalog.course_elements(i)
+    ]
+
+    benchmark(lambda: [Course.from_xml(elem) for elem in elements])
+
+
+def test_parse_document(benchmark, document):
+    benchmark(lambda: CourseParser(maxsize=0).parse(document))
+
+
+def test_parse_document_etree(benchmark, document):
+    # The approach CourseConnection took before CourseParser, for reference
+    benchmark(
+        lambda: [
+            Course.from_xml(course)
+            for course in ET.fromstring(document).findall(".//course")
+        ]
+    )
+
+
+def test_parse_document_memoized(benchmark, document):
+    parser = CourseParser()
+    parser.parse(document)
+
+    benchmark(parser.parse, document)
+
+
+def test_parse_document_chunks(benchmark, document):
+    # As CourseConnection parses a response while it downloads
+    chunks = [document[i:i + 65536] for i in range(0, len(document), 65536)]
+
+    benchmark(lambda: CourseParser(maxsize=0).parse_chunks(chunks))
@@ -0,0 +1,54 @@
+from dataclasses import fields, is_dataclass
+import io
+import json
+
+import pytest
+
+from explorecourses import Course, Pool, merge_crosslistings
+from explorecourses.serialization import dumps, load_jsonl, write_jsonl
+
+pytest.importorskip("pytest_benchmark")
+
+
+def _generic(value):
+    # dataclasses.asdict cannot rebuild frozensets of dicts, so a generic
+    # serializer has to walk the fields itself
+    if is_dataclass(value):
+        return {f.name: _generic(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, (frozenset, tuple)):
+        return [_generic(item) for item in value]
+    return value
+
+
+def test_dumps(benchmark, courses):
+    benchmark(lambda: [dumps(course) for course in courses])
+
+
+def test_dumps_generic(benchmark, courses):
+    benchmark(lambda: [json.dumps(_generic(course)) for course in courses])
+
+
+def test_dumps_merged(benchmark, courses):
+    merged = merge_crosslistings(courses)
+
+    benchmark(lambda: [dumps(course) for course in merged])
+
+
+def test_write_jsonl(benchmark, courses):
+    benchmark(lambda: write_jsonl(courses, io.StringIO()))
+
+
+def test_load_jsonl(benchmark, courses):
+    buffer = io.StringIO()
+    write_jsonl(courses, buffer)
+    text = buffer.getvalue()
+
+    benchmark(lambda: load_jsonl(io.StringIO(text), Course))
+
+
+def test_load_jsonl_pooled(benchmark, courses):
+    buffer = io.StringIO()
+    write_jsonl(courses, buffer)
+    text = buffer.getvalue()
+
+    benchmark(lambda: load_jsonl(io.StringIO(text), Course, Pool()))
@@ -1,6 +1,7 @@
 """Stanford ExploreCourses API"""
 
 from explorecourses.course_connection import CourseConnection
+from explorecourses.transport import Transport, RequestsTransport
 from explorecourses.classes import (
     Course,
     LearningObjective,
@@ -12,8 +13,34 @@ from explorecourses.classes import (
     Tag,
     School,
     Department,
+    Pool,
+    SectionAggregates,
+    days_to_mask,
+    DecodeError,
+    DecodeWarning,
+)
+from explorecourses.merged_course import MergedCourse, MergedIndex, merge_crosslistings
+from explorecourses.crawl import Checkpoint, CrawlUnit
+from explorecourses.parsing import CourseParser
+from explorecourses.metrics import Metrics, MetricsTotals, PrometheusMetrics
+from explorecourses.indexes import (
+    CrosslistIndex,
+    InstructorIndex,
+    TermIndex,
+    TermView,
+)
+from explorecourses.rooms import Room, RoomIndex
+from explorecourses.requirements import RequirementIndex
+from explorecourses.multiyear import MultiYearCatalog
+from explorecourses.diff import (
+    diff,
+    CatalogDiff,
+    CourseChange,
+    SectionChange,
+    FieldChange,
+    EnrollmentChange,
+    enrollment_changes,
 )
-from explorecourses.merged_course import MergedCourse, merge_crosslistings
 
 __version__ = "2.0.0"
 
@@ -23,7 +50,10 @@ __author__ = (
 
 __all__ = [
     "CourseConnection",
+    "Transport",
+    "RequestsTransport",
     "MergedCourse",
+    "MergedIndex",
     "Course",
     "LearningObjective",
     "Section",
@@ -34,5 +64,31 @@ __all__ = [
     "Tag",
     "School",
     "Department",
+    "Pool",
+    "SectionAggregates",
+    "days_to_mask",
+    "DecodeError",
+    "DecodeWarning",
     "merge_crosslistings",
+    "Checkpoint",
+    "CrawlUnit",
+    "CourseParser",
+    "Metrics",
+    "MetricsTotals",
+    "PrometheusMetrics",
+    "CrosslistIndex",
+    "InstructorIndex",
+    "TermIndex",
+    "TermView",
+    "Room",
+    "RoomIndex",
+    "RequirementIndex",
+    "MultiYearCatalog",
+    "diff",
+    "CatalogDiff",
+    "CourseChange",
+    "SectionChange",
+    "FieldChange",
+    "EnrollmentChange",
+    "enrollment_changes",
 ]
@@ -0,0 +1,5 @@
+import sys
+
+from explorecourses.cli import main
+
+sys.exit(main())
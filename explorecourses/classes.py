@@ -16,11 +16,195 @@ Includes:
 """
 
 from dataclasses import dataclass
-from functools import total_ordering
+from functools import cached_property, total_ordering
 import html
-from typing import FrozenSet, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+import warnings
 from xml.etree.ElementTree import Element
 
+H = TypeVar("H", bound=Hashable)
+
+_DAY_BITS = {
+    day: 1 << i
+    for i, day in enumerate(
+        (
+            "Monday",
+            "Tuesday",
+            "Wednesday",
+            "Thursday",
+            "Friday",
+            "Saturday",
+            "Sunday",
+        )
+    )
+}
+
+
+class Pool:
+    """
+    Content-addressed pool of immutable values
+
+    Calling the pool with a value returns the first equal value that was passed to it,
+    such that equal values parsed from different records share a single object.
+
+    A bounded pool is emptied when it is full, and refills with the values seen
+    from then on. Values that were shared before are still valid, they merely stop
+    being shared with new ones.
+
+    Args:
+        maxsize (Optional[int]): Maximum number of values to hold. Defaults to None,
+            which never empties the pool.
+
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize
+        self._values: Dict[Hashable, Hashable] = {}
+
+    def __call__(self, value: H) -> H:
+        values = self._values
+        pooled = values.get(value)
+        if pooled is None:
+            if self.maxsize is not None and len(values) >= self.maxsize:
+                values.clear()
+            values[value] = pooled = value
+        return pooled
+
+    def __len__(self):
+        return len(self._values)
+
+    def clear(self):
+        """Forget all pooled values"""
+        self._values.clear()
+
+
+def _unpooled(value: H) -> H:
+    return value
+
+
+class DecodeError(ValueError):
+    """A required field of an XML record is missing or malformed"""
+
+    def __init__(self, record: str, tag: str, text: Optional[str]):
+        super().__init__(f"<{record}> has an invalid <{tag}>: {text!r}")
+        self.record = record
+        self.tag = tag
+        self.text = text
+
+
+class DecodeWarning(UserWarning):
+    """A field of an XML record was defaulted, or a record was skipped"""
+
+
+# Marks a field without a default, whose record cannot be decoded without it
+_REQUIRED = object()
+
+# Errors that converting the text of a field may raise, e.g., int("") or None.split()
+_CONVERSION_ERRORS = (AttributeError, TypeError, ValueError)
+
+# A field decoded from the text of a child element: (name, tag, converter, default).
+# The converter receives the text of the child, or None if there is no such child. A
+# converter of None takes the text as is.
+_Field = Tuple[str, str, Optional[Callable[[Optional[str]], Any]], Any]
+
+
+class _FieldTable:
+    """
+    Decodes the children of an element field by field, according to a table
+
+    This is the slow path for records that fail to decode directly: a field that is
+    missing or fails to convert takes its default, with a DecodeWarning, or raises
+    DecodeError if it is required.
+
+    Args:
+        fields (Tuple[_Field, ...]): The fields to decode
+
+    """
+
+    def __init__(self, fields: Tuple[_Field, ...]):
+        self.fields = fields
+
+    def decode(self, elem: Element) -> Dict[str, Any]:
+        """
+        Decode the fields of an element
+
+        Args:
+            elem (Element): The element whose children hold the fields
+
+        Returns:
+            Dict[str, Any]: The value of each field by name
+
+        """
+        return {field[0]: self._convert(elem, field) for field in self.fields}
+
+    @staticmethod
+    def _convert(elem: Element, field: _Field) -> Any:
+        _, tag, convert, default = field
+        text = elem.findtext(tag)
+        if convert is None:
+            return text
+        try:
+            return convert(text)
+        except _CONVERSION_ERRORS:
+            if default is _REQUIRED:
+                raise DecodeError(elem.tag, tag, text) from None
+            warnings.warn(
+                f"<{elem.tag}> has an invalid <{tag}>: {text!r}; using {default!r}",
+                DecodeWarning,
+            )
+            return default
+
+
+def _children(elem: Element, tag: str) -> Iterable[Element]:
+    """The children of the child with a tag, or none if there is no such child"""
+    child = elem.find(tag)
+    return () if child is None else child
+
+
+def _unescape_twice(text: str) -> str:
+    # Descriptions are escaped twice in the XML, but most contain no entities at all
+    if "&" not in text:
+        return text
+    return html.unescape(html.unescape(text))
+
+
+def _minutes(clock: str) -> Optional[int]:
+    """Convert a time such as "1:30:00 PM" to minutes past midnight"""
+    try:
+        hms, meridiem = clock.split()
+        hour, minute = hms.split(":")[:2]
+        hour = int(hour) % 12 + (12 if meridiem.upper() == "PM" else 0)
+        return 60 * hour + int(minute)
+    except (AttributeError, ValueError):
+        return None
+
+
+def days_to_mask(days: Iterable[str]) -> int:
+    """
+    Convert names of days to a bit mask, with Monday as the lowest bit
+
+    Args:
+        days (Iterable[str]): Names of days, e.g., ("Monday", "Wednesday")
+
+    Returns:
+        int: The bit mask; unknown names are ignored
+
+    """
+    mask = 0
+    for day in days:
+        mask |= _DAY_BITS.get(day, 0)
+    return mask
+
 
 def _bool_or_none(condition: str, true: str, false: str) -> Optional[bool]:
     if condition == true:
@@ -126,16 +310,21 @@ class Schedule:
     instructors: FrozenSet[Instructor]
 
     @classmethod
-    def from_xml(cls, elem: Element):
-        """Construct new Schedule from an XML element"""
+    def from_xml(cls, elem: Element, pool: Optional[Callable[[H], H]] = None):
+        """Construct new Schedule from an XML element, sharing values from a pool"""
+        if pool is None:
+            pool = _unpooled
         return cls(
             elem.findtext("startDate"),
             elem.findtext("endDate"),
             elem.findtext("startTime"),
             elem.findtext("endTime"),
             elem.findtext("location"),
-            tuple(elem.findtext("days").split()),
-            frozenset(Instructor.from_xml(instr) for instr in elem.find("instructors")),
+            tuple((elem.findtext("days") or "").split()),
+            frozenset(
+                pool(Instructor.from_xml(instr))
+                for instr in _children(elem, "instructors")
+            ),
         )
 
 
@@ -191,34 +380,79 @@ class Section:
     attributes: FrozenSet[Attribute]
 
     @classmethod
-    def from_xml(cls, elem: Element):
-        """Construct new Section from an XML element"""
-        return cls(
-            int(elem.findtext("classId")),
-            elem.findtext("term"),
-            int(elem.findtext("termId")),
-            elem.findtext("subject"),
-            elem.findtext("code"),
-            elem.findtext("units"),
-            elem.findtext("sectionNumber"),
-            elem.findtext("component"),
-            int(elem.findtext("numEnrolled")),
-            int(elem.findtext("maxEnrolled")),
-            int(elem.findtext("numWaitlist")),
-            int(elem.findtext("maxWaitlist")),
-            elem.findtext("enrollStatus"),
-            elem.findtext("addConsent"),
-            elem.findtext("dropConsent"),
-            elem.findtext("instructionMode"),
-            int(elem.findtext("courseId")),
-            frozenset(Schedule.from_xml(sched) for sched in elem.find("schedules")),
-            # int(elem.findtext("currentClassSize")),  # Redundant, possibly deprecated
-            # int(elem.findtext("maxClassSize")),
-            # int(elem.findtext("currentWaitlistSize")),
-            # int(elem.findtext("maxWaitlistSize")),
-            elem.findtext("notes"),
-            frozenset(Attribute.from_xml(attr) for attr in elem.find("attributes")),
+    def from_xml(cls, elem: Element, pool: Optional[Callable[[H], H]] = None):
+        """
+        Construct new Section from an XML element, sharing values from a pool
+
+        Raises:
+            DecodeError: If the class, term or course id is missing or malformed
+
+        """
+        if pool is None:
+            pool = _unpooled
+        schedules = frozenset(
+            Schedule.from_xml(sched, pool) for sched in _children(elem, "schedules")
         )
+        attributes = pool(
+            frozenset(
+                pool(Attribute.from_xml(attr))
+                for attr in _children(elem, "attributes")
+            )
+        )
+        try:
+            return cls(
+                int(elem.findtext("classId")),
+                elem.findtext("term"),
+                int(elem.findtext("termId")),
+                elem.findtext("subject"),
+                elem.findtext("code"),
+                elem.findtext("units"),
+                elem.findtext("sectionNumber"),
+                elem.findtext("component"),
+                int(elem.findtext("numEnrolled")),
+                int(elem.findtext("maxEnrolled")),
+                int(elem.findtext("numWaitlist")),
+                int(elem.findtext("maxWaitlist")),
+                elem.findtext("enrollStatus"),
+                elem.findtext("addConsent"),
+                elem.findtext("dropConsent"),
+                elem.findtext("instructionMode"),
+                int(elem.findtext("courseId")),
+                schedules,
+                # int(elem.findtext("currentClassSize")),  # Redundant, possibly
+                # int(elem.findtext("maxClassSize")),      # deprecated
+                # int(elem.findtext("currentWaitlistSize")),
+                # int(elem.findtext("maxWaitlistSize")),
+                elem.findtext("notes"),
+                attributes,
+            )
+        except _CONVERSION_ERRORS:
+            fields = _SECTION_FIELDS.decode(elem)
+            return cls(schedules=schedules, attributes=attributes, **fields)
+
+
+_SECTION_FIELDS = _FieldTable((
+    ("class_id", "classId", int, _REQUIRED),
+    ("term", "term", None, None),
+    ("term_id", "termId", int, _REQUIRED),
+    ("subject", "subject", None, None),
+    ("code", "code", None, None),
+    ("units", "units", None, None),
+    ("section_number", "sectionNumber", None, None),
+    ("component", "component", None, None),
+    ("num_enrolled", "numEnrolled", int, 0),
+    ("max_enrolled", "maxEnrolled", int, 0),
+    ("num_waitlist", "numWaitlist", int, 0),
+    ("max_waitlist", "maxWaitlist", int, 0),
+    ("enroll_status", "enrollStatus", None, None),
+    ("add_consent", "addConsent", None, None),
+    ("drop_consent", "dropConsent", None, None),
+    ("instruction_mode", "instructionMode", None, None),
+    ("course_id", "courseId", int, _REQUIRED),
+    # currentClassSize, maxClassSize, currentWaitlistSize and maxWaitlistSize are
+    # redundant, possibly deprecated
+    ("notes", "notes", None, None),
+))
 
 
 @dataclass(frozen=True)
@@ -239,20 +473,55 @@ class AdministrativeInformation:
 
     @classmethod
     def from_xml(cls, elem: Element):
-        """Construct new AdministrativeInformation from an XML element"""
-        return cls(
-            int(elem.findtext("courseId")),
-            elem.findtext("effectiveStatus"),
-            int(elem.findtext("offerNumber")),
-            elem.findtext("academicGroup"),
-            elem.findtext("academicOrganization"),
-            elem.findtext("academicCareer"),
-            _bool_or_none(elem.findtext("finalExamFlag"), "Y", "N"),
-            elem.findtext("catalogPrint") == "Y",
-            elem.findtext("schedulePrint") == "Y",
-            int(elem.findtext("maxUnitsRepeat")),
-            int(elem.findtext("maxTimesRepeat")),
-        )
+        """
+        Construct new AdministrativeInformation from an XML element
+
+        Raises:
+            DecodeError: If the course id is missing or malformed
+
+        """
+        try:
+            return cls(
+                int(elem.findtext("courseId")),
+                elem.findtext("effectiveStatus"),
+                int(elem.findtext("offerNumber")),
+                elem.findtext("academicGroup"),
+                elem.findtext("academicOrganization"),
+                elem.findtext("academicCareer"),
+                _bool_or_none(elem.findtext("finalExamFlag"), "Y", "N"),
+                elem.findtext("catalogPrint") == "Y",
+                elem.findtext("schedulePrint") == "Y",
+                int(elem.findtext("maxUnitsRepeat")),
+                int(elem.findtext("maxTimesRepeat")),
+            )
+        except _CONVERSION_ERRORS:
+            return cls(**_ADMINISTRATIVE_INFORMATION_FIELDS.decode(elem))
+
+
+def _decode_sections(elem: Element, pool: Callable[[H], H]) -> FrozenSet[Section]:
+    """Decode the <section> children of an element, skipping invalid sections"""
+    sections = []
+    for child in elem:
+        try:
+            sections.append(Section.from_xml(child, pool))
+        except DecodeError as exc:
+            warnings.warn(f"skipping section: {exc}", DecodeWarning)
+    return frozenset(sections)
+
+
+_ADMINISTRATIVE_INFORMATION_FIELDS = _FieldTable((
+    ("course_id", "courseId", int, _REQUIRED),
+    ("effective_status", "effectiveStatus", None, None),
+    ("offer_number", "offerNumber", int, 1),
+    ("academic_group", "academicGroup", None, None),
+    ("academic_organization", "academicOrganization", None, None),
+    ("academic_career", "academicCareer", None, None),
+    ("final_exam_flag", "finalExamFlag", lambda t: _bool_or_none(t, "Y", "N"), None),
+    ("catalog_print", "catalogPrint", lambda t: t == "Y", False),
+    ("schedule_print", "schedulePrint", lambda t: t == "Y", False),
+    ("max_units_repeat", "maxUnitsRepeat", int, 0),
+    ("max_times_repeat", "maxTimesRepeat", int, 0),
+))
 
 
 @dataclass(frozen=True)
@@ -268,16 +537,83 @@ class Tag:
         return cls(elem.findtext("organization"), elem.findtext("name"))
 
 
+class SectionAggregates:
+    """
+    Values derived from the sections of a course, for sorting and filtering
+
+    Each value is computed on first access and cached, which is safe since courses
+    are immutable. Subclasses provide the sections.
+
+    """
+
+    sections: FrozenSet["Section"]
+
+    @cached_property
+    def terms(self) -> FrozenSet[str]:
+        """Terms in which the course has sections, e.g., 2017-2018 Autumn"""
+        return frozenset(section.term for section in self.sections)
+
+    @cached_property
+    def term_ids(self) -> FrozenSet[int]:
+        """Ids of the terms in which the course has sections"""
+        return frozenset(section.term_id for section in self.sections)
+
+    @cached_property
+    def num_enrolled(self) -> int:
+        """Total enrollment over all sections"""
+        return sum(section.num_enrolled for section in self.sections)
+
+    @cached_property
+    def max_enrolled(self) -> int:
+        """Total capacity over all sections"""
+        return sum(section.max_enrolled for section in self.sections)
+
+    @cached_property
+    def components(self) -> FrozenSet[str]:
+        """Components of the sections, e.g., LEC and DIS"""
+        return frozenset(section.component for section in self.sections)
+
+    @cached_property
+    def days_mask(self) -> int:
+        """Days on which any section meets, as a bit mask; see days_to_mask"""
+        return days_to_mask(
+            day
+            for section in self.sections
+            for schedule in section.schedules
+            for day in schedule.days
+        )
+
+    @cached_property
+    def instructors(self) -> FrozenSet["Instructor"]:
+        """Instructors of all sections"""
+        return frozenset(
+            instructor
+            for section in self.sections
+            for schedule in section.schedules
+            for instructor in schedule.instructors
+        )
+
+    @cached_property
+    def earliest_start(self) -> Optional[int]:
+        """Earliest start time of any meeting in minutes past midnight, if any"""
+        starts = [
+            _minutes(schedule.start_time)
+            for section in self.sections
+            for schedule in section.schedules
+        ]
+        return min((start for start in starts if start is not None), default=None)
+
+
 @total_ordering
 @dataclass(frozen=True)
-class Course:
+class Course(SectionAggregates):
     """A course from the catalog"""
 
     year: str
     subject: str
     code: str
     title: str
-    description: str
+    raw_description: str
     gers: FrozenSet[str]
     repeatable: bool
     grading: str
@@ -291,28 +627,73 @@ class Course:
     tags: FrozenSet[Tag]
 
     @classmethod
-    def from_xml(cls, elem: Element):
-        """Construct new AdministrativeInformation from an XML element"""
-        return cls(
-            elem.findtext("year"),
-            elem.findtext("subject"),
-            elem.findtext("code"),
-            elem.findtext("title"),
-            html.unescape(html.unescape(elem.findtext("description"))),
-            frozenset(elem.findtext("gers").split(", ")),
-            elem.findtext("repeatable") == "true",
-            elem.findtext("grading"),
-            int(elem.findtext("unitsMin")),
-            int(elem.findtext("unitsMax")),
-            _bool_or_none(elem.findtext("remote"), "true", "false"),
+    def from_xml(cls, elem: Element, pool: Optional[Callable[[H], H]] = None):
+        """
+        Construct new Course from an XML element, sharing values from a pool
+
+        Raises:
+            DecodeError: If the administrative information or the course id is
+                missing or malformed
+
+        """
+        if pool is None:
+            pool = _unpooled
+        admin = elem.find("administrativeInformation")
+        if admin is None:
+            raise DecodeError(elem.tag, "administrativeInformation", None)
+        learning_objectives = pool(
             frozenset(
-                LearningObjective.from_xml(lo) for lo in elem.find("learningObjectives")
-            ),
-            frozenset(Section.from_xml(section) for section in elem.find("sections")),
-            AdministrativeInformation.from_xml(elem.find("administrativeInformation")),
-            frozenset(Attribute.from_xml(attr) for attr in elem.find("attributes")),
-            frozenset(Tag.from_xml(tag) for tag in elem.find("tags")),
+                pool(LearningObjective.from_xml(lo))
+                for lo in _children(elem, "learningObjectives")
+            )
+        )
+        sections = _decode_sections(_children(elem, "sections"), pool)
+        administrative_information = pool(AdministrativeInformation.from_xml(admin))
+        attributes = pool(
+            frozenset(
+                pool(Attribute.from_xml(attr))
+                for attr in _children(elem, "attributes")
+            )
         )
+        tags = pool(
+            frozenset(pool(Tag.from_xml(tag)) for tag in _children(elem, "tags"))
+        )
+        try:
+            return cls(
+                elem.findtext("year"),
+                elem.findtext("subject"),
+                elem.findtext("code"),
+                pool(elem.findtext("title")),
+                pool(elem.findtext("description", "")),
+                pool(frozenset(elem.findtext("gers").split(", "))),
+                elem.findtext("repeatable") == "true",
+                elem.findtext("grading"),
+                int(elem.findtext("unitsMin")),
+                int(elem.findtext("unitsMax")),
+                _bool_or_none(elem.findtext("remote"), "true", "false"),
+                learning_objectives,
+                sections,
+                administrative_information,
+                attributes,
+                tags,
+            )
+        except _CONVERSION_ERRORS:
+            fields = _COURSE_FIELDS.decode(elem)
+            for name in ("title", "raw_description", "gers"):
+                fields[name] = pool(fields[name])
+            return cls(
+                learning_objectives=learning_objectives,
+                sections=sections,
+                administrative_information=administrative_information,
+                attributes=attributes,
+                tags=tags,
+                **fields,
+            )
+
+    @cached_property
+    def description(self) -> str:
+        """Description, decoded from raw_description on first access"""
+        return _unescape_twice(self.raw_description)
 
     @property
     def course_code(self):
@@ -324,15 +705,34 @@ class Course:
         """Unique course id"""
         return self.administrative_information.course_id
 
+    @cached_property
+    def _key(self):
+        return (self.year, self.course_code)
+
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return NotImplemented
-        return (self.year, self.course_code) == (other.year, other.course_code)
+        return self._key == other._key
 
     def __lt__(self, other):
         if not isinstance(other, type(self)):
             return NotImplemented
-        return (self.year, self.course_code) < (other.year, other.course_code)
+        return self._key < other._key
 
     def __hash__(self):
-        return hash((self.year, self.course_code))
+        return hash(self._key)
+
+
+_COURSE_FIELDS = _FieldTable((
+    ("year", "year", None, None),
+    ("subject", "subject", None, None),
+    ("code", "code", None, None),
+    ("title", "title", None, None),
+    ("raw_description", "description", lambda t: "" if t is None else t, ""),
+    ("gers", "gers", lambda t: frozenset(t.split(", ")), frozenset()),
+    ("repeatable", "repeatable", lambda t: t == "true", False),
+    ("grading", "grading", None, None),
+    ("units_min", "unitsMin", int, 0),
+    ("units_max", "unitsMax", int, 0),
+    ("remote", "remote", lambda t: _bool_or_none(t, "true", "false"), None),
+))
@@ -0,0 +1,346 @@
+"""
+Implements the explorecourses command-line interface
+
+Subcommands:
+    export: Crawl years or subjects concurrently and stream the courses to JSONL, CSV,
+        Parquet or SQLite
+    profile: Crawl or parse under cProfile (and optionally tracemalloc) and write a
+        report, the raw statistics and flamegraph-ready folded stacks
+    serve: Serve a catalog snapshot over HTTP, refreshing it in the background
+
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+import time
+from typing import List, Optional
+
+from explorecourses.course_connection import CourseConnection
+from explorecourses.crawl import Checkpoint, CrawlUnit
+from explorecourses.export import FORMATS, guess_format, open_writer
+from explorecourses.fixture_server import FixtureServer
+from explorecourses.metrics import MetricsTotals
+from explorecourses.parsing import CourseParser
+from explorecourses.profiling import Profile
+from explorecourses.service import CatalogService, crawl_loader, jsonl_loader
+from explorecourses.synthetic import SyntheticCatalog
+
+
+class _Progress:
+    """Reports crawled units, courses and throughput on standard error"""
+
+    def __init__(self, total: int, metrics: MetricsTotals, quiet: bool = False):
+        self.total = total
+        self.metrics = metrics
+        self.quiet = quiet
+        self.units = 0
+        self.courses = 0
+        self.started = time.monotonic()
+        self._tty = sys.stderr.isatty()
+
+    def update(self, courses: int):
+        self.units += 1
+        self.courses += courses
+        if not self.quiet:
+            end = "" if self._tty and self.units < self.total else "\n"
+            print(f"\r{self}", end=end, file=sys.stderr, flush=True)
+
+    def __str__(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"{self.units}/{self.total} units, {self.courses} courses, "
+            f"{self.courses / elapsed:.0f} courses/s, "
+            f"{self.metrics.bytes / elapsed / 1e6:.1f} MB/s, {elapsed:.1f} s"
+        )
+
+
+def _export(args: argparse.Namespace) -> int:
+    format = args.format or guess_format(args.output)
+    years = args.year or [None]
+    checkpoint = None
+    if args.checkpoint is not None:
+        # Resuming adds to the output of the interrupted run rather than replacing it
+        resume = os.path.exists(args.checkpoint)
+        checkpoint = Checkpoint(args.checkpoint)
+    else:
+        resume = False
+    metrics = MetricsTotals()
+    # Nothing is requested twice, so do not keep results or parsed courses around
+    connection = CourseConnection(args.url, metrics=metrics, cache=False, memo_size=0)
+    with connection, open_writer(args.output, format, append=resume) as writer:
+        # List the subjects of each year once, for both the total and the crawl
+        subjects = {}
+        for year in years:
+            if args.subject:
+                subjects[year] = args.subject
+            else:
+                subjects[year] = sorted(
+                    dept.name
+                    for school in connection.schools(year)
+                    for dept in school.departments
+                )
+        total = sum(
+            1
+            for year in years
+            for subject in subjects[year]
+            if checkpoint is None
+            or CrawlUnit(year, subject, tuple(args.filter)) not in checkpoint
+        )
+        progress = _Progress(total, metrics, quiet=args.quiet)
+        crawl = itertools.chain.from_iterable(
+            connection.crawl(
+                subjects[year],
+                *args.filter,
+                years=[year],
+                checkpoint=checkpoint,
+                max_workers=args.workers,
+            )
+            for year in years
+        )
+        for unit, courses in crawl:
+            writer.write(courses)
+            progress.update(len(courses))
+    return 0
+
+
+def _profile(args: argparse.Namespace) -> int:
+    server = None
+    url = args.url
+    if args.synthetic:
+        catalog = SyntheticCatalog(args.synthetic, seed=args.seed)
+        # Generate all documents up front so that the server does not add to the
+        # profile
+        for subject in catalog.subjects:
+            catalog.document(subject)
+        server = FixtureServer(catalog.documents).start()
+        url = server.url
+    documents = []
+    for path in args.file:
+        with open(path, "rb") as f:
+            documents.append(f.read())
+
+    # Keep all courses, such that tracemalloc sees the memory they hold
+    courses = []
+    try:
+        with Profile(memory=args.memory) as profile:
+            if documents:
+                parser = CourseParser(maxsize=0)
+                for document in documents:
+                    courses.extend(parser.parse(document))
+            else:
+                connection = CourseConnection(url, cache=False, memo_size=0)
+                with connection:
+                    crawl = connection.crawl(
+                        args.subject or None, *args.filter, years=[args.year]
+                    )
+                    for unit, unit_courses in crawl:
+                        courses.extend(unit_courses)
+                        if args.verbose:
+                            print(f"{unit.subject}: {len(unit_courses)} courses")
+    finally:
+        if server is not None:
+            server.stop()
+
+    report = profile.report(limit=args.limit, sort=args.sort)
+    with open(f"{args.output}.txt", "w", encoding="utf-8") as f:
+        f.write(report)
+    profile.dump_stats(f"{args.output}.prof")
+    profile.write_folded(f"{args.output}.folded")
+    print(report)
+    print(f"{len(courses)} courses")
+    print(f"Wrote {args.output}.txt, {args.output}.prof and {args.output}.folded")
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if args.snapshot is not None:
+        loader = jsonl_loader(args.snapshot)
+    else:
+        loader = crawl_loader(
+            CourseConnection(args.url),
+            args.year or [None],
+            args.subject or None,
+            *args.filter,
+            max_workers=args.workers,
+        )
+    service = CatalogService(loader, args.refresh, host=args.host, port=args.port)
+    service.run()
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="explorecourses", description="Stanford ExploreCourses API"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser(
+        "export",
+        help="export courses to JSONL, CSV, Parquet or SQLite",
+        description=(
+            "Crawl one or more years, or a list of subjects, with concurrent requests "
+            "and write the courses as they arrive. JSONL holds one course per line; "
+            "CSV and Parquet write a directory with courses, sections and schedules "
+            "tables, and SQLite writes the same tables to a database."
+        ),
+    )
+    export.add_argument(
+        "output", help="output file or directory, or - for JSONL on standard output"
+    )
+    export.add_argument(
+        "--format",
+        choices=FORMATS,
+        help="output format (default: guessed from the extension of the output)",
+    )
+    export.add_argument(
+        "-y",
+        "--year",
+        action="append",
+        default=[],
+        help="academic year, e.g., 2017-2018; may be repeated (default: current)",
+    )
+    export.add_argument(
+        "-s",
+        "--subject",
+        action="append",
+        default=[],
+        help="subject to export; may be repeated (default: all subjects)",
+    )
+    export.add_argument(
+        "--filter", action="append", default=[], help="search filter; may be repeated"
+    )
+    export.add_argument("--url", help="base URL of the site to crawl")
+    export.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=8,
+        help="number of concurrent requests (default: %(default)s)",
+    )
+    export.add_argument(
+        "--checkpoint",
+        help=(
+            "checkpoint file for resuming an interrupted export; if it exists, the "
+            "remaining units are appended to the output"
+        ),
+    )
+    export.add_argument(
+        "-q", "--quiet", action="store_true", help="do not report progress"
+    )
+    export.set_defaults(run=_export)
+
+    profile = subparsers.add_parser(
+        "profile",
+        help="profile a crawl or parse",
+        description=(
+            "Crawl subjects, or parse saved search responses, under cProfile and "
+            "write a report (.txt), the raw statistics (.prof) and folded stacks for "
+            "flamegraph tools (.folded)."
+        ),
+    )
+    profile.add_argument(
+        "-s",
+        "--subject",
+        action="append",
+        default=[],
+        help="subject to crawl; may be repeated (default: all subjects)",
+    )
+    profile.add_argument("-y", "--year", help="academic year, e.g., 2017-2018")
+    profile.add_argument(
+        "--filter", action="append", default=[], help="search filter; may be repeated"
+    )
+    profile.add_argument("--url", help="base URL of the site to crawl")
+    profile.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="N",
+        help="crawl a local synthetic catalog of N courses instead of the site",
+    )
+    profile.add_argument("--seed", type=int, default=0, help="synthetic catalog seed")
+    profile.add_argument(
+        "-f",
+        "--file",
+        action="append",
+        default=[],
+        help="parse a saved search response instead of crawling; may be repeated",
+    )
+    profile.add_argument(
+        "-m", "--memory", action="store_true", help="also trace memory allocations"
+    )
+    profile.add_argument(
+        "-o",
+        "--output",
+        default="explorecourses-profile",
+        help="path prefix of the output files (default: %(default)s)",
+    )
+    profile.add_argument(
+        "--limit", type=int, default=25, help="number of entries in the report"
+    )
+    profile.add_argument(
+        "--sort", default="cumulative", help="pstats sort key (default: %(default)s)"
+    )
+    profile.add_argument("-v", "--verbose", action="store_true")
+    profile.set_defaults(run=_profile)
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="serve a catalog snapshot over HTTP",
+        description=(
+            "Load a catalog snapshot, by crawling or from a JSONL export, and answer "
+            "subject, course, search, filter, instructor and conflict lookups over "
+            "HTTP, refreshing the snapshot in the background."
+        ),
+    )
+    serve.add_argument("--snapshot", help="JSONL file to load instead of crawling")
+    serve.add_argument(
+        "-y",
+        "--year",
+        action="append",
+        default=[],
+        help="academic year to crawl; may be repeated (default: current)",
+    )
+    serve.add_argument(
+        "-s",
+        "--subject",
+        action="append",
+        default=[],
+        help="subject to crawl; may be repeated (default: all subjects)",
+    )
+    serve.add_argument(
+        "--filter", action="append", default=[], help="search filter; may be repeated"
+    )
+    serve.add_argument("--url", help="base URL of the site to crawl")
+    serve.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=8,
+        help="number of concurrent requests (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--refresh",
+        type=float,
+        metavar="SECONDS",
+        help="reload the snapshot every SECONDS (default: never)",
+    )
+    serve.add_argument(
+        "--host", default="127.0.0.1", help="host to bind to (default: %(default)s)"
+    )
+    serve.add_argument(
+        "--port", type=int, default=8080, help="port to bind to (default: %(default)s)"
+    )
+    serve.set_defaults(run=_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,116 @@ Implements the CourseConnection class, the main entrypoint for the ExploreCourse
 
 """
 
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import hashlib
+from itertools import islice
+import random
+import time
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 import xml.etree.ElementTree as ET
+import warnings
 import requests
 
 from explorecourses.classes import School, Course
+from explorecourses.crawl import Checkpoint, CrawlUnit
+from explorecourses.diff import EnrollmentChange, diff, enrollment_changes
+from explorecourses.metrics import Metrics
+from explorecourses.parsing import CourseParser
+from explorecourses.transport import RequestsTransport, Transport
+
+S = TypeVar("S")
+T = TypeVar("T")
+
+# HTTP status codes that indicate a transient failure worth retrying
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Exceptions that indicate a transient failure worth retrying
+_RETRY_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+    ET.ParseError,
+)
+
+# Size of the chunks in which response bodies are read and parsed
+_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class _CacheEntry:
+    """Validators and parsed result of a previous response to a request"""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: bytes
+    result: list
+
+
+@dataclass
+class _Deferred:
+    """
+    Raw body of a changed response, to be parsed and cached later
+
+    Only the parsed result is cached, under the same key as a parsed request, so
+    that the raw body is released once parsed.
+
+    """
+
+    content: bytes
+    parse: Callable[[Iterable[bytes]], list]
+    cache: Optional[Dict[Hashable, _CacheEntry]]
+    key: Hashable
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: Optional[bytes]
+
+    def result(self) -> list:
+        """Parse the body, and cache the result with the validators of the response"""
+        result = self.parse((self.content,))
+        if self.cache is not None:
+            self.cache[self.key] = _CacheEntry(
+                self.etag, self.last_modified, self.digest, result
+            )
+        return list(result)
+
+
+def _bounded_map(
+    func: Callable[[S], T], items: Iterable[S], max_workers: int
+) -> Iterator[T]:
+    """Map concurrently, yielding results as they complete, with bounded lookahead"""
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = {
+            executor.submit(func, item) for item in islice(items, 2 * max_workers)
+        }
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    for item in islice(items, 1):
+                        pending.add(executor.submit(func, item))
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _parse_schools(chunks: Iterable[bytes]) -> List[School]:
+    root = ET.fromstring(b"".join(chunks))
+    return [School.from_xml(school) for school in root.findall(".//school")]
 
 
 class CourseConnection:
@@ -16,12 +121,181 @@ class CourseConnection:
 
     Establishes the HTTP connection and makes requests.
 
+    Args:
+        url (Optional[str]): Base URL of the ExploreCourses site. Defaults to the
+            official site, but may point to, e.g., a local FixtureServer.
+        transport (Optional[Transport]): Transport to send requests through.
+            Defaults to a RequestsTransport.
+        retries (int): Number of times to retry a request after a transient failure,
+            i.e., a connection error, a timeout, a 5xx response, or a truncated
+            response that fails to parse.
+        backoff (float): Base delay in seconds before the first retry. The delay
+            doubles with each subsequent retry, and the actual delay is drawn
+            uniformly from zero up to this value ("full jitter").
+        max_backoff (float): Upper bound on the delay between retries.
+        timeout (Optional[float]): Timeout in seconds for each request.
+        cache (bool): Whether to remember the validators (ETag, Last-Modified and a
+            hash of the content) and parsed result of each distinct request. Repeated
+            requests are then sent as conditional requests, and the previously parsed
+            objects are reused if the server reports or returns unchanged content.
+        memo_size (int): Number of parsed courses to remember by the hash of their raw
+            XML, such that unchanged courses in a changed response are reused rather
+            than parsed again. Zero disables the memo.
+        metrics (Optional[Metrics]): Receives timings and counts for each response,
+            parsed search response and retry. Defaults to None, which records
+            nothing.
+
     """
 
     _URL = "https://explorecourses.stanford.edu/"
 
-    def __init__(self):
-        self._session = requests.Session()
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: Optional[float] = 60.0,
+        cache: bool = True,
+        memo_size: int = 100_000,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.url = self._URL if url is None else url.rstrip("/") + "/"
+        self.transport = RequestsTransport() if transport is None else transport
+        self._cache: Optional[Dict[Hashable, _CacheEntry]] = {} if cache else None
+        self.metrics = Metrics() if metrics is None else metrics
+        self._parser = CourseParser(memo_size, metrics=metrics)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+    def close(self):
+        """Close the underlying transport"""
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _request(
+        self,
+        path: str,
+        payload: dict,
+        parse: Callable[[Iterable[bytes]], List[T]],
+        defer: bool = False,
+    ) -> Union[List[T], _Deferred]:
+        """
+        Send a GET request and parse the response, retrying transient failures
+
+        With defer=True, a response that changed since the cached one is returned
+        unparsed, as a _Deferred, such that it may be parsed in another thread.
+
+        """
+        for attempt in range(self.retries):
+            try:
+                return self._request_once(path, payload, parse, defer)
+            except requests.HTTPError as exc:
+                if exc.response.status_code not in _RETRY_STATUS:
+                    raise
+                self.metrics.on_retry(path or "schools", attempt, exc)
+            except _RETRY_EXCEPTIONS as exc:
+                self.metrics.on_retry(path or "schools", attempt, exc)
+            time.sleep(self._backoff_delay(attempt))
+        return self._request_once(path, payload, parse, defer)
+
+    def _request_once(
+        self,
+        path: str,
+        payload: dict,
+        parse: Callable[[Iterable[bytes]], List[T]],
+        defer: bool = False,
+    ) -> Union[List[T], _Deferred]:
+        key = (path, tuple(sorted(payload.items())), parse)
+        entry = None if self._cache is None else self._cache.get(key)
+        headers = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+        start = time.perf_counter()
+        res = self.transport.get(self.url + path, payload, headers, self.timeout)
+        first_byte = time.perf_counter()
+        size = 0
+        hasher = None if self._cache is None else hashlib.blake2b(digest_size=16)
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal size
+            for chunk in res.iter_content(_CHUNK_SIZE):
+                size += len(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+                yield chunk
+
+        try:
+            if entry is not None and res.status_code == 304:
+                return list(entry.result)
+            res.raise_for_status()
+            if not defer:
+                # Parse as the body arrives, without holding all of it. Unchanged
+                # courses are memo hits, and if the whole content is unchanged since
+                # the previous response, the previous result is kept.
+                result = parse(chunks())
+                if entry is not None and hasher.digest() == entry.digest:
+                    result = entry.result
+            else:
+                content = b"".join(chunks())
+                digest = None if hasher is None else hasher.digest()
+                if entry is not None and digest == entry.digest:
+                    return list(entry.result)
+                return _Deferred(
+                    content,
+                    parse,
+                    self._cache,
+                    key,
+                    res.headers.get("ETag"),
+                    res.headers.get("Last-Modified"),
+                    digest,
+                )
+        finally:
+            res.close()
+            self.metrics.on_request(
+                path or "schools",
+                res.status_code,
+                first_byte - start,
+                time.perf_counter() - first_byte,
+                size,
+            )
+        if self._cache is None:
+            return result
+        entry = _CacheEntry(
+            res.headers.get("ETag"),
+            res.headers.get("Last-Modified"),
+            hasher.digest(),
+            result,
+        )
+        self._cache[key] = entry
+        return list(result)
+
+    def clear_cache(self):
+        """Forget all cached validators, results and parsed courses"""
+        if self._cache is not None:
+            self._cache.clear()
+        self._parser.clear()
+
+    @staticmethod
+    def _payload(year: Optional[str], **params: str) -> dict:
+        payload = {"view": "xml-20200810", **params}
+        if year is not None:
+            payload["academicYear"] = year.replace("-", "")
+        return payload
 
     def schools(self, year=None) -> List[School]:
         """
@@ -35,12 +309,7 @@ class CourseConnection:
             List[School]: All schools at the university
 
         """
-        payload = {"view": "xml-20200810"}
-        if year is not None:
-            payload["academicYear"] = year.replace("-", "")
-        res = self._session.get(self._URL, params=payload)
-        root = ET.fromstring(res.content)
-        return [School.from_xml(school) for school in root.findall(".//school")]
+        return self._request("", self._payload(year), _parse_schools)
 
     def school(self, name: str) -> School:
         """
@@ -94,14 +363,170 @@ class CourseConnection:
             List[Course]: Courses matching the search query
 
         """
-        payload = {
-            "view": "xml-20200810",
-            "filter-coursestatus-Active": "on",
-            "q": query,
-        }
+        payload = self._search_payload(query, filters, year)
+        return self._request("search", payload, self._parser.parse_chunks)
+
+    def crawl(
+        self,
+        subjects: Optional[Iterable[str]] = None,
+        *filters: str,
+        years: Iterable[Optional[str]] = (None,),
+        checkpoint: Union[None, str, Checkpoint] = None,
+        max_workers: int = 1,
+        pipeline: bool = False,
+    ) -> Iterator[Tuple[CrawlUnit, List[Course]]]:
+        """
+        Crawl the catalog one subject at a time
+
+        Each (year, subject, filters) combination is a crawl unit. When a checkpoint is
+        given, units that are already recorded as done are skipped, and each unit is
+        recorded as done once the consumer asks for the next one, i.e., after the
+        courses it yielded have been handled. An interrupted crawl can thus be resumed
+        by running it again with the same checkpoint.
+
+        With several workers, units are fetched concurrently and yielded in the order
+        they complete. At most two units per worker are in flight or waiting to be
+        consumed, such that a slow consumer holds back the crawl.
+
+        With pipeline=True, the workers only download the raw responses, and a
+        separate thread parses them, such that downloads for the next units overlap
+        with parsing earlier ones even with a single worker. Each stage holds at most
+        a few units ahead of the next one.
+
+        Args:
+            subjects (Optional[Iterable[str]]): Subject codes to crawl. Defaults to
+                None, which selects all departments at the university for each year.
+            *filters (str): Search filters
+            years (Iterable[Optional[str]]): Academic years to crawl, e.g.,
+                ["2020-2021", "2021-2022"]. Defaults to the current year only.
+            checkpoint (Union[None, str, Checkpoint]): Checkpoint, or path to a
+                checkpoint file, recording completed units
+            max_workers (int): Maximum number of concurrent requests
+            pipeline (bool): Whether to parse in a stage of its own, separate from
+                the downloads
+
+        Yields:
+            Tuple[CrawlUnit, List[Course]]: Each crawl unit with its courses
+
+        """
+        if isinstance(checkpoint, str):
+            checkpoint = Checkpoint(checkpoint)
+        units = self._crawl_units(subjects, filters, years)
+        if checkpoint is not None:
+            units = (unit for unit in units if unit not in checkpoint)
+
+        def fetch(unit: CrawlUnit) -> Tuple[CrawlUnit, List[Course]]:
+            courses = self.courses_by_subject(unit.subject, *filters, year=unit.year)
+            return unit, courses
+
+        if pipeline:
+            downloads = _bounded_map(self._download, units, max(max_workers, 1))
+            results = _bounded_map(self._parse_download, downloads, 1)
+        elif max_workers <= 1:
+            results = map(fetch, units)
+        else:
+            results = _bounded_map(fetch, units, max_workers)
+        for unit, courses in results:
+            yield unit, courses
+            if checkpoint is not None:
+                checkpoint.mark_done(unit)
+
+    def _search_payload(self, query: str, filters: Iterable[str], year) -> dict:
+        payload = self._payload(year, q=query)
+        payload["filter-coursestatus-Active"] = "on"
         payload.update({f: "on" for f in filters})
-        if year is not None:
-            payload["academicYear"] = year.replace("-", "")
-        res = self._session.get(self._URL + "search", params=payload)
-        root = ET.fromstring(res.content)
-        return [Course.from_xml(course) for course in root.findall(".//course")]
+        return payload
+
+    def _download(
+        self, unit: CrawlUnit
+    ) -> Tuple[CrawlUnit, Union[List[Course], _Deferred]]:
+        """Download the search response of a crawl unit, leaving it unparsed"""
+        filters = (*unit.filters, f"filter-departmentcode-{unit.subject}")
+        payload = self._search_payload(unit.subject, filters, unit.year)
+        result = self._request("search", payload, self._parser.parse_chunks, True)
+        return unit, result
+
+    def _parse_download(
+        self, download: Tuple[CrawlUnit, Union[List[Course], _Deferred]]
+    ) -> Tuple[CrawlUnit, List[Course]]:
+        """Parse the search response of a crawl unit, unless it is unchanged"""
+        unit, result = download
+        if not isinstance(result, _Deferred):
+            return unit, result
+        try:
+            return unit, result.result()
+        except ET.ParseError:
+            # A truncated response; fetch it again, with retries
+            courses = self.courses_by_subject(
+                unit.subject, *unit.filters, year=unit.year
+            )
+            return unit, courses
+
+    def _crawl_units(
+        self,
+        subjects: Optional[Iterable[str]],
+        filters: Tuple[str, ...],
+        years: Iterable[Optional[str]],
+    ) -> Iterator[CrawlUnit]:
+        subjects = None if subjects is None else list(subjects)
+        for year in years:
+            if subjects is None:
+                year_subjects = sorted(
+                    dept.name
+                    for school in self.schools(year)
+                    for dept in school.departments
+                )
+            else:
+                year_subjects = subjects
+            for subject in year_subjects:
+                yield CrawlUnit(year, subject, tuple(filters))
+
+    def watch(
+        self,
+        subjects: Iterable[str],
+        *filters: str,
+        interval: float = 60.0,
+        year=None,
+        max_workers: int = 8,
+    ) -> Iterator[EnrollmentChange]:
+        """
+        Poll a set of subjects and yield enrollment changes as they occur
+
+        Each round fetches all subjects concurrently. Thanks to conditional requests
+        and the course memo, subjects and courses that did not change are neither
+        downloaded nor parsed again, so most rounds are cheap. The first round
+        establishes the baseline and yields nothing. A subject that fails to fetch
+        is skipped for the round with a warning.
+
+        Args:
+            subjects (Iterable[str]): Subject codes to watch, e.g., ["MATH", "CS"]
+            *filters (str): Search filters
+            interval (float): Time in seconds between the start of each round
+            year (Optional[str]): Academic year to watch, e.g., "2021-2022". Defaults
+                to None, which selects the current year.
+            max_workers (int): Maximum number of concurrent requests
+
+        Yields:
+            EnrollmentChange: Changes in enrollment, one for each changed field
+
+        """
+        subjects = list(subjects)
+        previous: Dict[str, List[Course]] = {}
+
+        def fetch(subject: str) -> Optional[List[Course]]:
+            try:
+                return self.courses_by_subject(subject, *filters, year=year)
+            except (requests.RequestException, ET.ParseError) as exc:
+                warnings.warn(f"failed to fetch {subject}: {exc}")
+                return None
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            while True:
+                started = time.monotonic()
+                for subject, courses in zip(subjects, executor.map(fetch, subjects)):
+                    if courses is None:
+                        continue
+                    if subject in previous:
+                        yield from enrollment_changes(diff(previous[subject], courses))
+                    previous[subject] = courses
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
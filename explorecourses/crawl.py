@@ -0,0 +1,60 @@
+"""
+Implements crawl units and checkpoints for resumable multi-request crawls
+
+"""
+
+from dataclasses import dataclass
+import json
+import os
+from typing import Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class CrawlUnit:
+    """A single request in a crawl: one subject in one year with a set of filters"""
+
+    year: Optional[str]
+    subject: str
+    filters: Tuple[str, ...]
+
+    def key(self) -> Tuple[Optional[str], str, Tuple[str, ...]]:
+        """Canonical key, insensitive to the order of the filters"""
+        return (self.year, self.subject, tuple(sorted(self.filters)))
+
+
+class Checkpoint:
+    """
+    Persistent record of the crawl units that have been completed
+
+    The record is rewritten atomically every time a unit is marked as done, such that
+    an interrupted crawl can be resumed by passing the same checkpoint file again.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._done: Set[Tuple[Optional[str], str, Tuple[str, ...]]] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for year, subject, filters in json.load(f)["done"]:
+                    self._done.add((year, subject, tuple(filters)))
+
+    def __contains__(self, unit: CrawlUnit) -> bool:
+        return unit.key() in self._done
+
+    def __len__(self):
+        return len(self._done)
+
+    def mark_done(self, unit: CrawlUnit):
+        """Record a unit as completed and persist the checkpoint"""
+        self._done.add(unit.key())
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"done": sorted(self._done, key=repr)}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        """Forget all completed units and remove the checkpoint file"""
+        self._done.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,253 @@
+"""
+Implements structured, field-level differences between two catalog snapshots
+
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+from explorecourses.classes import Course, Schedule, Section
+
+# Fields compared between matching courses and sections. The year is left out such
+# that catalogs from different years can be compared, sections are matched and
+# compared separately, and the class id is the key sections are matched by. The
+# description is compared decoded, since equal text may be escaped differently.
+# Likewise, schedules are matched by meeting time and compared field by field.
+_COURSE_FIELDS = tuple(
+    "description" if f.name == "raw_description" else f.name
+    for f in fields(Course)
+    if f.name not in ("year", "sections")
+)
+_SECTION_FIELDS = tuple(
+    f.name for f in fields(Section) if f.name not in ("class_id", "schedules")
+)
+_SCHEDULE_KEY = ("days", "start_time", "end_time")
+_SCHEDULE_FIELDS = tuple(
+    f.name for f in fields(Schedule) if f.name not in _SCHEDULE_KEY
+)
+_ENROLLMENT_FIELDS = ("num_enrolled", "num_waitlist", "enroll_status")
+
+
+@dataclass(frozen=True)
+class FieldChange:
+    """A change in the value of a single field"""
+
+    field: str
+    old: Any
+    new: Any
+
+
+@dataclass(frozen=True)
+class SectionChange:
+    """Changes to a section present in both snapshots"""
+
+    old: Section
+    new: Section
+    changes: Tuple[FieldChange, ...]
+
+    @property
+    def class_id(self):
+        """Class id of the section"""
+        return self.new.class_id
+
+
+@dataclass(frozen=True)
+class CourseChange:
+    """Changes to a course present in both snapshots"""
+
+    old: Course
+    new: Course
+    changes: Tuple[FieldChange, ...]
+    added_sections: Tuple[Section, ...]
+    removed_sections: Tuple[Section, ...]
+    changed_sections: Tuple[SectionChange, ...]
+
+    @property
+    def course_id(self):
+        """Unique course id"""
+        return self.new.course_id
+
+    def __bool__(self):
+        return bool(
+            self.changes
+            or self.added_sections
+            or self.removed_sections
+            or self.changed_sections
+        )
+
+
+@dataclass(frozen=True)
+class CatalogDiff:
+    """Differences between two catalog snapshots"""
+
+    added: Tuple[Course, ...]
+    removed: Tuple[Course, ...]
+    changed: Tuple[CourseChange, ...]
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass(frozen=True)
+class EnrollmentChange:
+    """A change in enrollment for a section"""
+
+    section: Section
+    field: str
+    old: Any
+    new: Any
+
+    @property
+    def class_id(self):
+        """Class id of the section"""
+        return self.section.class_id
+
+
+def _field_changes(old, new, names: Tuple[str, ...]) -> Tuple[FieldChange, ...]:
+    changes = []
+    for name in names:
+        old_value = getattr(old, name)
+        new_value = getattr(new, name)
+        if old_value is not new_value and old_value != new_value:
+            changes.append(FieldChange(name, old_value, new_value))
+    return tuple(changes)
+
+
+def _schedule_key(schedule: Schedule) -> Hashable:
+    return tuple(getattr(schedule, name) for name in _SCHEDULE_KEY)
+
+
+def _schedule_changes(old: Section, new: Section) -> Tuple[FieldChange, ...]:
+    """
+    Compare the schedules of two versions of a section
+
+    Schedules are matched by days and times, such that a change of room or
+    instructors is reported as a change of that field. Schedules that match none,
+    or whose meeting time is shared by another schedule, are reported as a change
+    of the schedules.
+
+    """
+    if old.schedules is new.schedules or old.schedules == new.schedules:
+        return ()
+    old_rest = set(old.schedules - new.schedules)
+    new_rest = set(new.schedules - old.schedules)
+    old_by_key: Dict[Hashable, List[Schedule]] = {}
+    for schedule in old_rest:
+        old_by_key.setdefault(_schedule_key(schedule), []).append(schedule)
+    new_by_key: Dict[Hashable, List[Schedule]] = {}
+    for schedule in new_rest:
+        new_by_key.setdefault(_schedule_key(schedule), []).append(schedule)
+    changes = []
+    for key in sorted(old_by_key.keys() & new_by_key.keys(), key=str):
+        if len(old_by_key[key]) == len(new_by_key[key]) == 1:
+            (old_schedule,) = old_by_key[key]
+            (new_schedule,) = new_by_key[key]
+            changes.extend(_field_changes(old_schedule, new_schedule, _SCHEDULE_FIELDS))
+            old_rest.discard(old_schedule)
+            new_rest.discard(new_schedule)
+    if old_rest or new_rest:
+        changes.append(
+            FieldChange("schedules", frozenset(old_rest), frozenset(new_rest))
+        )
+    return tuple(changes)
+
+
+def _course_key(course: Course) -> Hashable:
+    # Cross-listings share the course id, so the course code tells them apart
+    return (course.course_id, course.subject, course.code)
+
+
+def diff_course(old: Course, new: Course) -> CourseChange:
+    """
+    Compare two versions of a course
+
+    Sections are matched by class id, and their schedules by days and times.
+
+    Args:
+        old (Course): Old version of the course
+        new (Course): New version of the course
+
+    Returns:
+        CourseChange: Changes from the old to the new version
+
+    """
+    changed = []
+    removed = []
+    if old.sections is new.sections or old.sections == new.sections:
+        added = ()
+    else:
+        new_sections = {section.class_id: section for section in new.sections}
+        for old_section in old.sections:
+            new_section = new_sections.pop(old_section.class_id, None)
+            if new_section is None:
+                removed.append(old_section)
+            elif old_section != new_section:
+                changes = _field_changes(
+                    old_section, new_section, _SECTION_FIELDS
+                ) + _schedule_changes(old_section, new_section)
+                changed.append(SectionChange(old_section, new_section, changes))
+        added = tuple(sorted(new_sections.values(), key=lambda s: s.class_id))
+    return CourseChange(
+        old,
+        new,
+        _field_changes(old, new, _COURSE_FIELDS),
+        added,
+        tuple(sorted(removed, key=lambda s: s.class_id)),
+        tuple(sorted(changed, key=lambda c: c.class_id)),
+    )
+
+
+def diff(old: Iterable[Course], new: Iterable[Course]) -> CatalogDiff:
+    """
+    Compare two catalog snapshots
+
+    Courses are matched by course id and, among cross-listings sharing a course id,
+    by course code. Identical objects (e.g., courses reused by a CourseParser) are
+    skipped without comparing any fields, so the cost is linear in the size of the
+    catalogs and dominated by the courses that actually changed.
+
+    Args:
+        old (Iterable[Course]): Old snapshot
+        new (Iterable[Course]): New snapshot
+
+    Returns:
+        CatalogDiff: Added, removed and changed courses
+
+    """
+    new_courses: Dict[Hashable, Course] = {_course_key(c): c for c in new}
+    removed = []
+    changed = []
+    for old_course in old:
+        new_course = new_courses.pop(_course_key(old_course), None)
+        if new_course is None:
+            removed.append(old_course)
+        elif new_course is not old_course:
+            change = diff_course(old_course, new_course)
+            if change:
+                changed.append(change)
+    return CatalogDiff(
+        tuple(sorted(new_courses.values())), tuple(sorted(removed)), tuple(changed)
+    )
+
+
+def enrollment_changes(catalog_diff: CatalogDiff) -> List[EnrollmentChange]:
+    """
+    Extract the enrollment changes from a catalog diff
+
+    Enrollment changes are changes to the number of enrolled and waitlisted students
+    and to the enrollment status of sections present in both snapshots.
+
+    Args:
+        catalog_diff (CatalogDiff): Differences between two catalog snapshots
+
+    Returns:
+        List[EnrollmentChange]: Enrollment changes, one for each changed field
+
+    """
+    return [
+        EnrollmentChange(section_change.new, change.field, change.old, change.new)
+        for course_change in catalog_diff.changed
+        for section_change in course_change.changed_sections
+        for change in section_change.changes
+        if change.field in _ENROLLMENT_FIELDS
+    ]
@@ -0,0 +1,435 @@
+"""
+Implements writers that export courses to JSONL, CSV, Parquet and SQLite
+
+Writers receive courses in batches, e.g., one crawl unit at a time, and write them out
+immediately, such that an export never holds more than a batch in memory.
+
+JSONL holds one nested course per line. The tabular formats hold three tables:
+courses, sections and schedules, joined through course_id and class_id (together with
+year). Sets of values, such as GERs or instructors, are joined with "; ".
+
+"""
+
+from abc import ABC, abstractmethod
+import csv
+import os
+import sqlite3
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+from explorecourses.classes import Course
+from explorecourses.serialization import write_jsonl
+
+# Columns of each table as (name, type)
+TABLES: Dict[str, Tuple[Tuple[str, type], ...]] = {
+    "courses": (
+        ("year", str),
+        ("course_id", int),
+        ("subject", str),
+        ("code", str),
+        ("title", str),
+        ("description", str),
+        ("gers", str),
+        ("repeatable", bool),
+        ("grading", str),
+        ("units_min", int),
+        ("units_max", int),
+        ("remote", bool),
+        ("learning_objectives", str),
+        ("effective_status", str),
+        ("offer_number", int),
+        ("academic_group", str),
+        ("academic_organization", str),
+        ("academic_career", str),
+        ("final_exam_flag", bool),
+        ("attributes", str),
+        ("tags", str),
+    ),
+    "sections": (
+        ("year", str),
+        ("course_id", int),
+        ("subject", str),
+        ("code", str),
+        ("class_id", int),
+        ("term", str),
+        ("term_id", int),
+        ("section_number", str),
+        ("component", str),
+        ("units", str),
+        ("num_enrolled", int),
+        ("max_enrolled", int),
+        ("num_waitlist", int),
+        ("max_waitlist", int),
+        ("enroll_status", str),
+        ("add_consent", str),
+        ("drop_consent", str),
+        ("instruction_mode", str),
+        ("notes", str),
+        ("attributes", str),
+    ),
+    "schedules": (
+        ("year", str),
+        ("class_id", int),
+        ("term_id", int),
+        ("start_date", str),
+        ("end_date", str),
+        ("start_time", str),
+        ("end_time", str),
+        ("location", str),
+        ("days", str),
+        ("instructors", str),
+    ),
+}
+
+FORMATS = ("jsonl", "csv", "parquet", "sqlite")
+
+
+def _joined(values: Iterable[str]) -> str:
+    return "; ".join(sorted(values))
+
+
+def table_rows(course: Course) -> Dict[str, List[tuple]]:
+    """
+    Flatten a course into rows of the courses, sections and schedules tables
+
+    Args:
+        course (Course): Course to flatten
+
+    Returns:
+        Dict[str, List[tuple]]: Rows for each table, in the column order of TABLES
+
+    """
+    admin = course.administrative_information
+    rows = {
+        "courses": [
+            (
+                course.year,
+                admin.course_id,
+                course.subject,
+                course.code,
+                course.title,
+                course.description,
+                _joined(course.gers),
+                course.repeatable,
+                course.grading,
+                course.units_min,
+                course.units_max,
+                course.remote,
+                _joined(lo.requirement_code for lo in course.learning_objectives),
+                admin.effective_status,
+                admin.offer_number,
+                admin.academic_group,
+                admin.academic_organization,
+                admin.academic_career,
+                admin.final_exam_flag,
+                _joined(f"{attr.name}::{attr.value}" for attr in course.attributes),
+                _joined(f"{tag.organization}::{tag.name}" for tag in course.tags),
+            )
+        ],
+        "sections": [],
+        "schedules": [],
+    }
+    for section in sorted(course.sections, key=lambda section: section.class_id):
+        rows["sections"].append(
+            (
+                course.year,
+                section.course_id,
+                section.subject,
+                section.code,
+                section.class_id,
+                section.term,
+                section.term_id,
+                section.section_number,
+                section.component,
+                section.units,
+                section.num_enrolled,
+                section.max_enrolled,
+                section.num_waitlist,
+                section.max_waitlist,
+                section.enroll_status,
+                section.add_consent,
+                section.drop_consent,
+                section.instruction_mode,
+                section.notes,
+                _joined(f"{attr.name}::{attr.value}" for attr in section.attributes),
+            )
+        )
+        for schedule in section.schedules:
+            rows["schedules"].append(
+                (
+                    course.year,
+                    section.class_id,
+                    section.term_id,
+                    schedule.start_date,
+                    schedule.end_date,
+                    schedule.start_time,
+                    schedule.end_time,
+                    schedule.location,
+                    " ".join(schedule.days),
+                    _joined(instr.sunet for instr in schedule.instructors),
+                )
+            )
+    return rows
+
+
+class Writer(ABC):
+    """
+    Writes batches of courses to a destination
+
+    Subclasses implement write() and, if needed, close(). Writers are context
+    managers that close themselves on exit.
+
+    """
+
+    @abstractmethod
+    def write(self, courses: Iterable[Course]):
+        """Write a batch of courses"""
+
+    def close(self):
+        """Flush and release the destination"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JsonlWriter(Writer):
+    """
+    Writes one JSON object per course and line, as serialized by
+    explorecourses.serialization
+
+    Each batch is flushed once written, such that a checkpoint that records the
+    batch as done never runs ahead of the file.
+
+    Args:
+        path (str): Path of the file to write, or "-" for standard output
+        append (bool): Whether to append to an existing file, e.g., to resume an
+            interrupted export, rather than to overwrite it
+
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        if path == "-":
+            self._file = sys.stdout
+        else:
+            self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, courses):
+        write_jsonl(courses, self._file)
+        self._file.flush()
+
+    def close(self):
+        if self._file is sys.stdout:
+            self._file.flush()
+        else:
+            self._file.close()
+
+
+class TableWriter(Writer):
+    """Writer for the tabular formats, which receive rows for each table"""
+
+    def write(self, courses):
+        batch: Dict[str, List[tuple]] = {table: [] for table in TABLES}
+        for course in courses:
+            for table, rows in table_rows(course).items():
+                batch[table].extend(rows)
+        for table, rows in batch.items():
+            if rows:
+                self.write_rows(table, rows)
+
+    @abstractmethod
+    def write_rows(self, table: str, rows: List[tuple]):
+        """Write rows to one of the tables"""
+
+
+class CsvWriter(TableWriter):
+    """
+    Writes a CSV file with a header for each table
+
+    Each batch is flushed once written, like with JsonlWriter.
+
+    Args:
+        directory (str): Directory to write courses.csv, sections.csv and
+            schedules.csv to. Created if it does not exist.
+        append (bool): Whether to append to existing files, e.g., to resume an
+            interrupted export, rather than to overwrite them. The header is only
+            written to files that are new or empty.
+
+    """
+
+    def __init__(self, directory: str, append: bool = False):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._files = {}
+        self._writers = {}
+        for table, columns in TABLES.items():
+            path = os.path.join(directory, f"{table}.csv")
+            f = open(path, "a" if append else "w", encoding="utf-8", newline="")
+            self._files[table] = f
+            self._writers[table] = csv.writer(f)
+            if f.tell() == 0:
+                self._writers[table].writerow(name for name, _ in columns)
+
+    def write(self, courses):
+        super().write(courses)
+        for f in self._files.values():
+            f.flush()
+
+    def write_rows(self, table, rows):
+        self._writers[table].writerows(rows)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+class SqliteWriter(TableWriter):
+    """
+    Writes the tables to an SQLite database, committing after each batch
+
+    Args:
+        path (str): Path of the database. Existing tables are appended to.
+
+    """
+
+    _TYPES = {str: "TEXT", int: "INTEGER", bool: "INTEGER"}
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._insert = {}
+        for table, columns in TABLES.items():
+            spec = ", ".join(f"{name} {self._TYPES[type_]}" for name, type_ in columns)
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS {table} ({spec})")
+            placeholders = ", ".join("?" * len(columns))
+            self._insert[table] = f"INSERT INTO {table} VALUES ({placeholders})"
+        self._db.commit()
+
+    def write(self, courses):
+        super().write(courses)
+        self._db.commit()
+
+    def write_rows(self, table, rows):
+        self._db.executemany(self._insert[table], rows)
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+
+class ParquetWriter(TableWriter):
+    """
+    Writes a Parquet file for each table, one row group per batch of rows
+
+    Requires the pyarrow package.
+
+    Args:
+        directory (str): Directory to write courses.parquet, sections.parquet and
+            schedules.parquet to. Created if it does not exist.
+        row_group_size (int): Number of rows buffered before a row group is written
+        append (bool): Parquet files cannot be appended to, so this raises
+            ValueError if any of the files exists
+
+    """
+
+    def __init__(
+        self, directory: str, row_group_size: int = 50_000, append: bool = False
+    ):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise ImportError("ParquetWriter requires the pyarrow package") from exc
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        if append and any(
+            os.path.exists(os.path.join(directory, f"{table}.parquet"))
+            for table in TABLES
+        ):
+            raise ValueError(
+                f"cannot resume into the existing Parquet files in '{directory}'"
+            )
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.row_group_size = row_group_size
+        types = {str: pyarrow.string(), int: pyarrow.int64(), bool: pyarrow.bool_()}
+        self._schemas = {
+            table: pyarrow.schema([(name, types[type_]) for name, type_ in columns])
+            for table, columns in TABLES.items()
+        }
+        self._buffers: Dict[str, List[tuple]] = {table: [] for table in TABLES}
+        self._writers = {}
+
+    def write_rows(self, table, rows):
+        buffer = self._buffers[table]
+        buffer.extend(rows)
+        if len(buffer) >= self.row_group_size:
+            self._flush(table)
+
+    def _flush(self, table: str):
+        schema = self._schemas[table]
+        columns = list(zip(*self._buffers[table])) or [()] * len(schema)
+        batch = self._pa.Table.from_arrays(
+            [self._pa.array(col, type=f.type) for col, f in zip(columns, schema)],
+            schema=schema,
+        )
+        if table not in self._writers:
+            path = os.path.join(self.directory, f"{table}.parquet")
+            self._writers[table] = self._pq.ParquetWriter(path, schema)
+        self._writers[table].write_table(batch)
+        self._buffers[table].clear()
+
+    def close(self):
+        for table in TABLES:
+            if self._buffers[table] or table not in self._writers:
+                self._flush(table)
+            self._writers[table].close()
+
+
+def open_writer(path: str, format: str, append: bool = False) -> Writer:
+    """
+    Open a writer for one of the supported formats
+
+    Args:
+        path (str): File (JSONL, SQLite) or directory (CSV, Parquet) to write to
+        format (str): One of "jsonl", "csv", "parquet" and "sqlite"
+        append (bool): Whether to add to existing output rather than overwrite it
+
+    Returns:
+        Writer: The writer
+
+    """
+    writers = {
+        "jsonl": JsonlWriter,
+        "csv": CsvWriter,
+        "parquet": ParquetWriter,
+        "sqlite": SqliteWriter,
+    }
+    if format not in writers:
+        raise ValueError(f"unknown format '{format}'; choose from {FORMATS}")
+    if format == "sqlite":
+        # A database is always appended to
+        return SqliteWriter(path)
+    return writers[format](path, append=append)
+
+
+def guess_format(path: str) -> str:
+    """Guess the export format from the extension of a path"""
+    ext = os.path.splitext(path)[1].lower()
+    formats = {
+        ".jsonl": "jsonl",
+        ".ndjson": "jsonl",
+        ".csv": "csv",
+        ".parquet": "parquet",
+        ".db": "sqlite",
+        ".sqlite": "sqlite",
+        ".sqlite3": "sqlite",
+    }
+    if path == "-":
+        return "jsonl"
+    if ext not in formats:
+        raise ValueError(f"cannot guess the format of '{path}'; specify it")
+    return formats[ext]
@@ -0,0 +1,193 @@
+"""
+Implements the FixtureServer class, a local stand-in for the ExploreCourses site
+
+The server replays recorded or synthetic XML documents with configurable latency,
+padding and error injection, such that crawls can be tested and benchmarked offline.
+
+"""
+
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional, Union
+from urllib.parse import parse_qsl, urlsplit
+
+Documents = Union[
+    Mapping[str, bytes], Callable[[str, Dict[str, str]], Optional[bytes]]
+]
+
+_SUBJECT_FILTER = "filter-departmentcode-"
+
+
+def load_documents(directory: str) -> Dict[str, bytes]:
+    """
+    Load recorded documents from a directory
+
+    Each file "<name>.xml" is served for the subject or query <name>, and the file
+    "schools.xml" is served for the list of schools.
+
+    """
+    documents = {}
+    for filename in os.listdir(directory):
+        name, ext = os.path.splitext(filename)
+        if ext == ".xml":
+            with open(os.path.join(directory, filename), "rb") as f:
+                documents[name] = f.read()
+    return documents
+
+
+class FixtureServer:
+    """
+    Local HTTP server replaying ExploreCourses XML
+
+    Search requests are answered with the document for the requested subject (taken
+    from the department code filter) or, failing that, the search query. Requests for
+    the root path are answered with the "schools" document. Unknown subjects yield an
+    empty result set.
+
+    Responses carry an ETag and honor If-None-Match, and are gzip-compressed if the
+    client accepts it, like the real site.
+
+    Args:
+        documents (Documents): Mapping from subject or query to document, or a
+            function of (name, query parameters) returning the document or None
+        latency (float): Delay in seconds before each response
+        padding (int): Number of bytes of whitespace added to each document to
+            inflate the payload
+        error_rate (float): Probability of answering with 503 Service Unavailable
+        truncate_rate (float): Probability of cutting the body of a response short
+        compress (bool): Whether to gzip responses to clients that accept it
+        seed (Optional[int]): Seed for the error injection
+        host (str): Host to bind to
+        port (int): Port to bind to. Defaults to 0, which selects a free port.
+
+    """
+
+    def __init__(
+        self,
+        documents: Documents,
+        latency: float = 0.0,
+        padding: int = 0,
+        error_rate: float = 0.0,
+        truncate_rate: float = 0.0,
+        compress: bool = True,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.documents = documents
+        self.latency = latency
+        self.padding = padding
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.compress = compress
+        self.requests = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def document(self, path: str, params: Dict[str, str]) -> bytes:
+        """The document served for a request"""
+        if path.rstrip("/") == "":
+            name = "schools"
+        else:
+            name = params.get("q", "")
+            for key in params:
+                if key.startswith(_SUBJECT_FILTER):
+                    name = key[len(_SUBJECT_FILTER) :]
+        if callable(self.documents):
+            document = self.documents(name, params)
+        else:
+            document = self.documents.get(name)
+        if document is None:
+            document = b'<?xml version="1.0" encoding="UTF-8"?><xml><courses/></xml>'
+        if self.padding:
+            document = document + b"\n" * self.padding
+        return document
+
+    def _draw(self, probability: float) -> bool:
+        if probability <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < probability
+
+
+def _make_handler(server: FixtureServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with server._lock:
+                server.requests += 1
+            # Drain any body, such that a kept-alive connection reaches the next request
+            length = self.headers.get("Content-Length", "0")
+            if length.isdigit() and int(length):
+                self.rfile.read(int(length))
+            if server.latency:
+                time.sleep(server.latency)
+            if server._draw(server.error_rate):
+                self._send(503, b"", {})
+                return
+            url = urlsplit(self.path)
+            body = server.document(url.path, dict(parse_qsl(url.query)))
+            etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", {"ETag": etag})
+                return
+            if server._draw(server.truncate_rate):
+                body = body[: len(body) // 2]
+            headers = {"ETag": etag, "Content-Type": "text/xml; charset=UTF-8"}
+            if server.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, compresslevel=1)
+                headers["Content-Encoding"] = "gzip"
+            self._send(200, body, headers)
+
+        def _send(self, status, body, headers):
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:
+                return
+            with server._lock:
+                server.bytes_sent += len(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
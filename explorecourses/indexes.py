@@ -0,0 +1,249 @@
+"""
+Implements in-memory indexes over a catalog of courses
+
+Includes:
+  - CrosslistIndex
+  - InstructorIndex
+  - TermIndex
+
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from explorecourses.classes import Course, Instructor, Schedule, Section
+from explorecourses.merged_course import MergedCourse, merge_crosslistings
+
+
+def _normalize_code(code: str) -> str:
+    return " ".join(code.upper().split())
+
+
+class CrosslistIndex:
+    """
+    Constant-time resolution of course codes, course ids and class ids
+
+    Every course code, course id and class id in a single year's catalog is mapped to
+    its merged course, and class ids are additionally mapped to their section. The
+    index is built in one pass over the merged courses.
+
+    Args:
+        courses (Iterable[Course]): Courses from a single year's catalog
+
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        self._by_code: Dict[str, MergedCourse] = {}
+        self._by_course_id: Dict[int, MergedCourse] = {}
+        self._by_class_id: Dict[int, Tuple[MergedCourse, Section]] = {}
+        year = None
+        for merged in merge_crosslistings(courses):
+            if year is None:
+                year = merged.year
+            elif merged.year != year:
+                raise ValueError("courses must all be from the same year")
+            self._by_course_id[merged.course_id] = merged
+            for listing in merged:
+                self._by_code[_normalize_code(listing.course_code)] = merged
+                for section in listing.sections:
+                    self._by_class_id.setdefault(section.class_id, (merged, section))
+        self.year = year
+
+    def __len__(self):
+        return len(self._by_course_id)
+
+    def __contains__(self, code: str) -> bool:
+        return _normalize_code(code) in self._by_code
+
+    def __getitem__(self, code: str) -> MergedCourse:
+        return self.course(code)
+
+    def course(self, code: str) -> MergedCourse:
+        """
+        Find a course by course code
+
+        Args:
+            code (str): Course code of any listing, e.g., "CS 229"
+
+        Returns:
+            MergedCourse: The merged course with all of its listings
+
+        """
+        try:
+            return self._by_code[_normalize_code(code)]
+        except KeyError:
+            raise KeyError(f"no course with code '{code}'") from None
+
+    def listings(self, code: str) -> Tuple[Course, ...]:
+        """Find all listings of the course with a given course code"""
+        return tuple(self.course(code))
+
+    def course_by_id(self, course_id: int) -> MergedCourse:
+        """Find a course by course id"""
+        return self._by_course_id[course_id]
+
+    def course_by_class_id(self, class_id: int) -> MergedCourse:
+        """Find the course that a section with a given class id belongs to"""
+        return self._by_class_id[class_id][0]
+
+    def section(self, class_id: int) -> Section:
+        """Find a section by class id"""
+        return self._by_class_id[class_id][1]
+
+
+class InstructorIndex:
+    """
+    Index of who teaches what, keyed by SUNet ID
+
+    Every instructor is mapped to the (course, section, schedule) triples they appear
+    in, built in a single pass over the catalog.
+
+    Args:
+        courses (Iterable[Course]): Courses to index
+
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        self._teaching: Dict[str, List[Tuple[Course, Section, Schedule]]] = {}
+        self._instructors: Dict[str, Instructor] = {}
+        for course in courses:
+            for section in course.sections:
+                for schedule in section.schedules:
+                    sunets = set()
+                    for instructor in schedule.instructors:
+                        sunet = instructor.sunet
+                        if not sunet or sunet in sunets:
+                            continue
+                        sunets.add(sunet)
+                        self._instructors.setdefault(sunet, instructor)
+                        self._teaching.setdefault(sunet, []).append(
+                            (course, section, schedule)
+                        )
+
+    def __len__(self):
+        return len(self._instructors)
+
+    def __contains__(self, sunet: str) -> bool:
+        return sunet in self._instructors
+
+    def __iter__(self):
+        return iter(self._instructors.values())
+
+    def __getitem__(self, sunet: str) -> Tuple[Tuple[Course, Section, Schedule], ...]:
+        return tuple(self._teaching.get(sunet, ()))
+
+    def instructor(self, sunet: str) -> Instructor:
+        """Find an instructor by SUNet ID"""
+        return self._instructors[sunet]
+
+    def courses(self, sunet: str) -> List[Course]:
+        """Find all courses taught by an instructor, in sorted order"""
+        return sorted({course for course, _, _ in self._teaching.get(sunet, ())})
+
+    def sections(self, sunet: str) -> List[Section]:
+        """Find all sections taught by an instructor, in order of class id"""
+        sections = {
+            section.class_id: section for _, section, _ in self._teaching.get(sunet, ())
+        }
+        return [sections[class_id] for class_id in sorted(sections)]
+
+
+class TermView:
+    """
+    The part of a catalog offered in one term
+
+    Holds the courses with sections in the term, in sorted order, and for each of
+    them only its sections in the term, in order of class id.
+
+    Args:
+        term_id (int): Id of the term, e.g., 1182
+        term (str): Name of the term, e.g., "2017-2018 Autumn"
+        sections (Dict[Course, Tuple[Section, ...]]): Sections in the term by course
+
+    """
+
+    def __init__(
+        self, term_id: int, term: str, sections: Dict[Course, Tuple[Section, ...]]
+    ):
+        self.term_id = term_id
+        self.term = term
+        self.courses = sorted(sections)
+        self._sections = sections
+
+    def __len__(self):
+        return len(self.courses)
+
+    def __contains__(self, course: Course) -> bool:
+        return course in self._sections
+
+    def __iter__(self) -> Iterator[Course]:
+        return iter(self.courses)
+
+    def sections(self, course: Course) -> Tuple[Section, ...]:
+        """Sections of a course in the term; empty if it is not offered"""
+        return self._sections.get(course, ())
+
+    def __repr__(self):
+        return f"TermView({self.term_id}, {self.term!r}, {len(self)} courses)"
+
+
+class TermIndex:
+    """
+    Catalog partitioned by term
+
+    Every term is mapped to a TermView of the courses offered in it, with their
+    sections bucketed by term, built in a single pass over the catalog. Term-scoped
+    queries then never look at courses or sections from other terms.
+
+    Args:
+        courses (Iterable[Course]): Courses to index, from one or more years
+
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        buckets: Dict[int, Dict[Course, List[Section]]] = {}
+        names: Dict[int, str] = {}
+        for course in courses:
+            for section in course.sections:
+                term_id = section.term_id
+                if term_id not in buckets:
+                    buckets[term_id] = {}
+                    names[term_id] = section.term
+                buckets[term_id].setdefault(course, []).append(section)
+        self._views: Dict[int, TermView] = {
+            term_id: TermView(
+                term_id,
+                names[term_id],
+                {
+                    course: tuple(sorted(sections, key=lambda s: s.class_id))
+                    for course, sections in by_course.items()
+                },
+            )
+            for term_id, by_course in sorted(buckets.items())
+        }
+        self._by_name = {view.term: view for view in self._views.values()}
+
+    def __len__(self):
+        return len(self._views)
+
+    def __contains__(self, term_id: int) -> bool:
+        return term_id in self._views
+
+    def __iter__(self) -> Iterator[TermView]:
+        return iter(self._views.values())
+
+    def __getitem__(self, term_id: int) -> TermView:
+        try:
+            return self._views[term_id]
+        except KeyError:
+            raise KeyError(f"no term with id {term_id}") from None
+
+    def get(self, term_id: int) -> Optional[TermView]:
+        """Find the view of a term by id, or None if no course is offered in it"""
+        return self._views.get(term_id)
+
+    def term(self, name: str) -> TermView:
+        """Find the view of a term by its name, e.g., 2017-2018 Autumn"""
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise KeyError(f"no term named '{name}'") from None
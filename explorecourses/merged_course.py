@@ -5,11 +5,12 @@ Implements the MergedCourse class, which computes and represents merged course l
 
 from dataclasses import dataclass
 from collections import defaultdict
-from functools import total_ordering
+from functools import cached_property, total_ordering
 import re
-from typing import FrozenSet, Iterable, List, Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
 from explorecourses.classes import (
+    SectionAggregates,
     LearningObjective,
     Attribute,
     Section,
@@ -21,12 +22,12 @@ from explorecourses.classes import (
 
 @total_ordering
 @dataclass(frozen=True)
-class MergedCourse:
+class MergedCourse(SectionAggregates):
     """Container and unified representation of multiple listings of a course"""
 
     year: str
     title: str
-    description: str
+    raw_description: str
     repeatable: bool
     grading: str
     units_min: int
@@ -36,10 +37,31 @@ class MergedCourse:
     _listings: Tuple[Course]
 
     _crosslist_codes_pattern = re.compile(r" \([^)]*\)$")
+    _merged_fields = (
+        "description",
+        "repeatable",
+        "grading",
+        "units_min",
+        "units_max",
+        "learning_objectives",
+        "attributes",
+    )
 
     @classmethod
-    def from_listings(cls, listings: Iterable[Course]):
-        """Construct new MergedCourse from a collection of Course objects"""
+    def from_listings(cls, listings: Iterable[Course], validate: bool = False):
+        """
+        Construct new MergedCourse from a collection of Course objects
+
+        Args:
+            listings (Iterable[Course]): Listings of the same course
+            validate (bool): Whether to check that the listings agree on all the
+                fields that are merged. Fields that refer to the same object in all
+                listings are not compared.
+
+        Returns:
+            MergedCourse: The merged course
+
+        """
         listings = tuple(sorted(set(listings)))
         base = listings[0]
         rest = listings[1:]
@@ -49,24 +71,26 @@ class MergedCourse:
         if title_match is not None:
             title_stop = title_match.start()
 
-        if any((base.year, base.course_id) != (c.year, c.course_id) for c in rest):
+        key = (base.year, base.course_id)
+        if any(key != (c.year, c.course_id) for c in rest):
             raise ValueError("not all entries are listings of the same course")
 
-        # I _think_ the following are always equal for crosslistings. The asserts are to
-        # notify of exceptions such that the class layout can be adjusted accordingly.
-        assert all(base.title[:title_stop] == c.title[:title_stop] for c in rest)
-        assert all(base.description == c.description for c in rest)
-        assert all(base.repeatable == c.repeatable for c in rest)
-        assert all(base.grading == c.grading for c in rest)
-        assert all(base.units_min == c.units_min for c in rest)
-        assert all(base.units_max == c.units_max for c in rest)
-        assert all(base.learning_objectives == c.learning_objectives for c in rest)
-        assert all(base.attributes == c.attributes for c in rest)
+        # I _think_ the following are always equal for crosslistings. Validation
+        # notifies of exceptions such that the class layout can be adjusted accordingly.
+        if validate:
+            for c in rest:
+                if base.title[:title_stop] != c.title[:title_stop]:
+                    raise ValueError(f"listings of {key} differ in title")
+                for name in cls._merged_fields:
+                    base_value = getattr(base, name)
+                    value = getattr(c, name)
+                    if base_value is not value and base_value != value:
+                        raise ValueError(f"listings of {key} differ in {name}")
 
         return cls(
             base.year,
             base.title[:title_stop],
-            base.description,
+            base.raw_description,
             base.repeatable,
             base.grading,
             base.units_min,
@@ -82,6 +106,20 @@ class MergedCourse:
     def __len__(self):
         return len(self._listings)
 
+    @property
+    def description(self) -> str:
+        """Description, decoded on first access and shared with the first listing"""
+        return self._listings[0].description
+
+    @cached_property
+    def sections(self) -> FrozenSet[Section]:
+        """Sections of all listings, counting sections shared by listings once"""
+        sections = {}
+        for listing in self._listings:
+            for section in listing.sections:
+                sections.setdefault(section.class_id, section)
+        return frozenset(sections.values())
+
     @property
     def course_code(self):
         """Course codes for all listings"""
@@ -92,23 +130,138 @@ class MergedCourse:
         """Unique course id"""
         return self[0].administrative_information.course_id
 
+    @cached_property
+    def _key(self):
+        return (self.year, self.course_code)
+
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return NotImplemented
-        return (self.year, self.course_code) == (other.year, other.course_code)
+        return self._key == other._key
 
     def __lt__(self, other):
         if not isinstance(other, type(self)):
             return NotImplemented
-        return (self.year, self.course_code) < (other.year, other.course_code)
+        return self._key < other._key
 
     def __hash__(self):
-        return hash((self.year, self.course_code))
+        return hash(self._key)
 
 
-def merge_crosslistings(courses: Iterable[Course]) -> List[MergedCourse]:
+def merge_crosslistings(
+    courses: Iterable[Course], validate: bool = False
+) -> List[MergedCourse]:
     """Merge cross-listings of the same course in a collection of courses"""
     course_groups = defaultdict(list)
     for course in courses:
         course_groups[(course.year, course.course_id)].append(course)
-    return [MergedCourse.from_listings(group) for group in course_groups.values()]
+    return [
+        MergedCourse.from_listings(group, validate) for group in course_groups.values()
+    ]
+
+
+class MergedIndex:
+    """
+    Incrementally maintained index of merged courses
+
+    Courses are grouped by year and course id. Adding courses only re-merges the
+    groups they belong to, and a listing with the same year and course code as an
+    existing one replaces it, such that refreshed courses can be added as they come.
+    A listing that moves to another course id leaves its previous group, and
+    courses dropped from the catalog are removed with remove().
+
+    Args:
+        courses (Iterable[Course]): Initial courses to merge
+        validate (bool): Whether to check the consistency of merged listings
+
+    """
+
+    def __init__(self, courses: Iterable[Course] = (), validate: bool = False):
+        self.validate = validate
+        self._groups: Dict[Tuple[str, int], Dict[Tuple[str, str], Course]] = {}
+        self._merged: Dict[Tuple[str, int], MergedCourse] = {}
+        # Group of each listing, by year and course code
+        self._group_of: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        self.add(courses)
+
+    def add(self, courses: Iterable[Course]) -> List[MergedCourse]:
+        """
+        Add courses to the index
+
+        Args:
+            courses (Iterable[Course]): Courses to add
+
+        Returns:
+            List[MergedCourse]: The merged courses that were created or updated
+
+        """
+        touched = {}
+        for course in courses:
+            key = (course.year, course.course_id)
+            previous = self._discard(course)
+            if previous is not None:
+                touched[previous] = None
+            self._groups.setdefault(key, {})[course._key] = course
+            self._group_of[course._key] = key
+            touched[key] = None
+        return self._merge(touched)
+
+    def remove(self, courses: Iterable[Course]) -> List[MergedCourse]:
+        """
+        Remove courses from the index, e.g., courses dropped from the catalog
+
+        Listings are matched by year and course code. Courses that are not in the
+        index are ignored.
+
+        Args:
+            courses (Iterable[Course]): Courses to remove
+
+        Returns:
+            List[MergedCourse]: The merged courses that were updated and still have
+                listings left
+
+        """
+        touched = {}
+        for course in courses:
+            previous = self._discard(course)
+            if previous is not None:
+                touched[previous] = None
+        return self._merge(touched)
+
+    def _discard(self, course: Course) -> Optional[Tuple[str, int]]:
+        """Remove the listing of a course from its group, and return the group key"""
+        key = self._group_of.pop(course._key, None)
+        if key is not None:
+            del self._groups[key][course._key]
+        return key
+
+    def _merge(self, keys: Iterable[Tuple[str, int]]) -> List[MergedCourse]:
+        updated = []
+        for key in keys:
+            listings = self._groups[key]
+            if not listings:
+                del self._groups[key]
+                self._merged.pop(key, None)
+                continue
+            merged = MergedCourse.from_listings(listings.values(), self.validate)
+            self._merged[key] = merged
+            updated.append(merged)
+        return updated
+
+    def get(
+        self, year: str, course_id: int, default: Optional[MergedCourse] = None
+    ) -> Optional[MergedCourse]:
+        """Find the merged course with a given year and course id"""
+        return self._merged.get((year, course_id), default)
+
+    def __getitem__(self, key: Tuple[str, int]) -> MergedCourse:
+        return self._merged[key]
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return key in self._merged
+
+    def __iter__(self) -> Iterator[MergedCourse]:
+        return iter(self._merged.values())
+
+    def __len__(self):
+        return len(self._merged)
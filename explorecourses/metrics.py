@@ -0,0 +1,201 @@
+"""
+Implements instrumentation hooks for CourseConnection and CourseParser
+
+A Metrics object receives a callback for each response, each parsed search response
+and each retry. The base class ignores them, MetricsTotals adds them up in memory,
+and PrometheusMetrics exports them as Prometheus counters and histograms.
+
+"""
+
+from dataclasses import dataclass, fields
+import threading
+
+
+class Metrics:
+    """
+    Receives timings and counts from a CourseConnection
+
+    The base class does nothing. Subclasses override the callbacks they are interested
+    in. Callbacks may be invoked concurrently from several threads.
+
+    """
+
+    def on_request(
+        self,
+        endpoint: str,
+        status: int,
+        first_byte: float,
+        download: float,
+        size: int,
+    ):
+        """
+        Called for each response, whether successful or not
+
+        Args:
+            endpoint (str): "search" or "schools"
+            status (int): HTTP status code
+            first_byte (float): Seconds from sending the request until the response
+                headers arrived, including connection setup
+            download (float): Seconds spent downloading and decoding the body, which
+                includes parsing it when it is parsed as it arrives
+            size (int): Size of the decoded body in bytes
+
+        """
+
+    def on_parse(self, fromstring: float, from_xml: float, courses: int, reused: int):
+        """
+        Called for each search response that is parsed
+
+        Args:
+            fromstring (float): Seconds spent in ET.fromstring
+            from_xml (float): Seconds spent constructing courses from elements
+            courses (int): Number of courses in the response
+            reused (int): Number of those courses taken from the memo of a
+                CourseParser instead of being parsed
+
+        """
+
+    def on_retry(self, endpoint: str, attempt: int, error: Exception):
+        """
+        Called when a request failed and is about to be retried
+
+        Args:
+            endpoint (str): "search" or "schools"
+            attempt (int): Number of the failed attempt, starting from 0
+            error (Exception): The transient failure
+
+        """
+
+
+@dataclass
+class MetricsTotals(Metrics):
+    """
+    Metrics that add up all timings and counts in memory
+
+    Useful for quick diagnostics and progress reports; read the attributes at any
+    time, or reset() between phases of a job.
+
+    """
+
+    requests: int = 0
+    not_modified: int = 0
+    retries: int = 0
+    bytes: int = 0
+    first_byte: float = 0.0
+    download: float = 0.0
+    parses: int = 0
+    fromstring: float = 0.0
+    from_xml: float = 0.0
+    courses: int = 0
+    reused: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Set all totals back to zero"""
+        with self._lock:
+            for field in fields(self):
+                setattr(self, field.name, field.default)
+
+    def on_request(self, endpoint, status, first_byte, download, size):
+        with self._lock:
+            self.requests += 1
+            self.not_modified += status == 304
+            self.bytes += size
+            self.first_byte += first_byte
+            self.download += download
+
+    def on_parse(self, fromstring, from_xml, courses, reused):
+        with self._lock:
+            self.parses += 1
+            self.fromstring += fromstring
+            self.from_xml += from_xml
+            self.courses += courses
+            self.reused += reused
+
+    def on_retry(self, endpoint, attempt, error):
+        with self._lock:
+            self.retries += 1
+
+
+class PrometheusMetrics(Metrics):
+    """
+    Metrics exported through prometheus_client
+
+    The following metrics are registered, prefixed by the namespace:
+
+    - request_seconds (histogram, labels endpoint and phase): time to first byte
+      ("first_byte") and body download ("download") of each response
+    - requests_total (counter, labels endpoint and status)
+    - response_bytes_total (counter, label endpoint)
+    - retries_total (counter, label endpoint)
+    - parse_seconds (histogram, label phase): time spent in ET.fromstring
+      ("fromstring") and constructing courses ("from_xml") per search response
+    - courses_total (counter): courses in parsed search responses
+    - courses_reused_total (counter): courses taken from the parser's memo
+
+    Requires the prometheus_client package.
+
+    Args:
+        namespace (str): Prefix of the metric names
+        registry (Optional[prometheus_client.CollectorRegistry]): Registry to
+            register the metrics with. Defaults to the global registry.
+
+    """
+
+    def __init__(self, namespace: str = "explorecourses", registry=None):
+        try:
+            import prometheus_client
+        except ImportError as exc:
+            raise ImportError(
+                "PrometheusMetrics requires the prometheus_client package"
+            ) from exc
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        kwargs = {"namespace": namespace, "registry": registry}
+        self.request_seconds = prometheus_client.Histogram(
+            "request_seconds",
+            "Time to first byte and body download of responses",
+            ["endpoint", "phase"],
+            **kwargs,
+        )
+        self.requests_total = prometheus_client.Counter(
+            "requests", "Responses received", ["endpoint", "status"], **kwargs
+        )
+        self.response_bytes_total = prometheus_client.Counter(
+            "response_bytes", "Bytes of decoded response bodies", ["endpoint"], **kwargs
+        )
+        self.retries_total = prometheus_client.Counter(
+            "retries",
+            "Requests retried after a transient failure",
+            ["endpoint"],
+            **kwargs,
+        )
+        self.parse_seconds = prometheus_client.Histogram(
+            "parse_seconds",
+            "Time spent parsing XML and constructing courses per search response",
+            ["phase"],
+            **kwargs,
+        )
+        self.courses_total = prometheus_client.Counter(
+            "courses", "Courses in parsed search responses", **kwargs
+        )
+        self.courses_reused_total = prometheus_client.Counter(
+            "courses_reused", "Courses reused from the parser's memo", **kwargs
+        )
+
+    def on_request(self, endpoint, status, first_byte, download, size):
+        self.request_seconds.labels(endpoint, "first_byte").observe(first_byte)
+        self.request_seconds.labels(endpoint, "download").observe(download)
+        self.requests_total.labels(endpoint, str(status)).inc()
+        self.response_bytes_total.labels(endpoint).inc(size)
+
+    def on_parse(self, fromstring, from_xml, courses, reused):
+        self.parse_seconds.labels("fromstring").observe(fromstring)
+        self.parse_seconds.labels("from_xml").observe(from_xml)
+        self.courses_total.inc(courses)
+        self.courses_reused_total.inc(reused)
+
+    def on_retry(self, endpoint, attempt, error):
+        self.retries_total.labels(endpoint).inc()
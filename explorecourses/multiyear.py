@@ -0,0 +1,119 @@
+"""
+Implements the MultiYearCatalog class, which holds the catalogs of several years
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from explorecourses.classes import Course
+from explorecourses.course_connection import CourseConnection
+
+
+class MultiYearCatalog:
+    """
+    Catalogs of several academic years with a per-course timeline
+
+    Catalogs loaded through the same CourseConnection share a pool of values, so
+    titles, descriptions, attributes, tags, learning objectives and other values that
+    are identical from year to year are stored once rather than once per year.
+
+    Args:
+        catalogs (Dict[str, List[Course]]): Courses for each academic year
+
+    """
+
+    def __init__(self, catalogs: Dict[str, List[Course]]):
+        self._catalogs = {year: list(catalogs[year]) for year in sorted(catalogs)}
+        self._timelines: Dict[int, Dict[str, List[Course]]] = {}
+        for year, courses in self._catalogs.items():
+            for course in courses:
+                self._timelines.setdefault(course.course_id, {}).setdefault(
+                    year, []
+                ).append(course)
+
+    @classmethod
+    def load(
+        cls,
+        years: Iterable[str],
+        subjects: Optional[Iterable[str]] = None,
+        *filters: str,
+        connection: Optional[CourseConnection] = None,
+        max_workers: int = 8,
+    ):
+        """
+        Fetch the catalogs of several years concurrently
+
+        Args:
+            years (Iterable[str]): Academic years, e.g., ["2020-2021", "2021-2022"]
+            subjects (Optional[Iterable[str]]): Subject codes to fetch. Defaults to
+                None, which selects all departments at the university for each year.
+            *filters (str): Search filters
+            connection (Optional[CourseConnection]): Connection to fetch through.
+                Defaults to a new connection.
+            max_workers (int): Maximum number of concurrent requests
+
+        Returns:
+            MultiYearCatalog: The catalogs of the given years
+
+        """
+        if connection is None:
+            connection = CourseConnection()
+        years = list(years)
+        subjects = None if subjects is None else list(subjects)
+
+        def subjects_of(year: str) -> List[str]:
+            if subjects is not None:
+                return subjects
+            return sorted(
+                dept.name
+                for school in connection.schools(year)
+                for dept in school.departments
+            )
+
+        def fetch(unit: Tuple[str, str]) -> Tuple[str, List[Course]]:
+            year, subject = unit
+            return year, connection.courses_by_subject(subject, *filters, year=year)
+
+        catalogs: Dict[str, Dict[Tuple[str, str], Course]] = {y: {} for y in years}
+        with ThreadPoolExecutor(max_workers) as executor:
+            units = [
+                (year, subject)
+                for year, year_subjects in zip(years, executor.map(subjects_of, years))
+                for subject in year_subjects
+            ]
+            for year, courses in executor.map(fetch, units):
+                for course in courses:
+                    catalogs[year].setdefault(course._key, course)
+        return cls({year: list(courses.values()) for year, courses in catalogs.items()})
+
+    @property
+    def years(self) -> List[str]:
+        """The academic years in the catalog, in order"""
+        return list(self._catalogs)
+
+    def __getitem__(self, year: str) -> List[Course]:
+        return self._catalogs[year]
+
+    def __iter__(self):
+        for courses in self._catalogs.values():
+            yield from courses
+
+    def __len__(self):
+        return sum(len(courses) for courses in self._catalogs.values())
+
+    def timeline(self, course_id: int) -> Dict[str, Tuple[Course, ...]]:
+        """
+        Find the listings of a course in each year it was offered
+
+        Args:
+            course_id (int): Unique course id, which is stable across years
+
+        Returns:
+            Dict[str, Tuple[Course, ...]]: Listings of the course for each year
+
+        """
+        return {
+            year: tuple(listings)
+            for year, listings in self._timelines.get(course_id, {}).items()
+        }
@@ -0,0 +1,232 @@
+"""
+Implements the CourseParser class, which parses search responses into courses
+
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import threading
+import time
+from typing import Iterable, List, Optional
+import warnings
+import xml.etree.ElementTree as ET
+
+from explorecourses.classes import Course, DecodeError, DecodeWarning, Pool
+from explorecourses.metrics import Metrics
+
+_COURSE_START = b"<course>"
+_COURSE_END = b"</course>"
+
+
+@dataclass
+class _ParseStats:
+    """Timings and counts accumulated while parsing one response"""
+
+    fromstring: float = 0.0
+    from_xml: float = 0.0
+    reused: int = 0
+
+
+class CourseParser:
+    """
+    Parser for search responses that skips re-parsing unchanged courses
+
+    The raw bytes of each <course> element are hashed, and the resulting Course is
+    remembered under that hash. When the same bytes turn up in a later response, the
+    remembered (immutable) Course is reused as is, such that only new or changed
+    courses are parsed. The memo is bounded and evicts the least recently used courses.
+
+    Equal values within the parsed courses, such as the instructors of different
+    sections, are shared through a pool that persists across calls. The default pool
+    is bounded too, such that a long-running parser does not hold every value it has
+    ever seen.
+
+    Args:
+        maxsize (int): Maximum number of courses to remember. Zero disables the memo.
+        pool (Optional[Pool]): Pool of shared values. Defaults to a new pool of at
+            most pool_size values.
+        metrics (Optional[Metrics]): Receives the time spent in ET.fromstring and
+            Course.from_xml for each parsed response. Defaults to None, in which case
+            nothing is timed.
+        pool_size (int): Maximum number of values in the default pool
+
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100_000,
+        pool: Optional[Pool] = None,
+        metrics: Optional[Metrics] = None,
+        pool_size: int = 1_000_000,
+    ):
+        self.maxsize = maxsize
+        self.pool = Pool(pool_size) if pool is None else pool
+        self.metrics = metrics
+        self._memo: "OrderedDict[bytes, Course]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._memo)
+
+    def clear(self):
+        """Forget all remembered courses and pooled values"""
+        with self._lock:
+            self._memo.clear()
+        self.pool.clear()
+
+    def course(self, raw: bytes) -> Course:
+        """Parse the raw bytes of a single <course> element"""
+        return self._course(raw, None)
+
+    def _build(self, raw: bytes, stats: Optional[_ParseStats]) -> Course:
+        if stats is None:
+            return Course.from_xml(ET.fromstring(raw), self.pool)
+        start = time.perf_counter()
+        elem = ET.fromstring(raw)
+        parsed = time.perf_counter()
+        course = Course.from_xml(elem, self.pool)
+        stats.fromstring += parsed - start
+        stats.from_xml += time.perf_counter() - parsed
+        return course
+
+    def _course(self, raw: bytes, stats: Optional[_ParseStats]) -> Course:
+        if self.maxsize <= 0:
+            return self._build(raw, stats)
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        with self._lock:
+            course = self._memo.get(digest)
+            if course is not None:
+                self._memo.move_to_end(digest)
+                if stats is not None:
+                    stats.reused += 1
+                return course
+        course = self._build(raw, stats)
+        with self._lock:
+            self._memo[digest] = course
+            if len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+        return course
+
+    def stream(self) -> "CourseStream":
+        """Start parsing a response that arrives in chunks; see CourseStream"""
+        return CourseStream(self)
+
+    def parse(self, content: bytes) -> List[Course]:
+        """
+        Parse a complete search response
+
+        The document outside of the <course> elements is parsed as well, such that a
+        truncated or otherwise malformed response raises ET.ParseError.
+
+        Args:
+            content (bytes): Body of the response
+
+        Returns:
+            List[Course]: The courses in the response, in document order
+
+        """
+        stream = self.stream()
+        stream.feed(content)
+        return stream.close()
+
+    def parse_chunks(self, chunks: Iterable[bytes]) -> List[Course]:
+        """
+        Parse a search response from an iterable of chunks, e.g., as downloaded
+
+        Each course is parsed as soon as its closing tag arrives, such that parsing
+        overlaps with the download and the complete body is never held in memory.
+
+        Args:
+            chunks (Iterable[bytes]): Consecutive pieces of the body
+
+        Returns:
+            List[Course]: The courses in the response, in document order
+
+        """
+        stream = self.stream()
+        for chunk in chunks:
+            stream.feed(chunk)
+        return stream.close()
+
+
+class CourseStream:
+    """
+    Incremental parse of one search response by a CourseParser
+
+    Chunks are scanned for complete <course> elements, which are parsed (or taken from
+    the memo) right away. Only the incomplete tail of the data is kept between chunks,
+    together with the small remainder of the document outside of the courses, which
+    is checked for well-formedness on close().
+
+    Args:
+        parser (CourseParser): Parser providing the memo, pool and metrics
+
+    """
+
+    def __init__(self, parser: CourseParser):
+        self.parser = parser
+        self.courses: List[Course] = []
+        self._stats = None if parser.metrics is None else _ParseStats()
+        self._skeleton: List[bytes] = []
+        self._tail = b""
+        # Offset in the tail from which to look for the end of an incomplete course
+        self._scan = 0
+
+    def feed(self, chunk: bytes):
+        """Parse the courses completed by a chunk of data"""
+        data = self._tail + chunk if self._tail else chunk
+        pos = 0
+        scan = self._scan
+        while True:
+            start = data.find(_COURSE_START, pos)
+            if start < 0:
+                # Keep what could be the beginning of a start tag split by the chunk
+                keep = max(pos, len(data) - len(_COURSE_START) + 1)
+                self._skeleton.append(data[pos:keep])
+                pos = keep
+                scan = 0
+                break
+            end = data.find(_COURSE_END, max(start, scan))
+            if end < 0:
+                self._skeleton.append(data[pos:start])
+                pos = start
+                scan = max(0, len(data) - start - len(_COURSE_END) + 1)
+                break
+            end += len(_COURSE_END)
+            self._skeleton.append(data[pos:start])
+            try:
+                self.courses.append(self.parser._course(data[start:end], self._stats))
+            except DecodeError as exc:
+                warnings.warn(f"skipping course: {exc}", DecodeWarning)
+            pos = end
+            scan = 0
+        self._tail = data[pos:]
+        self._scan = scan
+
+    def close(self) -> List[Course]:
+        """
+        Finish the parse
+
+        Returns:
+            List[Course]: The courses in the response, in document order
+
+        Raises:
+            ET.ParseError: If the response is truncated or otherwise malformed
+
+        """
+        self._skeleton.append(self._tail)
+        skeleton = b"".join(self._skeleton)
+        self._skeleton = []
+        self._tail = b""
+        stats = self._stats
+        if stats is None:
+            ET.fromstring(skeleton)
+            return self.courses
+        start = time.perf_counter()
+        ET.fromstring(skeleton)
+        stats.fromstring += time.perf_counter() - start
+        self.parser.metrics.on_parse(
+            stats.fromstring, stats.from_xml, len(self.courses), stats.reused
+        )
+        return self.courses
@@ -0,0 +1,266 @@
+"""
+Implements the Profile class, which profiles catalog operations
+
+Time is measured with cProfile and, optionally, memory with tracemalloc. Allocations
+are attributed to the function of this package that made them, such that the
+memory taken by each kind of object, e.g., through Section.from_xml, is visible.
+
+"""
+
+import ast
+import cProfile
+from dataclasses import dataclass
+import io
+import os
+import pstats
+import tracemalloc
+from typing import Dict, IO, List, Optional, Tuple
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# pstats identifies functions by (filename, first line, name)
+_Func = Tuple[str, int, str]
+
+
+@dataclass(frozen=True)
+class Allocation:
+    """Memory allocated by a function of this package and still held"""
+
+    function: str
+    size: int
+    count: int
+    calls: int
+
+    @property
+    def size_per_call(self) -> float:
+        return self.size / self.calls if self.calls else float("nan")
+
+
+def _function_spans(filename: str) -> List[Tuple[int, int, str]]:
+    """(first line, last line, qualified name) of each function in a module"""
+    with open(filename, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename)
+    module = os.path.splitext(os.path.basename(filename))[0]
+    spans = []
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                name = f"{prefix}{child.name}"
+                first = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                spans.append((first, child.end_lineno, name))
+                visit(child, f"{name}.")
+            elif isinstance(child, ast.ClassDef):
+                visit(child, f"{prefix}{child.name}.")
+
+    visit(tree, f"{module}.")
+    # Innermost functions last, such that they take precedence
+    spans.sort(key=lambda span: (span[0], -span[1]))
+    return spans
+
+
+class Profile:
+    """
+    Context manager that profiles the code run within it
+
+    Example:
+        with Profile(memory=True) as profile:
+            connection.courses_by_subject("MATH")
+        print(profile.report())
+        profile.write_folded("math.folded")
+
+    cProfile only sees the thread that entered the context, so profile sequential
+    operations such as CourseConnection.crawl rather than concurrent ones.
+
+    Args:
+        memory (bool): Whether to also trace allocations with tracemalloc, which
+            slows the profiled code down considerably
+        frames (int): Number of frames tracemalloc keeps per allocation. Allocations
+            are attributed to the innermost frame within this package, which must
+            be among them.
+
+    """
+
+    def __init__(self, memory: bool = False, frames: int = 32):
+        self.memory = memory
+        self.frames = frames
+        self.profiler = cProfile.Profile()
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self._stats: Optional[pstats.Stats] = None
+
+    def __enter__(self):
+        if self.memory:
+            tracemalloc.start(self.frames)
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.disable()
+        if self.memory:
+            self.snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        self._stats = None
+
+    @property
+    def stats(self) -> pstats.Stats:
+        """The cProfile statistics"""
+        if self._stats is None:
+            self._stats = pstats.Stats(self.profiler)
+        return self._stats
+
+    def dump_stats(self, path: str):
+        """Save the cProfile statistics, e.g., for snakeviz or pstats"""
+        self.stats.dump_stats(path)
+
+    def folded(self, min_weight: int = 1) -> Dict[str, int]:
+        """
+        Time per call stack in the folded format read by flamegraph tools
+
+        cProfile only records caller-callee pairs, so the time of a function is
+        split among the stacks leading to it in proportion to the time it spent
+        under each caller. Recursion is cut at the first repeated function.
+
+        Args:
+            min_weight (int): Stacks below this weight, in microseconds, are dropped
+
+        Returns:
+            Dict[str, int]: Microseconds spent in the innermost function of each
+                stack, keyed by stack, e.g., "crawl;courses_by_subject;parse"
+
+        """
+        stats = self.stats.stats
+        callees: Dict[_Func, List[_Func]] = {func: [] for func in stats}
+        roots = []
+        for func, (_, _, _, _, callers) in stats.items():
+            if not callers:
+                roots.append(func)
+            for caller in callers:
+                callees.setdefault(caller, []).append(func)
+        folded: Dict[str, int] = {}
+
+        def walk(func: _Func, stack: Tuple[str, ...], seen, fraction: float):
+            _, _, tottime, cumtime, _ = stats[func]
+            stack = stack + (_label(func),)
+            weight = int(tottime * fraction * 1e6)
+            if weight >= min_weight:
+                key = ";".join(stack)
+                folded[key] = folded.get(key, 0) + weight
+            seen = seen | {func}
+            for callee in callees.get(func, ()):
+                if callee in seen:
+                    continue
+                callee_cumtime = stats[callee][3]
+                if callee_cumtime <= 0:
+                    continue
+                share = stats[callee][4][func][3] / callee_cumtime
+                if cumtime * fraction * share * 1e6 >= min_weight:
+                    walk(callee, stack, seen, fraction * share)
+
+        for root in roots:
+            walk(root, (), frozenset(), 1.0)
+        return folded
+
+    def write_folded(self, file):
+        """
+        Write the folded stacks, e.g., for flamegraph.pl or speedscope
+
+        Args:
+            file (Union[str, IO[str]]): Path or text file to write to
+
+        """
+        if isinstance(file, str):
+            with open(file, "w", encoding="utf-8") as f:
+                return self.write_folded(f)
+        for stack, weight in sorted(self.folded().items()):
+            file.write(f"{stack} {weight}\n")
+
+    def allocations(self) -> List[Allocation]:
+        """
+        Memory still held at the end of the profile, by allocating function
+
+        Each allocation is attributed to the innermost frame of its traceback that
+        lies within this package, and allocations made elsewhere are ignored.
+        Requires memory=True.
+
+        Returns:
+            List[Allocation]: Allocations by function, largest first
+
+        """
+        if self.snapshot is None:
+            raise ValueError("memory was not traced; use Profile(memory=True)")
+        spans: Dict[str, List[Tuple[int, int, str]]] = {}
+        sizes: Dict[str, List[int]] = {}
+        for trace in self.snapshot.traces:
+            # Frames are ordered from the oldest to the most recent
+            for frame in reversed(trace.traceback):
+                if not frame.filename.startswith(_PACKAGE_DIR):
+                    continue
+                if frame.filename not in spans:
+                    spans[frame.filename] = _function_spans(frame.filename)
+                name = _enclosing(spans[frame.filename], frame.lineno)
+                if name is None:
+                    continue
+                total = sizes.setdefault(name, [0, 0])
+                total[0] += trace.size
+                total[1] += 1
+                break
+        calls = {}
+        for (filename, lineno, _), (_, ncalls, *_) in self.stats.stats.items():
+            for first, _, name in spans.get(filename, ()):
+                if first == lineno:
+                    calls[name] = calls.get(name, 0) + ncalls
+        allocations = [
+            Allocation(name, size, count, calls.get(name, 0))
+            for name, (size, count) in sizes.items()
+        ]
+        allocations.sort(key=lambda alloc: alloc.size, reverse=True)
+        return allocations
+
+    def report(self, limit: int = 25, sort: str = "cumulative") -> str:
+        """
+        Human-readable summary of the profile
+
+        Args:
+            limit (int): Number of functions and allocation sites to list
+            sort (str): pstats sort key for the functions
+
+        Returns:
+            str: The cProfile statistics, followed by the allocations if memory was
+                traced
+
+        """
+        out = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.sort_stats(sort).print_stats(limit)
+        if self.snapshot is not None:
+            _write_allocations(out, self.allocations()[:limit])
+        return out.getvalue()
+
+
+def _label(func: _Func) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        # Built-in function, named like "<built-in method time.sleep>"
+        return name.strip("<>")
+    module = os.path.splitext(os.path.basename(filename))[0]
+    return f"{module}:{name}:{lineno}"
+
+
+def _enclosing(spans: List[Tuple[int, int, str]], lineno: int) -> Optional[str]:
+    name = None
+    for first, last, qualname in spans:
+        if first > lineno:
+            break
+        if lineno <= last:
+            name = qualname
+    return name
+
+
+def _write_allocations(out: IO[str], allocations: List[Allocation]):
+    out.write("Memory held, by allocating function\n\n")
+    out.write(f"{'KiB':>12} {'blocks':>9} {'calls':>9} {'B/call':>9}  function\n")
+    for alloc in allocations:
+        out.write(
+            f"{alloc.size / 1024:12.1f} {alloc.count:9d} {alloc.calls:9d} "
+            f"{alloc.size_per_call:9.0f}  {alloc.function}\n"
+        )
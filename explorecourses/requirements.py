@@ -0,0 +1,128 @@
+"""
+Implements the RequirementIndex class, a bitmap index of GERs and requirement codes
+
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Sequence
+
+from explorecourses.classes import Course
+
+
+def requirement_codes(course: Course) -> FrozenSet[str]:
+    """All GER and learning objective requirement codes of a course"""
+    codes = {code for code in course.gers if code}
+    codes.update(
+        lo.requirement_code for lo in course.learning_objectives if lo.requirement_code
+    )
+    return frozenset(codes)
+
+
+class RequirementIndex:
+    """
+    Bitmap index of the requirements fulfilled by courses
+
+    Every distinct GER or requirement code is assigned a bit, and every course gets a
+    bitmask of its codes. Conversely, every code gets a bitset over the positions of
+    the courses that have it, such that multi-requirement queries are a handful of
+    AND/OR operations on arbitrary-precision integers, regardless of catalog size.
+
+    Args:
+        courses (Iterable[Course]): Courses to index
+
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        self.courses: List[Course] = list(courses)
+        self._bits: Dict[str, int] = {}
+        self.masks: List[int] = []
+        positions: List[List[int]] = []
+        for i, course in enumerate(self.courses):
+            mask = 0
+            for code in requirement_codes(course):
+                bit = self._bits.get(code)
+                if bit is None:
+                    bit = self._bits[code] = len(positions)
+                    positions.append([])
+                positions[bit].append(i)
+                mask |= 1 << bit
+            self.masks.append(mask)
+        self._bitsets: List[int] = []
+        for course_positions in positions:
+            bitmap = bytearray(len(self.courses) // 8 + 1)
+            for i in course_positions:
+                bitmap[i >> 3] |= 1 << (i & 7)
+            self._bitsets.append(int.from_bytes(bitmap, "little"))
+
+    def __len__(self):
+        return len(self.courses)
+
+    @property
+    def codes(self) -> List[str]:
+        """All requirement codes, in order of their bits"""
+        return list(self._bits)
+
+    def bit(self, code: str) -> int:
+        """The bit assigned to a requirement code"""
+        return self._bits[code]
+
+    def mask(self, codes: Iterable[str]) -> int:
+        """Bitmask of a collection of requirement codes"""
+        mask = 0
+        for code in codes:
+            mask |= 1 << self._bits[code]
+        return mask
+
+    def all_of(self, *codes: str) -> int:
+        """Bitset of the positions of courses that have all of the codes"""
+        result = (1 << len(self.courses)) - 1
+        for code in codes:
+            bit = self._bits.get(code)
+            if bit is None:
+                return 0
+            result &= self._bitsets[bit]
+        return result
+
+    def any_of(self, *codes: str) -> int:
+        """Bitset of the positions of courses that have any of the codes"""
+        result = 0
+        for code in codes:
+            bit = self._bits.get(code)
+            if bit is not None:
+                result |= self._bitsets[bit]
+        return result
+
+    def select(self, bitset: int) -> List[Course]:
+        """The courses at the positions in a bitset"""
+        bits = bin(bitset)[:1:-1]
+        courses = []
+        i = bits.find("1")
+        while i >= 0:
+            courses.append(self.courses[i])
+            i = bits.find("1", i + 1)
+        return courses
+
+    def query(
+        self,
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        none_of: Sequence[str] = (),
+    ) -> List[Course]:
+        """
+        Find courses by the requirements they fulfill
+
+        Args:
+            all_of (Sequence[str]): Codes that the courses must all have
+            any_of (Sequence[str]): Codes of which the courses must have at least one.
+                Ignored if empty.
+            none_of (Sequence[str]): Codes that the courses must not have
+
+        Returns:
+            List[Course]: The matching courses, in the order they were indexed
+
+        """
+        result = self.all_of(*all_of)
+        if any_of:
+            result &= self.any_of(*any_of)
+        if none_of:
+            result &= ~self.any_of(*none_of)
+        return self.select(result)
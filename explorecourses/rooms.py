@@ -0,0 +1,239 @@
+"""
+Implements the RoomIndex class, which answers room occupancy and utilization queries
+
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import time
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from explorecourses.classes import Course, Schedule, Section, _minutes
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+
+_LOCATION_PATTERN = re.compile(r"^(\w+)-(\w+)$")
+
+
+def _to_minutes(t: time) -> int:
+    return 60 * t.hour + t.minute
+
+
+def _to_time(minutes: int) -> time:
+    return time(*divmod(min(minutes, 24 * 60 - 1), 60))
+
+
+@dataclass(frozen=True, order=True)
+class Room:
+    """A room on campus"""
+
+    building: Optional[str]
+    room: str
+
+    @classmethod
+    def from_location(cls, location: Optional[str]):
+        """
+        Construct new Room from the location of a schedule
+
+        Locations of the form "<building>-<room>", e.g., "380-380C", are split into
+        building and room. Other locations are kept whole as the room, and missing or
+        unassigned locations yield None.
+
+        """
+        if location is None:
+            return None
+        location = " ".join(location.split())
+        if not location or location.upper() in ("TBA", "TBD"):
+            return None
+        match = _LOCATION_PATTERN.match(location)
+        if match is None:
+            return cls(None, location)
+        return cls(match.group(1), match.group(2))
+
+    def __str__(self):
+        if self.building is None:
+            return self.room
+        return f"{self.building}-{self.room}"
+
+
+@dataclass(frozen=True)
+class Occupancy:
+    """A meeting that occupies a room on a weekday"""
+
+    start: int  # Minutes past midnight
+    end: int
+    section: Section
+    schedule: Schedule
+
+
+class _DayOccupancy:
+    """Sorted occupancy of a room on one weekday, with merged busy intervals"""
+
+    def __init__(self, occupancies: List[Occupancy]):
+        self.occupancies = sorted(occupancies, key=lambda o: (o.start, o.end))
+        starts: List[int] = []
+        ends: List[int] = []
+        for o in self.occupancies:
+            if ends and o.start <= ends[-1]:
+                ends[-1] = max(ends[-1], o.end)
+            else:
+                starts.append(o.start)
+                ends.append(o.end)
+        self.starts = starts
+        self.ends = ends
+        self.cumulative = [0]
+        for start, end in zip(starts, ends):
+            self.cumulative.append(self.cumulative[-1] + end - start)
+
+    def busy(self, start: int, end: int) -> int:
+        """Number of occupied minutes within a window"""
+        i = bisect_right(self.ends, start)
+        j = bisect_left(self.starts, end)
+        if i >= j:
+            return 0
+        total = self.cumulative[j] - self.cumulative[i]
+        total -= max(0, start - self.starts[i])
+        total -= max(0, self.ends[j - 1] - end)
+        return total
+
+    def free(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Unoccupied intervals within a window"""
+        slots = []
+        cursor = start
+        for i in range(bisect_right(self.ends, start), len(self.starts)):
+            if self.starts[i] >= end:
+                break
+            if self.starts[i] > cursor:
+                slots.append((cursor, self.starts[i]))
+            cursor = max(cursor, self.ends[i])
+        if cursor < end:
+            slots.append((cursor, end))
+        return slots
+
+
+class RoomIndex:
+    """
+    Index of room occupancy by weekday
+
+    Schedules are grouped by their normalized location and weekday, and the meeting
+    intervals of each room and day are kept sorted and merged, such that utilization
+    and free-slot queries for any time window take logarithmic time.
+
+    Sections from different terms occupy rooms in different parts of the year, so an
+    index should usually be restricted to a single term.
+
+    Args:
+        courses (Iterable[Course]): Courses to index
+        term_id (Optional[int]): Only index sections in the term with this id
+
+    """
+
+    def __init__(self, courses: Iterable[Course], term_id: Optional[int] = None):
+        occupancies: Dict[Room, Dict[str, List[Occupancy]]] = {}
+        rooms: Dict[str, Optional[Room]] = {}
+        for course in courses:
+            for section in course.sections:
+                if term_id is not None and section.term_id != term_id:
+                    continue
+                for schedule in section.schedules:
+                    location = schedule.location
+                    if location not in rooms:
+                        rooms[location] = Room.from_location(location)
+                    room = rooms[location]
+                    start = _minutes(schedule.start_time)
+                    end = _minutes(schedule.end_time)
+                    if room is None or start is None or end is None or end <= start:
+                        continue
+                    days = occupancies.setdefault(room, {})
+                    occupancy = Occupancy(start, end, section, schedule)
+                    for day in schedule.days:
+                        days.setdefault(day, []).append(occupancy)
+        self._rooms = {
+            room: {day: _DayOccupancy(occ) for day, occ in days.items()}
+            for room, days in occupancies.items()
+        }
+        self._empty = _DayOccupancy([])
+
+    def __len__(self):
+        return len(self._rooms)
+
+    def __contains__(self, room: Room) -> bool:
+        return room in self._rooms
+
+    def rooms(self, building: Optional[str] = None) -> List[Room]:
+        """All rooms in use, optionally only those in a given building"""
+        return sorted(
+            (r for r in self._rooms if building is None or r.building == building),
+            key=str,
+        )
+
+    def _day(self, room: Room, day: str) -> _DayOccupancy:
+        return self._rooms.get(room, {}).get(day, self._empty)
+
+    def occupancy(self, room: Room, day: str) -> List[Occupancy]:
+        """All meetings in a room on a weekday, in order of start time"""
+        return list(self._day(room, day).occupancies)
+
+    def utilization(
+        self,
+        room: Room,
+        start: time = time(8),
+        end: time = time(18),
+        days: Sequence[str] = WEEKDAYS,
+    ) -> float:
+        """
+        Fraction of a time window during which a room is occupied
+
+        Args:
+            room (Room): The room
+            start (time): Start of the daily window
+            end (time): End of the daily window
+            days (Sequence[str]): Weekdays to include, e.g., ["Monday", "Friday"]
+
+        Returns:
+            float: The occupied fraction of the window, between 0 and 1
+
+        """
+        start_min, end_min = _to_minutes(start), _to_minutes(end)
+        window = (end_min - start_min) * len(days)
+        if window <= 0:
+            raise ValueError("empty time window")
+        busy = sum(self._day(room, day).busy(start_min, end_min) for day in days)
+        return busy / window
+
+    def utilization_report(
+        self,
+        start: time = time(8),
+        end: time = time(18),
+        days: Sequence[str] = WEEKDAYS,
+    ) -> Dict[Room, float]:
+        """Utilization of every room for the same time window"""
+        return {room: self.utilization(room, start, end, days) for room in self.rooms()}
+
+    def free_slots(
+        self,
+        room: Room,
+        day: str,
+        start: time = time(8),
+        end: time = time(18),
+        min_length: int = 0,
+    ) -> List[Tuple[time, time]]:
+        """
+        Unoccupied intervals in a room on a weekday
+
+        Args:
+            room (Room): The room
+            day (str): The weekday, e.g., "Monday"
+            start (time): Start of the window
+            end (time): End of the window
+            min_length (int): Minimum length in minutes of the intervals to return
+
+        Returns:
+            List[Tuple[time, time]]: Start and end of each free interval
+
+        """
+        slots = self._day(room, day).free(_to_minutes(start), _to_minutes(end))
+        return [
+            (_to_time(a), _to_time(b)) for a, b in slots if b - a >= max(min_length, 1)
+        ]
@@ -0,0 +1,480 @@
+"""
+Implements JSON serialization of the catalog classes
+
+Each class has a purpose-built encoder to and decoder from a JSON-compatible dict,
+rather than going through dataclasses.asdict, which deep-copies every nested object and
+leaves frozensets that JSON cannot represent. Sets become sorted lists, such that the
+same catalog always encodes to the same JSON, and the decoders rebuild the frozen
+objects, optionally sharing equal values through a Pool like the XML parser does.
+
+JSONL files hold one object per line and are written and read in a streaming fashion.
+
+"""
+
+import html
+import json
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+
+from explorecourses.classes import (
+    AdministrativeInformation,
+    Attribute,
+    Course,
+    Department,
+    Instructor,
+    LearningObjective,
+    Schedule,
+    School,
+    Section,
+    Tag,
+    _unpooled,
+)
+from explorecourses.merged_course import MergedCourse
+
+T = TypeVar("T")
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_decode_json = json.JSONDecoder().decode
+
+
+def _sorted(dicts: List[dict]) -> List[dict]:
+    """Sort the encoded elements of a set by their JSON, whatever their fields"""
+    if len(dicts) > 1:
+        dicts.sort(key=_encode_json)
+    return dicts
+
+
+def _department_to_dict(dept: Department) -> dict:
+    return {"longname": dept.longname, "name": dept.name}
+
+
+def _school_to_dict(school: School) -> dict:
+    return {
+        "name": school.name,
+        "departments": [
+            _department_to_dict(dept)
+            for dept in sorted(school.departments, key=lambda dept: dept.name)
+        ],
+    }
+
+
+def _learning_objective_to_dict(lo: LearningObjective) -> dict:
+    return {"requirement_code": lo.requirement_code, "description": lo.description}
+
+
+def _instructor_to_dict(instr: Instructor) -> dict:
+    return {
+        "name": instr.name,
+        "first_name": instr.first_name,
+        "middle_name": instr.middle_name,
+        "last_name": instr.last_name,
+        "sunet": instr.sunet,
+        "role": instr.role,
+    }
+
+
+def _schedule_to_dict(sched: Schedule) -> dict:
+    return {
+        "start_date": sched.start_date,
+        "end_date": sched.end_date,
+        "start_time": sched.start_time,
+        "end_time": sched.end_time,
+        "location": sched.location,
+        "days": list(sched.days),
+        "instructors": _sorted(
+            [_instructor_to_dict(instr) for instr in sched.instructors]
+        ),
+    }
+
+
+def _attribute_to_dict(attr: Attribute) -> dict:
+    return {
+        "name": attr.name,
+        "value": attr.value,
+        "description": attr.description,
+        "catalog_print": attr.catalog_print,
+        "schedule_print": attr.schedule_print,
+    }
+
+
+def _section_to_dict(section: Section) -> dict:
+    return {
+        "class_id": section.class_id,
+        "term": section.term,
+        "term_id": section.term_id,
+        "subject": section.subject,
+        "code": section.code,
+        "units": section.units,
+        "section_number": section.section_number,
+        "component": section.component,
+        "num_enrolled": section.num_enrolled,
+        "max_enrolled": section.max_enrolled,
+        "num_waitlist": section.num_waitlist,
+        "max_waitlist": section.max_waitlist,
+        "enroll_status": section.enroll_status,
+        "add_consent": section.add_consent,
+        "drop_consent": section.drop_consent,
+        "instruction_mode": section.instruction_mode,
+        "course_id": section.course_id,
+        "schedules": _sorted([_schedule_to_dict(sched) for sched in section.schedules]),
+        "notes": section.notes,
+        "attributes": _sorted(
+            [_attribute_to_dict(attr) for attr in section.attributes]
+        ),
+    }
+
+
+def _administrative_information_to_dict(admin: AdministrativeInformation) -> dict:
+    return {
+        "course_id": admin.course_id,
+        "effective_status": admin.effective_status,
+        "offer_number": admin.offer_number,
+        "academic_group": admin.academic_group,
+        "academic_organization": admin.academic_organization,
+        "academic_career": admin.academic_career,
+        "final_exam_flag": admin.final_exam_flag,
+        "catalog_print": admin.catalog_print,
+        "schedule_print": admin.schedule_print,
+        "max_units_repeat": admin.max_units_repeat,
+        "max_times_repeat": admin.max_times_repeat,
+    }
+
+
+def _tag_to_dict(tag: Tag) -> dict:
+    return {"organization": tag.organization, "name": tag.name}
+
+
+def _course_to_dict(course: Course) -> dict:
+    return {
+        "year": course.year,
+        "subject": course.subject,
+        "code": course.code,
+        "title": course.title,
+        "description": course.description,
+        "gers": sorted(course.gers),
+        "repeatable": course.repeatable,
+        "grading": course.grading,
+        "units_min": course.units_min,
+        "units_max": course.units_max,
+        "remote": course.remote,
+        "learning_objectives": _sorted(
+            [_learning_objective_to_dict(lo) for lo in course.learning_objectives]
+        ),
+        "sections": [
+            _section_to_dict(section)
+            for section in sorted(course.sections, key=lambda s: s.class_id)
+        ],
+        "administrative_information": _administrative_information_to_dict(
+            course.administrative_information
+        ),
+        "attributes": _sorted([_attribute_to_dict(attr) for attr in course.attributes]),
+        "tags": _sorted([_tag_to_dict(tag) for tag in course.tags]),
+    }
+
+
+def _merged_course_to_dict(merged: MergedCourse) -> dict:
+    return {
+        "year": merged.year,
+        "title": merged.title,
+        "description": merged.description,
+        "repeatable": merged.repeatable,
+        "grading": merged.grading,
+        "units_min": merged.units_min,
+        "units_max": merged.units_max,
+        "learning_objectives": _sorted(
+            [_learning_objective_to_dict(lo) for lo in merged.learning_objectives]
+        ),
+        "attributes": _sorted([_attribute_to_dict(attr) for attr in merged.attributes]),
+        "listings": [_course_to_dict(listing) for listing in merged],
+    }
+
+
+def _department_from_dict(d: dict, pool: Callable) -> Department:
+    return Department(d["longname"], d["name"])
+
+
+def _school_from_dict(d: dict, pool: Callable) -> School:
+    return School(
+        d["name"],
+        frozenset(_department_from_dict(dept, pool) for dept in d["departments"]),
+    )
+
+
+def _learning_objective_from_dict(d: dict, pool: Callable) -> LearningObjective:
+    return LearningObjective(d["requirement_code"], d["description"])
+
+
+def _instructor_from_dict(d: dict, pool: Callable) -> Instructor:
+    return Instructor(
+        d["name"],
+        d["first_name"],
+        d["middle_name"],
+        d["last_name"],
+        d["sunet"],
+        d["role"],
+    )
+
+
+def _schedule_from_dict(d: dict, pool: Callable) -> Schedule:
+    return Schedule(
+        d["start_date"],
+        d["end_date"],
+        d["start_time"],
+        d["end_time"],
+        d["location"],
+        tuple(d["days"]),
+        frozenset(
+            pool(_instructor_from_dict(instr, pool)) for instr in d["instructors"]
+        ),
+    )
+
+
+def _attribute_from_dict(d: dict, pool: Callable) -> Attribute:
+    return Attribute(
+        d["name"],
+        d["value"],
+        d["description"],
+        d["catalog_print"],
+        d["schedule_print"],
+    )
+
+
+def _attributes_from_list(attrs: List[dict], pool: Callable):
+    return pool(frozenset(pool(_attribute_from_dict(attr, pool)) for attr in attrs))
+
+
+def _section_from_dict(d: dict, pool: Callable) -> Section:
+    return Section(
+        d["class_id"],
+        d["term"],
+        d["term_id"],
+        d["subject"],
+        d["code"],
+        d["units"],
+        d["section_number"],
+        d["component"],
+        d["num_enrolled"],
+        d["max_enrolled"],
+        d["num_waitlist"],
+        d["max_waitlist"],
+        d["enroll_status"],
+        d["add_consent"],
+        d["drop_consent"],
+        d["instruction_mode"],
+        d["course_id"],
+        frozenset(_schedule_from_dict(sched, pool) for sched in d["schedules"]),
+        d["notes"],
+        _attributes_from_list(d["attributes"], pool),
+    )
+
+
+def _administrative_information_from_dict(
+    d: dict, pool: Callable
+) -> AdministrativeInformation:
+    return AdministrativeInformation(
+        d["course_id"],
+        d["effective_status"],
+        d["offer_number"],
+        d["academic_group"],
+        d["academic_organization"],
+        d["academic_career"],
+        d["final_exam_flag"],
+        d["catalog_print"],
+        d["schedule_print"],
+        d["max_units_repeat"],
+        d["max_times_repeat"],
+    )
+
+
+def _tag_from_dict(d: dict, pool: Callable) -> Tag:
+    return Tag(d["organization"], d["name"])
+
+
+def _escape_twice(text: str) -> str:
+    # Inverse of the decoding of Course.raw_description, such that round trips are
+    # exact
+    return html.escape(html.escape(text, quote=False), quote=False)
+
+
+def _course_from_dict(d: dict, pool: Callable) -> Course:
+    return Course(
+        d["year"],
+        d["subject"],
+        d["code"],
+        pool(d["title"]),
+        pool(_escape_twice(d["description"])),
+        pool(frozenset(d["gers"])),
+        d["repeatable"],
+        d["grading"],
+        d["units_min"],
+        d["units_max"],
+        d["remote"],
+        pool(
+            frozenset(
+                pool(_learning_objective_from_dict(lo, pool))
+                for lo in d["learning_objectives"]
+            )
+        ),
+        frozenset(_section_from_dict(section, pool) for section in d["sections"]),
+        pool(
+            _administrative_information_from_dict(
+                d["administrative_information"], pool
+            )
+        ),
+        _attributes_from_list(d["attributes"], pool),
+        pool(frozenset(pool(_tag_from_dict(tag, pool)) for tag in d["tags"])),
+    )
+
+
+def _merged_course_from_dict(d: dict, pool: Callable) -> MergedCourse:
+    # The merged fields are redundant with the listings, so derive them again
+    return MergedCourse.from_listings(
+        _course_from_dict(listing, pool) for listing in d["listings"]
+    )
+
+
+_ENCODERS: Dict[type, Callable[[Any], dict]] = {
+    Department: _department_to_dict,
+    School: _school_to_dict,
+    LearningObjective: _learning_objective_to_dict,
+    Instructor: _instructor_to_dict,
+    Schedule: _schedule_to_dict,
+    Attribute: _attribute_to_dict,
+    Section: _section_to_dict,
+    AdministrativeInformation: _administrative_information_to_dict,
+    Tag: _tag_to_dict,
+    Course: _course_to_dict,
+    MergedCourse: _merged_course_to_dict,
+}
+
+_DECODERS: Dict[type, Callable[[dict, Callable], Any]] = {
+    Department: _department_from_dict,
+    School: _school_from_dict,
+    LearningObjective: _learning_objective_from_dict,
+    Instructor: _instructor_from_dict,
+    Schedule: _schedule_from_dict,
+    Attribute: _attribute_from_dict,
+    Section: _section_from_dict,
+    AdministrativeInformation: _administrative_information_from_dict,
+    Tag: _tag_from_dict,
+    Course: _course_from_dict,
+    MergedCourse: _merged_course_from_dict,
+}
+
+
+def to_dict(obj: Any) -> dict:
+    """
+    Convert a catalog object to a JSON-compatible dict
+
+    Args:
+        obj (Any): Instance of any class in explorecourses.classes, or a MergedCourse
+
+    Returns:
+        dict: Nested dicts, lists, strings, numbers, booleans and None
+
+    """
+    try:
+        encode = _ENCODERS[type(obj)]
+    except KeyError:
+        raise TypeError(f"cannot serialize {type(obj).__name__}") from None
+    return encode(obj)
+
+
+def from_dict(cls: Type[T], data: dict, pool: Optional[Callable] = None) -> T:
+    """
+    Rebuild a catalog object from a dict produced by to_dict()
+
+    Args:
+        cls (Type[T]): Class of the object, e.g., Course
+        data (dict): The dict
+        pool (Optional[Callable]): Pool through which to share equal values, e.g.,
+            a Pool. Defaults to None, which shares nothing.
+
+    Returns:
+        T: The object
+
+    """
+    try:
+        decode = _DECODERS[cls]
+    except KeyError:
+        raise TypeError(f"cannot deserialize {cls.__name__}") from None
+    return decode(data, _unpooled if pool is None else pool)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize a catalog object to a compact JSON string"""
+    return _encode_json(to_dict(obj))
+
+
+def loads(cls: Type[T], s: str, pool: Optional[Callable] = None) -> T:
+    """Rebuild a catalog object of the given class from a JSON string"""
+    return from_dict(cls, _decode_json(s), pool)
+
+
+def write_jsonl(objs: Iterable[Any], file) -> int:
+    """
+    Write catalog objects to a JSONL file, one object per line
+
+    Args:
+        objs (Iterable[Any]): Objects to write, consumed lazily
+        file (Union[str, IO[str]]): Path or text file to write to. A path is
+            overwritten.
+
+    Returns:
+        int: Number of objects written
+
+    """
+    if isinstance(file, str):
+        with open(file, "w", encoding="utf-8") as f:
+            return write_jsonl(objs, f)
+    count = 0
+    write = file.write
+    for obj in objs:
+        write(_encode_json(to_dict(obj)))
+        write("\n")
+        count += 1
+    return count
+
+
+def iter_jsonl(
+    file, cls: Type[T] = Course, pool: Optional[Callable] = None
+) -> Iterator[T]:
+    """
+    Read catalog objects from a JSONL file one line at a time
+
+    Args:
+        file (Union[str, IO[str]]): Path or text file to read from
+        cls (Type[T]): Class of the objects. Defaults to Course.
+        pool (Optional[Callable]): Pool through which to share equal values
+
+    Yields:
+        T: The objects, in file order
+
+    """
+    if isinstance(file, str):
+        with open(file, encoding="utf-8") as f:
+            yield from iter_jsonl(f, cls, pool)
+        return
+    try:
+        decode = _DECODERS[cls]
+    except KeyError:
+        raise TypeError(f"cannot deserialize {cls.__name__}") from None
+    if pool is None:
+        pool = _unpooled
+    for line in file:
+        if line.strip():
+            yield decode(_decode_json(line), pool)
+
+
+def load_jsonl(file, cls: Type[T] = Course, pool: Optional[Callable] = None) -> List[T]:
+    """Read all catalog objects from a JSONL file; see iter_jsonl()"""
+    return list(iter_jsonl(file, cls, pool))
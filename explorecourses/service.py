@@ -0,0 +1,546 @@
+"""
+Implements the CatalogService class, a local read-only HTTP API over a catalog snapshot
+
+The service loads the catalog once, builds its indexes and the JSON of every course in
+memory, and answers lookups by subject, course code, text query, filters, instructor
+and schedule conflicts. The snapshot is rebuilt in the background on a schedule and
+swapped in atomically, such that many applications can share one warm cache instead of
+each crawling ExploreCourses on its own.
+
+The HTTP server is a minimal HTTP/1.1 implementation on top of asyncio streams: GET
+requests only, JSON responses, and persistent connections.
+
+"""
+
+import asyncio
+from dataclasses import dataclass
+from http import HTTPStatus
+from itertools import islice
+import json
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from explorecourses.classes import Course, Section, _minutes
+from explorecourses.course_connection import CourseConnection
+from explorecourses.indexes import CrosslistIndex, InstructorIndex, TermIndex
+from explorecourses.requirements import RequirementIndex
+from explorecourses.serialization import dumps, load_jsonl
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Iterable[Course]]
+
+_DAYS = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """Two sections that meet at overlapping times on the same days of a term"""
+
+    first: Section
+    second: Section
+    days: Tuple[str, ...]
+
+    def to_dict(self) -> dict:
+        return {
+            "class_ids": [self.first.class_id, self.second.class_id],
+            "term_id": self.first.term_id,
+            "days": list(self.days),
+        }
+
+
+def _meetings(section: Section) -> List[Tuple[str, int, int]]:
+    meetings = []
+    for schedule in section.schedules:
+        start = _minutes(schedule.start_time)
+        end = _minutes(schedule.end_time)
+        if start is None or end is None:
+            continue
+        meetings.extend((day, start, end) for day in schedule.days if day in _DAYS)
+    return meetings
+
+
+class CatalogSnapshot:
+    """
+    Immutable catalog with the indexes and encoded JSON used to answer queries
+
+    Args:
+        courses (Iterable[Course]): Courses of one or more years
+
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        self.courses = sorted(set(courses))
+        self.loaded_at = time.time()
+        self._json: Dict[Course, bytes] = {
+            course: dumps(course).encode() for course in self.courses
+        }
+        self._by_subject: Dict[str, List[Course]] = {}
+        by_year: Dict[str, List[Course]] = {}
+        for course in self.courses:
+            self._by_subject.setdefault(course.subject.upper(), []).append(course)
+            by_year.setdefault(course.year, []).append(course)
+        self._crosslists = {
+            year: CrosslistIndex(courses) for year, courses in by_year.items()
+        }
+        self.instructors = InstructorIndex(self.courses)
+        self.terms = TermIndex(self.courses)
+        self.requirements = RequirementIndex(self.courses)
+        self._search = [
+            (f"{course.course_code} {course.title}".lower(), course)
+            for course in self.courses
+        ]
+
+    def __len__(self):
+        return len(self.courses)
+
+    @property
+    def years(self) -> List[str]:
+        """The academic years in the snapshot"""
+        return sorted(self._crosslists)
+
+    def encode(self, courses: Iterable[Course]) -> bytes:
+        """JSON array of courses, assembled from the precomputed JSON of each"""
+        return b"[" + b",".join(self._json[course] for course in courses) + b"]"
+
+    def subject(self, subject: str) -> List[Course]:
+        """Courses listed under a subject"""
+        return self._by_subject.get(subject.upper(), [])
+
+    def course(self, code: str) -> List[Course]:
+        """All listings of the course with a given code, in each year"""
+        listings = []
+        for index in self._crosslists.values():
+            if code in index:
+                listings.extend(index.listings(code))
+        return listings
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Course]:
+        """Courses whose code or title contain all words of a query"""
+        words = query.lower().split()
+        matches = (
+            course
+            for text, course in self._search
+            if all(word in text for word in words)
+        )
+        return list(islice(matches, limit))
+
+    def filter(
+        self,
+        subject: Optional[str] = None,
+        term_id: Optional[int] = None,
+        gers: Sequence[str] = (),
+        component: Optional[str] = None,
+        units: Optional[int] = None,
+    ) -> List[Course]:
+        """
+        Courses matching all of the given criteria
+
+        Args:
+            subject (Optional[str]): Subject code
+            term_id (Optional[int]): Term in which the course has a section
+            gers (Sequence[str]): Requirement codes that the course must all fulfill
+            component (Optional[str]): Component of at least one section, e.g., "LEC"
+            units (Optional[int]): Number of units the course can be taken for
+
+        Returns:
+            List[Course]: The matching courses
+
+        """
+        term = None
+        if term_id is not None:
+            term = self.terms.get(term_id)
+            if term is None:
+                return []
+        if gers:
+            courses = self.requirements.query(all_of=gers)
+        elif subject is not None:
+            courses = self.subject(subject)
+        elif term is not None:
+            courses = term.courses
+        else:
+            courses = self.courses
+        if subject is not None:
+            subject = subject.upper()
+            courses = [c for c in courses if c.subject.upper() == subject]
+        if units is not None:
+            courses = [c for c in courses if c.units_min <= units <= c.units_max]
+        if term is not None:
+            courses = [c for c in courses if c in term]
+        if component is not None:
+            courses = [
+                c
+                for c in courses
+                if any(
+                    s.component == component
+                    for s in (c.sections if term is None else term.sections(c))
+                )
+            ]
+        return courses
+
+    def instructor(self, sunet: str) -> List[Course]:
+        """Courses taught by an instructor"""
+        return self.instructors.courses(sunet)
+
+    def section(self, class_id: int) -> Optional[Section]:
+        """Find a section by class id in any year"""
+        for index in self._crosslists.values():
+            try:
+                return index.section(class_id)
+            except KeyError:
+                pass
+        return None
+
+    def conflicts(self, class_ids: Iterable[int]) -> List[Conflict]:
+        """
+        Find pairs of sections that meet at overlapping times
+
+        Args:
+            class_ids (Iterable[int]): Class ids of the sections to check. Unknown
+                class ids are ignored.
+
+        Returns:
+            List[Conflict]: Each conflicting pair with the days on which it conflicts
+
+        """
+        sections = []
+        for class_id in dict.fromkeys(class_ids):
+            section = self.section(class_id)
+            if section is not None:
+                sections.append((section, _meetings(section)))
+        conflicts = []
+        for i, (first, first_meetings) in enumerate(sections):
+            for second, second_meetings in sections[i + 1 :]:
+                if first.term_id != second.term_id:
+                    continue
+                days = {
+                    day
+                    for day, start, end in first_meetings
+                    for other_day, other_start, other_end in second_meetings
+                    if day == other_day and start < other_end and other_start < end
+                }
+                if days:
+                    ordered = tuple(sorted(days, key=_DAYS.index))
+                    conflicts.append(Conflict(first, second, ordered))
+        return conflicts
+
+
+def crawl_loader(
+    connection: Optional[CourseConnection] = None,
+    years: Iterable[Optional[str]] = (None,),
+    subjects: Optional[Iterable[str]] = None,
+    *filters: str,
+    max_workers: int = 8,
+) -> Loader:
+    """
+    Loader that crawls the catalog through a CourseConnection
+
+    The connection is reused across refreshes, so that unchanged subjects are
+    answered with 304 Not Modified and unchanged courses are not parsed again.
+
+    Args:
+        connection (Optional[CourseConnection]): Connection to crawl through.
+            Defaults to a new connection.
+        years (Iterable[Optional[str]]): Academic years to load. Defaults to the
+            current year.
+        subjects (Optional[Iterable[str]]): Subject codes to load. Defaults to all
+            departments.
+        *filters (str): Search filters
+        max_workers (int): Maximum number of concurrent requests
+
+    Returns:
+        Loader: Function returning the crawled courses
+
+    """
+    if connection is None:
+        connection = CourseConnection()
+    years = list(years)
+    subjects = None if subjects is None else list(subjects)
+
+    def load() -> List[Course]:
+        courses = []
+        crawl = connection.crawl(
+            subjects, *filters, years=years, max_workers=max_workers
+        )
+        for _, unit_courses in crawl:
+            courses.extend(unit_courses)
+        return courses
+
+    return load
+
+
+def jsonl_loader(path: str) -> Loader:
+    """Loader that reads courses from a JSONL file written by the serializers"""
+    return lambda: load_jsonl(path)
+
+
+class _BadRequest(Exception):
+    pass
+
+
+def _int(value: Optional[str], name: str) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise _BadRequest(f"{name} must be an integer") from None
+
+
+class CatalogService:
+    """
+    Read-only HTTP API over a catalog snapshot, refreshed in the background
+
+    Endpoints (all GET, all returning JSON):
+
+    - /health: number of courses, years and age of the snapshot
+    - /subjects/<subject>: courses listed under a subject
+    - /courses/<code>: all listings of a course, e.g., /courses/CS%20106A
+    - /search?q=<words>&limit=<n>: courses whose code or title contain all words
+    - /filter?subject=&term_id=&ger=&component=&units=: courses matching all given
+      criteria; ger may be repeated
+    - /instructors/<sunet>: courses taught by an instructor
+    - /conflicts?class_id=<id>&class_id=<id>...: pairs of the given sections that
+      meet at overlapping times
+
+    Args:
+        loader (Loader): Function returning the courses of a snapshot, called in a
+            worker thread, e.g., crawl_loader() or jsonl_loader()
+        refresh_interval (Optional[float]): Seconds between the start of successive
+            refreshes. Defaults to None, which never refreshes.
+        host (str): Host to bind to
+        port (int): Port to bind to. Defaults to 0, which selects a free port.
+
+    """
+
+    def __init__(
+        self,
+        loader: Loader,
+        refresh_interval: Optional[float] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.host = host
+        self.port = port
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._refresher: Optional[asyncio.Task] = None
+        self._routes = {
+            "subjects": self._subject,
+            "courses": self._course,
+            "search": self._search,
+            "filter": self._filter,
+            "instructors": self._instructor,
+            "conflicts": self._conflicts,
+            "health": self._health,
+        }
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running service"""
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/"
+
+    async def refresh(self):
+        """Load a new snapshot in a worker thread and swap it in"""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        snapshot = await loop.run_in_executor(
+            None, lambda: CatalogSnapshot(self.loader())
+        )
+        self.snapshot = snapshot
+        logger.info(
+            "loaded %d courses in %.1f s", len(snapshot), time.monotonic() - started
+        )
+
+    async def _refresh_forever(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("refresh failed; keeping the previous snapshot")
+
+    async def start(self):
+        """Load the first snapshot and start serving"""
+        await self.refresh()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        if self.refresh_interval is not None:
+            self._refresher = asyncio.create_task(self._refresh_forever())
+        return self
+
+    async def stop(self):
+        """Stop serving and refreshing"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        """Start serving, if not yet started, and serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def run(self):
+        """Serve until interrupted"""
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                options = set()
+                length = "0"
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    name = name.strip().lower()
+                    if name == "connection":
+                        options.update(o.strip().lower() for o in value.split(","))
+                    elif name == "content-length":
+                        length = value.strip()
+                # HTTP/1.0 connections are only kept alive if the client asks for it
+                if parts[2:] == ["HTTP/1.1"]:
+                    keep_alive = "close" not in options
+                else:
+                    keep_alive = "keep-alive" in options
+                if not length.isdigit():
+                    # The end of the body, and thus the next request, is unknown
+                    parts = []
+                elif int(length):
+                    # Drain the body, which no endpoint reads, to reach the next request
+                    await reader.readexactly(int(length))
+                if len(parts) != 3:
+                    status, body = HTTPStatus.BAD_REQUEST, b'{"error":"bad request"}'
+                    keep_alive = False
+                elif parts[0] not in ("GET", "HEAD"):
+                    status, body = HTTPStatus.METHOD_NOT_ALLOWED, b"{}"
+                else:
+                    status, body = self.respond(parts[1])
+                # A response to HEAD has the headers of the response to GET
+                length = len(body)
+                if parts[:1] == ["HEAD"]:
+                    body = b""
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {length}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n".encode("latin-1")
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, target: str) -> Tuple[HTTPStatus, bytes]:
+        """
+        Answer a request for a path and query string
+
+        Args:
+            target (str): Request target, e.g., "/search?q=calculus"
+
+        Returns:
+            Tuple[HTTPStatus, bytes]: Status and JSON body of the response
+
+        """
+        url = urlsplit(target)
+        segments = [unquote(s) for s in url.path.strip("/").split("/", 1)]
+        route = self._routes.get(segments[0])
+        if route is None:
+            return HTTPStatus.NOT_FOUND, b'{"error":"not found"}'
+        arg = segments[1] if len(segments) > 1 else None
+        try:
+            return HTTPStatus.OK, route(self.snapshot, arg, parse_qs(url.query))
+        except _BadRequest as exc:
+            return HTTPStatus.BAD_REQUEST, json.dumps({"error": str(exc)}).encode()
+        except LookupError as exc:
+            return HTTPStatus.NOT_FOUND, json.dumps({"error": str(exc)}).encode()
+        except Exception:
+            logger.exception("failed to answer %s", target)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, b'{"error":"internal error"}'
+
+    @staticmethod
+    def _health(snapshot: CatalogSnapshot, arg, params) -> bytes:
+        return json.dumps(
+            {
+                "courses": len(snapshot),
+                "years": snapshot.years,
+                "age": time.time() - snapshot.loaded_at,
+            }
+        ).encode()
+
+    @staticmethod
+    def _subject(snapshot: CatalogSnapshot, subject, params) -> bytes:
+        if not subject:
+            raise _BadRequest("missing subject")
+        return snapshot.encode(snapshot.subject(subject))
+
+    @staticmethod
+    def _course(snapshot: CatalogSnapshot, code, params) -> bytes:
+        listings = snapshot.course(code or "")
+        if not listings:
+            raise LookupError(f"no course with code '{code}'")
+        return snapshot.encode(listings)
+
+    @staticmethod
+    def _search(snapshot: CatalogSnapshot, arg, params) -> bytes:
+        query = params.get("q", [""])[0]
+        limit = _int(params.get("limit", [None])[0], "limit")
+        if limit is not None and limit < 0:
+            raise _BadRequest("limit must not be negative")
+        return snapshot.encode(snapshot.search(query, limit))
+
+    @staticmethod
+    def _filter(snapshot: CatalogSnapshot, arg, params) -> bytes:
+        first = {name: values[0] for name, values in params.items()}
+        courses = snapshot.filter(
+            subject=first.get("subject"),
+            term_id=_int(first.get("term_id"), "term_id"),
+            gers=params.get("ger", ()),
+            component=first.get("component"),
+            units=_int(first.get("units"), "units"),
+        )
+        return snapshot.encode(courses)
+
+    @staticmethod
+    def _instructor(snapshot: CatalogSnapshot, sunet, params) -> bytes:
+        return snapshot.encode(snapshot.instructor(sunet or ""))
+
+    @staticmethod
+    def _conflicts(snapshot: CatalogSnapshot, arg, params) -> bytes:
+        class_ids = [_int(value, "class_id") for value in params.get("class_id", ())]
+        conflicts = snapshot.conflicts(class_ids)
+        return json.dumps([conflict.to_dict() for conflict in conflicts]).encode()
@@ -0,0 +1,414 @@
+"""
+Implements the SyntheticCatalog class, a seeded generator of ExploreCourses XML
+
+The generated documents follow the xml-20200810 view of the real site, with
+distributions of sections, schedules, instructors, cross-listings and description
+lengths chosen to resemble a real catalog year, and scale to any number of courses.
+
+"""
+
+import random
+import string
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from xml.sax.saxutils import escape
+
+# Name, term id digit, and start and end dates of each term
+_TERMS = (
+    ("Autumn", 2, "Sep 25, {0}", "Dec 8, {0}"),
+    ("Winter", 4, "Jan 8, {1}", "Mar 16, {1}"),
+    ("Spring", 6, "Apr 2, {1}", "Jun 6, {1}"),
+    ("Summer", 8, "Jun 25, {1}", "Aug 18, {1}"),
+)
+_TERM_WEIGHTS = (30, 30, 30, 5)
+_COMPONENTS = ("LEC", "SEM", "DIS", "LAB", "INS", "ACT", "COL", "WKS")
+_COMPONENT_WEIGHTS = (40, 20, 15, 8, 8, 4, 3, 2)
+_DAYS = (
+    "Monday Wednesday Friday",
+    "Tuesday Thursday",
+    "Monday Wednesday",
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+)
+_DAY_WEIGHTS = (30, 30, 15, 5, 5, 5, 5, 5)
+_GERS = ("WAY-A-II", "WAY-AQR", "WAY-CE", "WAY-ED", "WAY-ER", "WAY-FR", "WAY-SI")
+_GRADING = ("Letter (ABCD/NP)", "Letter or Credit/No Credit", "Satisfactory/No Credit")
+_ROLES = ("PI", "TA", "GP")
+# Course codes are numbers from 1 to 999, optionally with a letter suffix
+_SUFFIXES = ("", "A", "B")
+_CODES_PER_SUBJECT = 999 * len(_SUFFIXES)
+_WORDS = (
+    "analysis theory methods introduction advanced research topics design systems "
+    "students course study data applications models practice history culture social "
+    "political economic structure problems science learning project seminar focus "
+    "including emphasis principles foundations current contemporary critical writing "
+    "reading discussion laboratory computational experimental quantitative modern"
+).split()
+_SCHOOLS = (
+    "School of Engineering",
+    "School of Humanities and Sciences",
+    "School of Medicine",
+    "Graduate School of Business",
+    "School of Education",
+    "Law School",
+    "Doerr School of Sustainability",
+)
+
+
+def _clock(minutes: int) -> str:
+    hour, minute = divmod(minutes, 60)
+    meridiem = "AM" if hour < 12 else "PM"
+    return f"{(hour - 1) % 12 + 1}:{minute:02d}:00 {meridiem}"
+
+
+class SyntheticCatalog:
+    """
+    Seeded generator of a synthetic catalog year
+
+    The same arguments always generate the same documents, and each course can be
+    generated independently of the others, such that documents for any subject are
+    available without generating the whole catalog.
+
+    Args:
+        n_courses (int): Number of distinct courses (excluding cross-listings). A
+            real catalog year has about 13,000 courses.
+        seed (int): Seed of the generator
+        year (str): Academic year, e.g., "2017-2018"
+        n_subjects (Optional[int]): Number of subjects. Defaults to one subject per
+            65 courses, as in a real catalog. Each subject holds at most 2,997
+            listings.
+        crosslist_rate (float): Fraction of courses that are cross-listed under
+            other subjects
+        mean_sections (float): Mean number of sections per course
+        mean_instructors (float): Mean number of instructors per schedule
+        mean_description_words (float): Mean number of words in a description
+
+    Raises:
+        ValueError: If the subjects cannot hold the listings of all courses
+
+    """
+
+    def __init__(
+        self,
+        n_courses: int,
+        seed: int = 0,
+        year: str = "2017-2018",
+        n_subjects: Optional[int] = None,
+        crosslist_rate: float = 0.15,
+        mean_sections: float = 2.5,
+        mean_instructors: float = 1.8,
+        mean_description_words: float = 60.0,
+    ):
+        self.n_courses = n_courses
+        self.seed = seed
+        self.year = year
+        self.crosslist_rate = crosslist_rate
+        self.mean_sections = mean_sections
+        self.mean_instructors = mean_instructors
+        self.mean_description_words = mean_description_words
+        rng = random.Random(seed)
+        if n_subjects is None:
+            n_subjects = max(1, n_courses // 65)
+        if n_courses > n_subjects * _CODES_PER_SUBJECT:
+            raise ValueError(
+                f"{n_subjects} subjects cannot hold {n_courses} courses; "
+                f"at most {_CODES_PER_SUBJECT} courses fit in each subject"
+            )
+        subjects = set()
+        while len(subjects) < n_subjects:
+            length = rng.choice((2, 3, 4, 4, 5, 6))
+            subjects.add("".join(rng.choices(string.ascii_uppercase, k=length)))
+        self.subjects: List[str] = sorted(subjects)
+        self._n_instructors = max(10, n_courses // 3)
+
+        # Plan of listings: (subject, code) of each listing of each course
+        self._listings: List[List[Tuple[str, str]]] = []
+        self._by_subject: Dict[str, List[Tuple[int, int]]] = {s: [] for s in subjects}
+        used = set()
+        # Subjects whose codes are all used; cross-listings may fill them up
+        full: Set[str] = set()
+        for i in range(n_courses):
+            subjects = self.subjects
+            if full:
+                subjects = [s for s in self.subjects if s not in full]
+                if not subjects:
+                    raise ValueError(
+                        f"{n_subjects} subjects cannot hold the listings of "
+                        f"{n_courses} courses; use more subjects or fewer crosslists"
+                    )
+            n_listings = 1
+            if rng.random() < crosslist_rate:
+                n_listings += min(len(subjects) - 1, rng.choice((1, 1, 1, 2, 3)))
+            listings = []
+            for subject in rng.sample(subjects, n_listings):
+                code = str(rng.randrange(1, 400))
+                while (subject, code) in used:
+                    code = str(rng.randrange(1, 1000)) + rng.choice(_SUFFIXES)
+                used.add((subject, code))
+                if len(self._by_subject[subject]) + 1 == _CODES_PER_SUBJECT:
+                    full.add(subject)
+                self._by_subject[subject].append((i, len(listings)))
+                listings.append((subject, code))
+            self._listings.append(listings)
+        self._cache: Dict[Optional[str], bytes] = {}
+
+    def __len__(self):
+        return self.n_courses
+
+    @property
+    def term_ids(self) -> Dict[str, int]:
+        """Term id of each term of the year"""
+        yy = int(self.year[-2:])
+        return {f"{self.year} {name}": 1000 + 10 * yy + k for name, k, _, _ in _TERMS}
+
+    def _term_dates(self, term: str) -> Tuple[str, str]:
+        years = self.year.split("-")
+        for name, _, start, end in _TERMS:
+            if term.endswith(name):
+                return start.format(*years), end.format(*years)
+        raise ValueError(f"no term named '{term}'")
+
+    def course_id(self, i: int) -> int:
+        """Course id of the i:th course"""
+        return 100000 + i
+
+    def _instructor(self, rng: random.Random, role: str) -> str:
+        # Skewed towards a core of instructors who teach many sections
+        k = int(self._n_instructors * rng.random() ** 2)
+        first = string.ascii_uppercase[k % 26] + "".join(
+            string.ascii_lowercase[(k // 26 + j) % 26] for j in range(4)
+        )
+        last = "".join(string.ascii_lowercase[(k * 7 + j) % 26] for j in range(6))
+        last = last.capitalize()
+        return (
+            "<instructor>"
+            f"<name>{last}, {first[0]}.</name>"
+            f"<firstName>{first}</firstName>"
+            "<middleName/>"
+            f"<lastName>{last}</lastName>"
+            f"<sunet>{first.lower()[:3]}{k}</sunet>"
+            f"<role>{role}</role>"
+            "</instructor>"
+        )
+
+    def _schedule(self, rng: random.Random, term: str) -> str:
+        start = rng.randrange(16, 38) * 30
+        duration = rng.choice((50, 50, 80, 80, 110, 170))
+        n_instructors = max(1, round(rng.expovariate(1 / self.mean_instructors)))
+        instructors = "".join(
+            self._instructor(rng, "PI" if k == 0 else rng.choice(_ROLES))
+            for k in range(n_instructors)
+        )
+        building = rng.randrange(1, 600)
+        room = str(rng.randrange(1, 400))
+        if rng.random() < 0.2:
+            room = f"{building}{rng.choice(string.ascii_uppercase[:4])}"
+        start_date, end_date = self._term_dates(term)
+        return (
+            "<schedule>"
+            f"<startDate>{start_date}</startDate>"
+            f"<endDate>{end_date}</endDate>"
+            f"<startTime>{_clock(start)}</startTime>"
+            f"<endTime>{_clock(start + duration)}</endTime>"
+            f"<location>{building}-{room}</location>"
+            f"<days>{rng.choices(_DAYS, _DAY_WEIGHTS)[0]}</days>"
+            f"<instructors>{instructors}</instructors>"
+            "</schedule>"
+        )
+
+    def _section(
+        self,
+        rng: random.Random,
+        class_id: int,
+        course_id: int,
+        term: str,
+        component: str,
+        number: int,
+    ) -> Tuple[str, str]:
+        """Section XML split around the subject and code, which vary per listing"""
+        max_enrolled = rng.choice((10, 15, 20, 30, 50, 100, 200, 400))
+        num_enrolled = rng.randrange(0, max_enrolled + max_enrolled // 10 + 1)
+        max_waitlist = rng.choice((0, 0, 5, 10, 20))
+        num_waitlist = rng.randrange(0, max_waitlist + 1)
+        status = "Open" if num_enrolled < max_enrolled else "Closed"
+        n_schedules = rng.choices((0, 1, 2, 3), (5, 75, 15, 5))[0]
+        schedules = "".join(self._schedule(rng, term) for _ in range(n_schedules))
+        head = (
+            "<section>"
+            f"<classId>{class_id}</classId>"
+            f"<term>{term}</term>"
+            f"<termId>{self.term_ids[term]}</termId>"
+        )
+        tail = (
+            f"<units>{rng.choice((1, 2, 3, 3, 4, 4, 5))}</units>"
+            f"<sectionNumber>{number:02d}</sectionNumber>"
+            f"<component>{component}</component>"
+            f"<numEnrolled>{num_enrolled}</numEnrolled>"
+            f"<maxEnrolled>{max_enrolled}</maxEnrolled>"
+            f"<numWaitlist>{num_waitlist}</numWaitlist>"
+            f"<maxWaitlist>{max_waitlist}</maxWaitlist>"
+            f"<enrollStatus>{status}</enrollStatus>"
+            "<addConsent>N</addConsent>"
+            "<dropConsent>N</dropConsent>"
+            "<instructionMode>In Person</instructionMode>"
+            f"<courseId>{course_id}</courseId>"
+            f"<schedules>{schedules}</schedules>"
+            "<notes/>"
+            "<attributes/>"
+            "</section>"
+        )
+        return head, tail
+
+    def _description(self, rng: random.Random) -> str:
+        n_words = max(5, int(rng.lognormvariate(0, 0.6) * self.mean_description_words))
+        words = rng.choices(_WORDS, k=n_words)
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words)), "R&D")
+        text = " ".join(words).capitalize() + "."
+        # Descriptions are escaped twice by the real site
+        return escape(escape(text))
+
+    def course_elements(self, i: int) -> List[str]:
+        """
+        Generate the listings of the i:th course
+
+        Args:
+            i (int): Index of the course
+
+        Returns:
+            List[str]: XML of each <course> element listing the course
+
+        """
+        rng = random.Random(self.seed * 1_000_003 + i)
+        course_id = self.course_id(i)
+        title = " ".join(rng.choices(_WORDS, k=rng.randrange(2, 7))).title()
+        description = self._description(rng)
+        n_gers = rng.choice((0, 0, 0, 1, 2))
+        gers = ", ".join(sorted(set(rng.choices(_GERS, k=n_gers))))
+        objectives = "".join(
+            "<learningObjective>"
+            f"<requirementCode>{ger}</requirementCode>"
+            f"<description>{' '.join(rng.choices(_WORDS, k=8))}</description>"
+            "</learningObjective>"
+            for ger in gers.split(", ")
+            if ger
+        )
+        units_min = rng.choice((1, 2, 3, 3, 4, 4, 5))
+        units_max = units_min + rng.choice((0, 0, 0, 1, 2))
+        sections = []
+        n_sections = max(1, round(rng.expovariate(1 / self.mean_sections)))
+        terms = list(self.term_ids)
+        for number in range(1, n_sections + 1):
+            term = rng.choices(terms, _TERM_WEIGHTS)[0]
+            component = rng.choices(_COMPONENTS, _COMPONENT_WEIGHTS)[0]
+            class_id = 10 * course_id + number
+            sections.append(
+                self._section(rng, class_id, course_id, term, component, number)
+            )
+        grading = rng.choice(_GRADING)
+        career = rng.choice(("UG", "UG", "GR"))
+        tags = "".join(
+            f"<tag><organization>ORG{rng.randrange(20)}</organization>"
+            f"<name>tag{rng.randrange(50)}</name></tag>"
+            for _ in range(rng.choice((0, 0, 1, 2, 3)))
+        )
+        listings = self._listings[i]
+        codes = " (" + ", ".join(f"{s} {c}" for s, c in listings) + ")"
+        if len(listings) == 1:
+            codes = ""
+        elements = []
+        for subject, code in listings:
+            section_xml = "".join(
+                f"{head}<subject>{subject}</subject><code>{code}</code>{tail}"
+                for head, tail in sections
+            )
+            elements.append(
+                "<course>"
+                f"<year>{self.year}</year>"
+                f"<subject>{subject}</subject>"
+                f"<code>{code}</code>"
+                f"<title>{title}{codes}</title>"
+                f"<description>{description}</description>"
+                f"<gers>{gers}</gers>"
+                "<repeatable>false</repeatable>"
+                f"<grading>{grading}</grading>"
+                f"<unitsMin>{units_min}</unitsMin>"
+                f"<unitsMax>{units_max}</unitsMax>"
+                "<remote>false</remote>"
+                f"<learningObjectives>{objectives}</learningObjectives>"
+                f"<sections>{section_xml}</sections>"
+                "<administrativeInformation>"
+                f"<courseId>{course_id}</courseId>"
+                "<effectiveStatus>A</effectiveStatus>"
+                "<offerNumber>1</offerNumber>"
+                "<academicGroup>GRP</academicGroup>"
+                f"<academicOrganization>{listings[0][0]}</academicOrganization>"
+                f"<academicCareer>{career}</academicCareer>"
+                "<finalExamFlag>Y</finalExamFlag>"
+                "<catalogPrint>Y</catalogPrint>"
+                "<schedulePrint>Y</schedulePrint>"
+                f"<maxUnitsRepeat>{units_max}</maxUnitsRepeat>"
+                "<maxTimesRepeat>1</maxTimesRepeat>"
+                "</administrativeInformation>"
+                "<attributes/>"
+                f"<tags>{tags}</tags>"
+                "</course>"
+            )
+        return elements
+
+    def iter_document(self, subject: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Generate a search response in chunks, one course at a time
+
+        Args:
+            subject (Optional[str]): Subject to generate the courses of. Defaults to
+                None, which generates all listings of all courses.
+
+        Yields:
+            bytes: Consecutive chunks of the document
+
+        """
+        yield (
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            b"<xml><deprecated>false</deprecated>"
+            b"<latestVersion>20200810</latestVersion>"
+            b"<resultsTitle>search results</resultsTitle><courses>"
+        )
+        if subject is None:
+            for i in range(self.n_courses):
+                for element in self.course_elements(i):
+                    yield element.encode()
+        else:
+            for i, listing in self._by_subject.get(subject, ()):
+                yield self.course_elements(i)[listing].encode()
+        yield b"</courses></xml>"
+
+    def document(self, subject: Optional[str] = None) -> bytes:
+        """Generate a complete search response, see iter_document()"""
+        if subject not in self._cache:
+            self._cache[subject] = b"".join(self.iter_document(subject))
+        return self._cache[subject]
+
+    def schools_document(self, schools: Sequence[str] = _SCHOOLS) -> bytes:
+        """Generate the list of schools, with the subjects spread over the schools"""
+        elements = []
+        for k, school in enumerate(schools):
+            departments = "".join(
+                f'<department longname="{subject.title()}" name="{subject}"/>'
+                for subject in self.subjects[k :: len(schools)]
+            )
+            elements.append(f'<school name="{escape(school)}">{departments}</school>')
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f"<xml><schools>{''.join(elements)}</schools></xml>"
+        ).encode()
+
+    def documents(self, name: str, params: Dict[str, str]) -> Optional[bytes]:
+        """Serve the catalog from a FixtureServer, e.g., FixtureServer(cat.documents)"""
+        if name == "schools":
+            return self.schools_document()
+        if name in self._by_subject:
+            return self.document(name)
+        return None
@@ -0,0 +1,81 @@
+"""
+Implements the transport layer through which a CourseConnection sends requests
+
+"""
+
+from abc import ABC, abstractmethod
+from typing import Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import default_headers
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Accept-Encoding of a session that was not told otherwise
+_DEFAULT_ACCEPT_ENCODING = default_headers()["Accept-Encoding"]
+
+
+class Transport(ABC):
+    """
+    Sends HTTP GET requests on behalf of a CourseConnection
+
+    Subclasses implement get() and return a requests.Response, or an object with the
+    same status_code, ok, headers, iter_content(), close() and raise_for_status()
+    interface. The body may be streamed, i.e., only downloaded as iter_content() is
+    consumed, such that the time to first byte and the download can be told apart and
+    the body is parsed as it arrives.
+
+    """
+
+    @abstractmethod
+    def get(
+        self,
+        url: str,
+        params: Mapping[str, str],
+        headers: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> requests.Response:
+        """Send a GET request"""
+
+    def close(self):
+        """Release any resources held by the transport"""
+
+
+class RequestsTransport(Transport):
+    """
+    Transport backed by a requests.Session
+
+    Args:
+        session (Optional[requests.Session]): Session to send requests through.
+            Defaults to a new session. The session is not modified, and encodings
+            that it accepts other than the default ones are left as they are.
+        pool_maxsize (int): Maximum number of connections kept alive per host, which
+            should be at least the number of concurrent requests
+
+    """
+
+    def __init__(
+        self, session: Optional[requests.Session] = None, pool_maxsize: int = 16
+    ):
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        self._headers = {}
+        if session.headers.get("Accept-Encoding") in (None, _DEFAULT_ACCEPT_ENCODING):
+            # Includes brotli when urllib3 is able to decode it
+            self._headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+    def get(self, url, params, headers, timeout):
+        return self.session.get(
+            url,
+            params=params,
+            headers={**self._headers, **headers},
+            timeout=timeout,
+            stream=True,
+        )
+
+    def close(self):
+        self.session.close()
@@ -13,12 +13,20 @@ setuptools.setup(
     install_requires=[
         'requests>=2'
     ],
+    entry_points={
+        'console_scripts': ['explorecourses=explorecourses.cli:main'],
+    },
+    extras_require={
+        'prometheus': ['prometheus_client'],
+        'parquet': ['pyarrow'],
+    },
+    python_requires=">=3.8",
     setup_requires=["pytest-runner"],
     tests_require=["pytest"],
     classifiers=(
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ),
@@ -0,0 +1,55 @@
+"""Offline transports for CourseConnection"""
+
+import requests
+
+from explorecourses import CourseConnection
+from explorecourses.transport import Transport
+
+
+def make_response(status, content=b"", headers=None):
+    res = requests.Response()
+    res.status_code = status
+    res._content = content
+    res._content_consumed = True
+    res.url = CourseConnection._URL
+    res.headers.update(headers or {})
+    return res
+
+
+class FakeTransport(Transport):
+    """Replays a list of responses (or exceptions) and records the requests"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, params, headers, timeout):
+        self.requests.append((params, headers))
+        res = self.responses.pop(0)
+        if isinstance(res, Exception):
+            raise res
+        return res
+
+
+class RoundTransport(Transport):
+    """Serves successive documents for each query, repeating the last one"""
+
+    def __init__(self, documents):
+        self.documents = {query: list(docs) for query, docs in documents.items()}
+
+    def get(self, url, params, headers, timeout):
+        docs = self.documents[params["q"]]
+        doc = docs.pop(0) if len(docs) > 1 else docs[0]
+        return make_response(200, doc)
+
+
+class CatalogTransport(Transport):
+    """Serves a fixed document for each (academic year, query) pair"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def get(self, url, params, headers, timeout):
+        return make_response(
+            200, self.documents[(params.get("academicYear"), params["q"])]
+        )
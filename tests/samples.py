@@ -0,0 +1,173 @@
+"""Small builders for ExploreCourses XML and courses used across the test suite"""
+
+from xml.etree import ElementTree as ET
+
+from explorecourses import Course
+
+
+def instructor_xml(sunet="jchw", name="Wilson, J.", role="PI"):
+    last, _, first = name.partition(", ")
+    return (
+        '<instructor>'
+        f'<name>{name}</name>'
+        f'<firstName>{first}</firstName>'
+        '<middleName/>'
+        f'<lastName>{last}</lastName>'
+        f'<sunet>{sunet}</sunet>'
+        f'<role>{role}</role>'
+        '</instructor>'
+    )
+
+
+def schedule_xml(
+    location="320-105",
+    days="Monday Wednesday Friday",
+    start="11:30:00 AM",
+    end="12:20:00 PM",
+    instructors=None,
+):
+    if instructors is None:
+        instructors = [instructor_xml()]
+    return (
+        '<schedule>'
+        '<startDate>Sep 25, 2017</startDate>'
+        '<endDate>Dec 8, 2017</endDate>'
+        f'<startTime>{start}</startTime>'
+        f'<endTime>{end}</endTime>'
+        f'<location>{location}</location>'
+        f'<days>{days}</days>'
+        f'<instructors>{"".join(instructors)}</instructors>'
+        '</schedule>'
+    )
+
+
+def section_xml(
+    class_id=16518,
+    course_id=117229,
+    subject="MATH",
+    code="20",
+    term="2017-2018 Autumn",
+    term_id=1182,
+    component="LEC",
+    num_enrolled=51,
+    num_waitlist=0,
+    enroll_status="Open",
+    schedules=None,
+):
+    if schedules is None:
+        schedules = [schedule_xml()]
+    return (
+        '<section>'
+        f'<classId>{class_id}</classId>'
+        f'<term>{term}</term>'
+        f'<termId>{term_id}</termId>'
+        f'<subject>{subject}</subject>'
+        f'<code>{code}</code>'
+        '<units>3</units>'
+        '<sectionNumber>01</sectionNumber>'
+        f'<component>{component}</component>'
+        f'<numEnrolled>{num_enrolled}</numEnrolled>'
+        '<maxEnrolled>60</maxEnrolled>'
+        f'<numWaitlist>{num_waitlist}</numWaitlist>'
+        '<maxWaitlist>10</maxWaitlist>'
+        f'<enrollStatus>{enroll_status}</enrollStatus>'
+        '<addConsent>N</addConsent>'
+        '<dropConsent>N</dropConsent>'
+        '<instructionMode>In Person</instructionMode>'
+        f'<courseId>{course_id}</courseId>'
+        f'<schedules>{"".join(schedules)}</schedules>'
+        '<notes/>'
+        '<attributes/>'
+        '</section>'
+    )
+
+
+def course_xml(
+    subject="MATH",
+    code="20",
+    course_id=117229,
+    year="2017-2018",
+    title="Calculus",
+    description="The definite integral.",
+    gers="GER:DB-Math, WAY-FR",
+    objectives=("WAY-FR",),
+    sections=None,
+    class_id=16518,
+):
+    if sections is None:
+        sections = [section_xml(
+            class_id=class_id, course_id=course_id, subject=subject, code=code
+        )]
+    objectives = "".join(
+        '<learningObjective>'
+        f'<requirementCode>{req}</requirementCode>'
+        '<description>solve problems</description>'
+        '</learningObjective>'
+        for req in objectives
+    )
+    return (
+        '<course>'
+        f'<year>{year}</year>'
+        f'<subject>{subject}</subject>'
+        f'<code>{code}</code>'
+        f'<title>{title}</title>'
+        f'<description>{description}</description>'
+        f'<gers>{gers}</gers>'
+        '<repeatable>false</repeatable>'
+        '<grading>Letter or Credit/No Credit</grading>'
+        '<unitsMin>3</unitsMin>'
+        '<unitsMax>3</unitsMax>'
+        '<remote>false</remote>'
+        f'<learningObjectives>{objectives}</learningObjectives>'
+        f'<sections>{"".join(sections)}</sections>'
+        '<administrativeInformation>'
+        f'<courseId>{course_id}</courseId>'
+        '<effectiveStatus>A</effectiveStatus>'
+        '<offerNumber>1</offerNumber>'
+        '<academicGroup>HS</academicGroup>'
+        '<academicOrganization>MATH</academicOrganization>'
+        '<academicCareer>UG</academicCareer>'
+        '<finalExamFlag>Y</finalExamFlag>'
+        '<catalogPrint>Y</catalogPrint>'
+        '<schedulePrint>Y</schedulePrint>'
+        '<maxUnitsRepeat>3</maxUnitsRepeat>'
+        '<maxTimesRepeat>1</maxTimesRepeat>'
+        '</administrativeInformation>'
+        '<attributes/>'
+        '<tags/>'
+        '</course>'
+    )
+
+
+def course(**kwargs):
+    return Course.from_xml(ET.fromstring(course_xml(**kwargs)))
+
+
+def search_xml(*courses):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<xml>'
+        '<deprecated>false</deprecated>'
+        '<latestVersion>20200810</latestVersion>'
+        '<resultsTitle>results</resultsTitle>'
+        f'<courses>{"".join(courses)}</courses>'
+        '</xml>'
+    ).encode()
+
+
+def schools_xml(schools):
+    """Document listing schools, given as a mapping from name to subject codes"""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<xml><schools>'
+        + "".join(
+            f'<school name="{name}">'
+            + "".join(
+                f'<department longname="{subject.title()}" name="{subject}"/>'
+                for subject in subjects
+            )
+            + '</school>'
+            for name, subjects in schools.items()
+        )
+        + '</schools></xml>'
+    ).encode()
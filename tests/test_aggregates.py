@@ -0,0 +1,73 @@
+from explorecourses import *
+
+from tests.samples import course, instructor_xml, schedule_xml, section_xml
+
+
+class TestSectionAggregates(object):
+
+    @classmethod
+    def setup_class(cls):
+        sections = [
+            section_xml(class_id=1, num_enrolled=40, schedules=[
+                schedule_xml(days="Monday Wednesday", start="1:30:00 PM"),
+            ]),
+            section_xml(
+                class_id=2,
+                term="2017-2018 Winter",
+                term_id=1184,
+                component="DIS",
+                num_enrolled=12,
+                schedules=[
+                    schedule_xml(
+                        days="Friday",
+                        start="9:00:00 AM",
+                        instructors=[instructor_xml("ada", "Lovelace, Ada")],
+                    ),
+                    schedule_xml(days="", start="", instructors=[]),
+                ],
+            ),
+        ]
+        cls.math20 = course(subject="MATH", code="20", sections=sections)
+        cls.cme20 = course(subject="CME", code="20", sections=sections[:1])
+
+    def test_course(self):
+        math20 = self.math20
+
+        assert math20.terms == {"2017-2018 Autumn", "2017-2018 Winter"}
+        assert math20.term_ids == {1182, 1184}
+        assert math20.num_enrolled == 52
+        assert math20.max_enrolled == 120
+        assert math20.components == {"LEC", "DIS"}
+        assert math20.days_mask == days_to_mask(["Monday", "Wednesday", "Friday"])
+        assert math20.days_mask & days_to_mask(["Tuesday"]) == 0
+        assert {i.sunet for i in math20.instructors} == {"ada", "jchw"}
+        assert math20.earliest_start == 9 * 60
+        assert "num_enrolled" in vars(math20)
+
+
+    def test_no_sections(self):
+        empty = course(sections=[])
+
+        assert empty.terms == frozenset()
+        assert empty.num_enrolled == 0
+        assert empty.days_mask == 0
+        assert empty.earliest_start is None
+
+
+    def test_merged_course(self):
+        (merged,) = merge_crosslistings([self.math20, self.cme20])
+
+        # The section shared by both listings counts once
+        assert len(merged.sections) == 2
+        assert merged.num_enrolled == 52
+        assert merged.components == {"LEC", "DIS"}
+        assert merged.instructors == self.math20.instructors
+
+
+    def test_sort(self):
+        courses = [self.math20, self.cme20]
+
+        assert sorted(courses, key=lambda c: c.num_enrolled) == [
+            self.cme20, self.math20
+        ]
+
@@ -0,0 +1,62 @@
+from explorecourses import *
+
+from tests.fakes import FakeTransport, make_response
+from tests.samples import course_xml, search_xml
+
+
+class TestConditionalRequests(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.doc = search_xml(course_xml())
+        cls.headers = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2018 00:00:00 GMT"}
+
+    def connection(self, responses, **kwargs):
+        return CourseConnection(
+            transport=FakeTransport(responses), retries=0, **kwargs
+        )
+
+    def test_not_modified(self):
+        connection = self.connection([
+            make_response(200, self.doc, self.headers),
+            make_response(304),
+        ])
+        first = connection.courses_by_subject("MATH")
+        second = connection.courses_by_subject("MATH")
+
+        _, headers = connection.transport.requests[1]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == self.headers["Last-Modified"]
+        assert first[0] is second[0]
+
+
+    def test_unchanged_content(self):
+        connection = self.connection([make_response(200, self.doc)] * 2)
+        first = connection.courses_by_subject("MATH")
+        second = connection.courses_by_subject("MATH")
+
+        assert connection.transport.requests[1][1] == {}
+        assert first[0] is second[0]
+
+
+    def test_changed_content(self):
+        changed = search_xml(course_xml(title="Integral Calculus"))
+        connection = self.connection([
+            make_response(200, self.doc, self.headers),
+            make_response(200, changed),
+        ])
+        connection.courses_by_subject("MATH")
+        courses = connection.courses_by_subject("MATH")
+
+        assert courses[0].title == "Integral Calculus"
+
+
+    def test_cache_disabled(self):
+        connection = self.connection(
+            [make_response(200, self.doc, self.headers)] * 2, cache=False, memo_size=0
+        )
+        first = connection.courses_by_subject("MATH")
+        second = connection.courses_by_subject("MATH")
+
+        assert connection.transport.requests[1][1] == {}
+        assert first[0] is not second[0]
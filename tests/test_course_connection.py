@@ -1,44 +1,171 @@
+import pytest
+import requests
+
 from explorecourses import *
 from explorecourses import filters
+from explorecourses.fixture_server import FixtureServer
+
+from tests.samples import course_xml, schools_xml, search_xml, section_xml
+
+
+def search(params):
+    # Courses only have sections in the terms filtered for, like the real site
+    subject = next(
+        key.rsplit("-", 1)[1] for key in params if "departmentcode" in key
+    )
+    term = "Autumn" if filters.AUTUMN in params else "Winter"
+    return search_xml(course_xml(
+        subject=subject,
+        code="1",
+        sections=[section_xml(subject=subject, code="1", term=f"2017-2018 {term}")],
+    ))
+
 
 class TestCourseConnection(object):
 
     @classmethod
     def setup_class(cls):
-        cls.connection = CourseConnection()
+        schools = schools_xml({
+            "Graduate School of Business": ["POLECON", "FINANCE"],
+            "School of Engineering": ["CS"],
+        })
+        cls.server = FixtureServer(
+            lambda name, params: schools if name == "schools" else search(params)
+        ).start()
+        cls.connection = CourseConnection(cls.server.url, backoff=0)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.connection.close()
+        cls.server.stop()
 
 
-    def test_get_schools(self):
-        schools = self.connection.get_schools()
+    def test_schools(self):
+        schools = self.connection.schools()
 
-        assert schools != None
-        assert all([isinstance(sch, School) for sch in schools]) == True
+        assert len(schools) == 2
+        assert all(isinstance(sch, School) for sch in schools)
 
 
-    def test_get_school(self):
-        school = self.connection.get_school("School of Engineering")
+    def test_school(self):
+        school = self.connection.school("School of Engineering")
 
-        assert school != None
         assert type(school) == School
+        assert school.department("cs").name == "CS"
+
+        with pytest.raises(ValueError):
+            self.connection.school("School of Magic")
 
 
-    def test_get_courses_by_department(self):
-        courses = self.connection.get_courses_by_department("POLECON")
+    def test_courses_by_subject(self):
+        courses = self.connection.courses_by_subject("POLECON")
 
         assert len(courses) > 0
         assert courses[0].subject == "POLECON"
 
 
-    def test_get_courses_by_department_with_filters(self):
-        courses = self.connection.get_courses_by_department("POLECON", 
-                                                            filters.AUTUMN)
+    def test_courses_by_subject_with_filters(self):
+        courses = self.connection.courses_by_subject("POLECON", filters.AUTUMN)
 
         assert len(courses) > 0
-        assert (any("Autumn" in sect.term for sect in courses[0].sections) 
-                == True)
+        assert any("Autumn" in sect.term for sect in courses[0].sections)
 
-        courses = self.connection.get_courses_by_department("MATH", 
-                                                            filters.WAY_FR)
 
-        assert len(courses) > 0
-        assert ("WAY-FR" in courses[0].gers) == True
+    def test_crawl(self):
+        units = [unit.subject for unit, _ in self.connection.crawl()]
+
+        assert units == ["CS", "FINANCE", "POLECON"]
+
+
+class TestFaultInjection(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.documents = {"MATH": search_xml(course_xml())}
+
+    def test_retry_errors(self):
+        with FixtureServer(self.documents, error_rate=0.5, seed=0) as server:
+            connection = CourseConnection(server.url, retries=20, backoff=0)
+            for _ in range(5):
+                assert len(connection.courses_by_subject("MATH")) == 1
+
+        assert server.requests > 5
+
+
+    def test_retry_truncated(self):
+        with FixtureServer(self.documents, truncate_rate=0.5, seed=0) as server:
+            connection = CourseConnection(server.url, retries=20, backoff=0, cache=False)
+            for _ in range(5):
+                assert len(connection.courses_by_subject("MATH")) == 1
+
+        assert server.requests > 5
+
+
+    def test_retries_exhausted(self):
+        with FixtureServer(self.documents, error_rate=1) as server:
+            connection = CourseConnection(server.url, retries=1, backoff=0)
+
+            with pytest.raises(requests.HTTPError):
+                connection.courses_by_subject("MATH")
+
+
+    def test_not_modified(self):
+        with FixtureServer(self.documents) as server:
+            connection = CourseConnection(server.url)
+            first = connection.courses_by_subject("MATH")
+            sent = server.bytes_sent
+            second = connection.courses_by_subject("MATH")
+
+            assert server.bytes_sent == sent
+            assert first[0] is second[0]
+
+
+    def test_not_modified_pipeline(self):
+        with FixtureServer(self.documents) as server:
+            connection = CourseConnection(server.url)
+            ((_, first),) = connection.crawl(["MATH"], pipeline=True)
+            sent = server.bytes_sent
+            ((_, second),) = connection.crawl(["MATH"], pipeline=True)
+            third = connection.courses_by_subject("MATH")
+
+            assert server.bytes_sent == sent
+            assert first[0] is second[0] is third[0]
+            # Only parsed results are cached, not raw bodies
+            assert all(
+                not isinstance(course, bytes)
+                for entry in connection._cache.values()
+                for course in entry.result
+            )
+
+
+    def test_request_body(self):
+        with FixtureServer(self.documents) as server, requests.Session() as session:
+            responses = [
+                session.get(server.url + "search", params={"q": "MATH"}, data=b"x" * 10)
+                for _ in range(2)
+            ]
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert all(b"<course>" in r.content for r in responses)
+
+
+class TestRequestsTransport(object):
+
+    def test_session_untouched(self):
+        documents = {"MATH": search_xml(course_xml())}
+        session = requests.Session()
+        default = dict(session.headers)
+        custom = requests.Session()
+        custom.headers["Accept-Encoding"] = "identity"
+
+        with FixtureServer(documents) as server:
+            for s in (session, custom):
+                connection = CourseConnection(
+                    server.url, transport=RequestsTransport(s)
+                )
+                assert len(connection.courses_by_subject("MATH")) == 1
+
+        assert dict(session.headers) == default
+        assert custom.headers["Accept-Encoding"] == "identity"
+        assert "Accept-Encoding" in RequestsTransport(session)._headers
+        assert RequestsTransport(custom)._headers == {}
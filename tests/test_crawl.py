@@ -0,0 +1,127 @@
+import pytest
+import requests
+
+from explorecourses import *
+from explorecourses.crawl import Checkpoint, CrawlUnit
+
+from tests.fakes import FakeTransport, make_response
+from tests.samples import course_xml, search_xml
+
+
+class TestCrawl(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.doc = search_xml(course_xml())
+
+    def connection(self, responses):
+        return CourseConnection(
+            transport=FakeTransport(responses), retries=2, backoff=0
+        )
+
+    def test_retry_transient(self):
+        connection = self.connection([
+            make_response(503, b""),
+            requests.ConnectionError(),
+            make_response(200, self.doc),
+        ])
+        courses = connection.courses_by_subject("MATH")
+
+        assert len(courses) == 1
+        assert len(connection.transport.requests) == 3
+
+
+    def test_retry_truncated(self):
+        connection = self.connection([
+            make_response(200, self.doc[:-40]),
+            make_response(200, self.doc),
+        ])
+
+        assert len(connection.courses_by_subject("MATH")) == 1
+
+
+    def test_retries_exhausted(self):
+        connection = self.connection([make_response(502, b"")] * 3)
+
+        with pytest.raises(requests.HTTPError):
+            connection.courses_by_subject("MATH")
+
+
+    def test_no_retry_client_error(self):
+        connection = self.connection([make_response(404, b"")])
+
+        with pytest.raises(requests.HTTPError):
+            connection.courses_by_subject("MATH")
+        assert len(connection.transport.requests) == 1
+
+
+    def test_refresh_streams(self, monkeypatch):
+        received = []
+        parse_chunks = CourseParser.parse_chunks
+
+        def spy(parser, chunks):
+            received.append(type(chunks))
+            return parse_chunks(parser, chunks)
+
+        monkeypatch.setattr(CourseParser, "parse_chunks", spy)
+        connection = self.connection([
+            make_response(200, self.doc, {"ETag": '"1"'}),
+            make_response(200, self.doc, {"ETag": '"2"'}),
+        ])
+        first = connection.courses_by_subject("MATH")
+        second = connection.courses_by_subject("MATH")
+
+        # The refresh is parsed as it streams in, not from a buffered body
+        assert tuple not in received
+        assert len(received) == 2
+        assert second[0] is first[0]
+
+
+    def test_checkpoint_resume(self, tmp_path):
+        path = str(tmp_path / "crawl.json")
+        connection = self.connection([make_response(200, self.doc)] * 4)
+
+        crawl = connection.crawl(["MATH", "CS", "PHYSICS"], checkpoint=path)
+        unit, courses = next(crawl)
+        unit, courses = next(crawl)
+        crawl.close()
+
+        assert CrawlUnit(None, "MATH", ()) in Checkpoint(path)
+        assert CrawlUnit(None, "CS", ()) not in Checkpoint(path)
+
+        units = [unit for unit, _ in connection.crawl(
+            ["MATH", "CS", "PHYSICS"], checkpoint=path
+        )]
+
+        assert [unit.subject for unit in units] == ["CS", "PHYSICS"]
+        assert len(Checkpoint(path)) == 3
+
+
+    def test_concurrent(self, tmp_path):
+        path = str(tmp_path / "crawl.json")
+        subjects = [f"SUBJ{i}" for i in range(20)]
+        connection = self.connection([make_response(200, self.doc)] * 20)
+
+        units = [unit for unit, _ in connection.crawl(
+            subjects, checkpoint=path, max_workers=4
+        )]
+
+        assert sorted(unit.subject for unit in units) == sorted(subjects)
+        assert len(Checkpoint(path)) == 20
+
+
+    def test_pipeline(self, tmp_path):
+        path = str(tmp_path / "crawl.json")
+        subjects = [f"SUBJ{i}" for i in range(10)]
+        responses = [make_response(200, self.doc)] * 10
+        # A truncated response is fetched again once it fails to parse
+        responses[3] = make_response(200, self.doc[:-40])
+        connection = self.connection(responses + [make_response(200, self.doc)])
+
+        crawl = connection.crawl(subjects, checkpoint=path, pipeline=True)
+        results = dict(crawl)
+
+        assert sorted(unit.subject for unit in results) == sorted(subjects)
+        assert all(len(courses) == 1 for courses in results.values())
+        assert len(connection.transport.requests) == 11
+        assert len(Checkpoint(path)) == 10
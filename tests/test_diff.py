@@ -0,0 +1,85 @@
+from explorecourses import *
+
+from tests.samples import course, instructor_xml, schedule_xml, section_xml
+
+
+class TestDiff(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.math19 = course(code="19", course_id=117227)
+        cls.math20 = course(
+            code="20",
+            course_id=117229,
+            sections=[section_xml(class_id=1), section_xml(class_id=2)],
+        )
+        cls.math21 = course(code="21", course_id=117230)
+
+    def test_no_changes(self):
+        old = [self.math19, self.math20]
+        new = [course(code="19", course_id=117227), self.math20]
+
+        assert not diff(old, new)
+
+
+    def test_added_removed(self):
+        result = diff([self.math19, self.math20], [self.math20, self.math21])
+
+        assert result.added == (self.math21,)
+        assert result.removed == (self.math19,)
+        assert result.changed == ()
+
+
+    def test_field_changes(self):
+        math20 = course(
+            code="20",
+            course_id=117229,
+            title="Integral Calculus",
+            sections=[
+                section_xml(class_id=2, num_enrolled=60),
+                section_xml(
+                    class_id=3, schedules=[schedule_xml(location="200-203")]
+                ),
+            ],
+        )
+        result = diff([self.math20], [math20])
+
+        assert result.added == result.removed == ()
+        (change,) = result.changed
+        assert change.course_id == 117229
+        assert change.changes == (FieldChange("title", "Calculus", "Integral Calculus"),)
+        assert [s.class_id for s in change.added_sections] == [3]
+        assert [s.class_id for s in change.removed_sections] == [1]
+        (section_change,) = change.changed_sections
+        assert section_change.class_id == 2
+        assert section_change.changes == (FieldChange("num_enrolled", 51, 60),)
+
+
+    def test_schedule_changes(self):
+        ada = instructor_xml("ada", "Lovelace, Ada")
+        old = course(sections=[section_xml(class_id=1, schedules=[
+            schedule_xml(),
+            schedule_xml(days="Tuesday Thursday", start="1:30:00 PM", end="2:50:00 PM"),
+        ])])
+        new = course(sections=[section_xml(class_id=1, schedules=[
+            schedule_xml(location="200-203", instructors=[ada]),
+            schedule_xml(days="Tuesday", start="1:30:00 PM", end="2:50:00 PM"),
+        ])])
+
+        (change,) = diff([old], [new]).changed
+        (section_change,) = change.changed_sections
+        location, instructors, schedules = section_change.changes
+        assert location == FieldChange("location", "320-105", "200-203")
+        assert instructors.field == "instructors"
+        assert {i.sunet for i in instructors.old} == {"jchw"}
+        assert {i.sunet for i in instructors.new} == {"ada"}
+        assert schedules.field == "schedules"
+        assert [s.days for s in schedules.old] == [("Tuesday", "Thursday")]
+        assert [s.days for s in schedules.new] == [("Tuesday",)]
+
+
+    def test_crosslistings(self):
+        stats = course(subject="STATS", code="116", course_id=117229)
+        result = diff([self.math20], [self.math20, stats])
+
+        assert result.added == (stats,)
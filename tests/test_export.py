@@ -0,0 +1,207 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from explorecourses import *
+from explorecourses.cli import main
+from explorecourses.export import (
+    TABLES,
+    CsvWriter,
+    JsonlWriter,
+    ParquetWriter,
+    SqliteWriter,
+    TableWriter,
+    Writer,
+    guess_format,
+    table_rows,
+)
+from explorecourses.fixture_server import FixtureServer
+
+from tests.samples import (
+    course_xml,
+    schedule_xml,
+    schools_xml,
+    search_xml,
+    section_xml,
+)
+
+
+class TestWriters(object):
+
+    @classmethod
+    def setup_class(cls):
+        sections = [
+            section_xml(class_id=1, schedules=[schedule_xml(), schedule_xml("TBA")]),
+            section_xml(class_id=2, term="2017-2018 Winter", term_id=1184),
+        ]
+        cls.courses = CourseParser().parse(search_xml(
+            course_xml(sections=sections),
+            course_xml(code="21", course_id=117230, sections=[]),
+        ))
+
+    def test_table_rows(self):
+        rows = table_rows(self.courses[0])
+
+        assert [len(rows[table]) for table in TABLES] == [1, 2, 3]
+        for table, columns in TABLES.items():
+            assert all(len(row) == len(columns) for row in rows[table])
+        assert rows["courses"][0][6] == "GER:DB-Math; WAY-FR"
+
+
+    def test_jsonl(self, tmp_path):
+        path = str(tmp_path / "courses.jsonl")
+        with JsonlWriter(path) as writer:
+            writer.write(self.courses[:1])
+            writer.write(self.courses[1:])
+
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        assert [record["code"] for record in records] == ["20", "21"]
+        assert records[0]["gers"] == ["GER:DB-Math", "WAY-FR"]
+        assert len(records[0]["sections"]) == 2
+
+
+    def test_csv(self, tmp_path):
+        with CsvWriter(str(tmp_path)) as writer:
+            writer.write(self.courses)
+
+        with open(tmp_path / "sections.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["class_id"] for row in rows] == ["1", "2"]
+        assert rows[1]["term_id"] == "1184"
+
+
+    def test_sqlite(self, tmp_path):
+        path = str(tmp_path / "catalog.db")
+        with SqliteWriter(path) as writer:
+            writer.write(self.courses)
+
+        db = sqlite3.connect(path)
+        assert db.execute("SELECT COUNT(*) FROM courses").fetchone() == (2,)
+        assert db.execute(
+            "SELECT COUNT(*) FROM schedules WHERE location = 'TBA'"
+        ).fetchone() == (1,)
+
+
+    def test_parquet(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        with ParquetWriter(str(tmp_path), row_group_size=2) as writer:
+            writer.write(self.courses[:1])
+            writer.write(self.courses[1:])
+
+        assert pq.read_table(tmp_path / "courses.parquet").num_rows == 2
+        schedules = pq.read_table(tmp_path / "schedules.parquet")
+        assert schedules.column("class_id").to_pylist() == [1, 1, 2]
+
+
+    def test_csv_append(self, tmp_path):
+        with CsvWriter(str(tmp_path)) as writer:
+            writer.write(self.courses[:1])
+        with CsvWriter(str(tmp_path), append=True) as writer:
+            writer.write(self.courses[1:])
+
+        with open(tmp_path / "courses.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["code"] for row in rows] == ["20", "21"]
+
+
+    def test_parquet_append(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        ParquetWriter(str(tmp_path)).close()
+
+        with pytest.raises(ValueError):
+            ParquetWriter(str(tmp_path), append=True)
+
+
+    def test_abstract(self):
+        class Incomplete(TableWriter):
+            pass
+
+        with pytest.raises(TypeError):
+            Writer()
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+    def test_guess_format(self):
+        assert guess_format("out.jsonl") == "jsonl"
+        assert guess_format("-") == "jsonl"
+        assert guess_format("catalog.db") == "sqlite"
+        with pytest.raises(ValueError):
+            guess_format("catalog")
+
+
+class TestExportCommand(object):
+
+    @classmethod
+    def setup_class(cls):
+        documents = {
+            subject: search_xml(*(
+                course_xml(subject=subject, code=str(i), course_id=i)
+                for i in range(10)
+            ))
+            for subject in ("MATH", "CS", "PHYSICS")
+        }
+        cls.server = FixtureServer(documents).start()
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.stop()
+
+
+    def test_sqlite(self, tmp_path, capsys):
+        path = str(tmp_path / "catalog.db")
+        args = ["export", path, "--url", self.server.url, "-w", "2"]
+        args += ["-s", "MATH", "-s", "CS", "-s", "PHYSICS"]
+
+        assert main(args) == 0
+        assert "3/3 units, 30 courses" in capsys.readouterr().err
+        db = sqlite3.connect(path)
+        assert db.execute("SELECT COUNT(*) FROM sections").fetchone() == (30,)
+
+
+    def test_all_subjects(self, tmp_path):
+        documents = {"schools": schools_xml({"School of Humanities": ["MATH", "CS"]})}
+        path = str(tmp_path / "catalog.jsonl")
+        with FixtureServer(documents) as server:
+            assert main(["export", path, "--url", server.url, "-q"]) == 0
+
+        # The schools are listed once, for both the progress total and the crawl
+        assert server.requests == 3
+
+
+    def test_checkpoint(self, tmp_path, capsys, monkeypatch):
+        checkpoint = str(tmp_path / "export.json")
+        path = str(tmp_path / "catalog.jsonl")
+        args = ["export", path, "--url", self.server.url, "-w", "1"]
+        args += ["-s", "MATH", "-s", "CS", "-s", "PHYSICS", "--checkpoint", checkpoint]
+
+        # Interrupt the export while it writes the second subject
+        write = JsonlWriter.write
+        calls = []
+
+        def interrupted_write(writer, courses):
+            calls.append(courses)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            write(writer, courses)
+
+        monkeypatch.setattr(JsonlWriter, "write", interrupted_write)
+        with pytest.raises(KeyboardInterrupt):
+            main(args)
+        monkeypatch.setattr(JsonlWriter, "write", write)
+        assert len(Checkpoint(checkpoint)) == 1
+        capsys.readouterr()
+
+        assert main(args) == 0
+        assert "2/2 units, 20 courses" in capsys.readouterr().err
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        assert sorted((r["subject"], r["code"]) for r in records) == sorted(
+            (subject, str(i))
+            for subject in ("MATH", "CS", "PHYSICS")
+            for i in range(10)
+        )
+        assert len(Checkpoint(checkpoint)) == 3
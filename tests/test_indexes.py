@@ -0,0 +1,133 @@
+import pytest
+
+from explorecourses import *
+
+from tests.samples import (
+    course,
+    course_xml,
+    instructor_xml,
+    schedule_xml,
+    search_xml,
+    section_xml,
+)
+
+
+class TestCrosslistIndex(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.cs229 = course(subject="CS", code="229", course_id=1, class_id=10)
+        cls.stats229 = course(subject="STATS", code="229", course_id=1, class_id=11)
+        cls.math51 = course(subject="MATH", code="51", course_id=2, class_id=20)
+        cls.index = CrosslistIndex([cls.cs229, cls.stats229, cls.math51])
+
+    def test_lookup(self):
+        assert len(self.index) == 2
+        assert "cs  229" in self.index
+        assert "CS 230" not in self.index
+        assert self.index["CS 229"] is self.index.course("STATS 229")
+        assert self.index.listings("CS 229") == (self.cs229, self.stats229)
+        assert self.index.course_by_id(2).course_code == ("MATH 51",)
+        assert self.index.course_by_class_id(11) is self.index["CS 229"]
+        assert self.index.section(20) is next(iter(self.math51.sections))
+
+        with pytest.raises(KeyError):
+            self.index["CS 230"]
+
+
+    def test_unnormalized_codes(self):
+        index = CrosslistIndex(
+            [course(subject="MATH", code="10x", course_id=3, class_id=30)]
+        )
+
+        assert "MATH 10x" in index
+        assert "math 10X" in index
+        assert index["MATH 10X"].course_id == 3
+
+
+    def test_single_year(self):
+        with pytest.raises(ValueError):
+            CrosslistIndex([
+                self.cs229,
+                course(
+                    subject="CS", code="229", course_id=1, class_id=10, year="2018-2019"
+                ),
+            ])
+
+
+class TestInstructorIndex(object):
+
+    @classmethod
+    def setup_class(cls):
+        jchw = instructor_xml("jchw", "Wilson, J.")
+        dcant = instructor_xml("dcant", "Cant, D.", role="TA")
+        cls.courses = CourseParser().parse(search_xml(
+            course_xml(code="19", course_id=1, sections=[
+                section_xml(class_id=10, schedules=[schedule_xml(instructors=[jchw])]),
+                section_xml(class_id=11, schedules=[
+                    schedule_xml(instructors=[jchw, dcant]),
+                    schedule_xml(days="Tuesday", instructors=[jchw]),
+                ]),
+            ]),
+            course_xml(code="20", course_id=2, sections=[
+                section_xml(class_id=20, schedules=[schedule_xml(instructors=[dcant])]),
+            ]),
+        ))
+        cls.index = InstructorIndex(cls.courses)
+
+    def test_teaching(self):
+        assert len(self.index) == 2
+        assert len(self.index["jchw"]) == 3
+        assert [c.code for c in self.index.courses("dcant")] == ["19", "20"]
+        assert [s.class_id for s in self.index.sections("jchw")] == [10, 11]
+        assert self.index["nobody"] == ()
+
+
+    def test_shared_instructors(self):
+        instructors = [
+            instructor
+            for _, _, schedule in self.index["jchw"]
+            for instructor in schedule.instructors
+            if instructor.sunet == "jchw"
+        ]
+
+        assert all(instr is self.index.instructor("jchw") for instr in instructors)
+
+
+class TestTermIndex(object):
+
+    @classmethod
+    def setup_class(cls):
+        winter = dict(term="2017-2018 Winter", term_id=1184)
+        cls.courses = CourseParser().parse(search_xml(
+            course_xml(code="19", course_id=1, sections=[
+                section_xml(class_id=12),
+                section_xml(class_id=10),
+                section_xml(class_id=11, **winter),
+            ]),
+            course_xml(code="20", course_id=2, sections=[
+                section_xml(class_id=20, **winter),
+            ]),
+            course_xml(code="21", course_id=3, sections=[]),
+        ))
+        cls.index = TermIndex(cls.courses)
+
+    def test_partition(self):
+        math19, math20, _ = self.courses
+        autumn = self.index[1182]
+
+        assert [view.term_id for view in self.index] == [1182, 1184]
+        assert autumn.term == "2017-2018 Autumn"
+        assert autumn.courses == [math19]
+        assert [s.class_id for s in autumn.sections(math19)] == [10, 12]
+        assert math20 not in autumn
+        assert autumn.sections(math20) == ()
+        assert self.index.term("2017-2018 Winter").courses == [math19, math20]
+
+
+    def test_missing_term(self):
+        assert self.index.get(1186) is None
+        with pytest.raises(KeyError):
+            self.index[1186]
+        with pytest.raises(KeyError):
+            self.index.term("2017-2018 Spring")
@@ -0,0 +1,79 @@
+import pytest
+
+from explorecourses import *
+
+from tests.samples import course, section_xml
+
+
+class TestMergedCourse(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.math20 = course(subject="MATH", code="20", course_id=1)
+        cls.stats20 = course(subject="STATS", code="20", course_id=1)
+        cls.math21 = course(subject="MATH", code="21", course_id=2)
+
+    def test_merge(self):
+        merged = sorted(merge_crosslistings([self.stats20, self.math21, self.math20]))
+
+        assert [m.course_code for m in merged] == [
+            ("MATH 20", "STATS 20"), ("MATH 21",)
+        ]
+        assert merged[0][1] is self.stats20
+
+
+    def test_validate(self):
+        other = course(subject="STATS", code="20", course_id=1, description="Other")
+
+        assert len(merge_crosslistings([self.math20, other])) == 1
+        with pytest.raises(ValueError):
+            merge_crosslistings([self.math20, other], validate=True)
+        with pytest.raises(ValueError):
+            MergedCourse.from_listings([self.math20, self.math21])
+
+
+    def test_incremental(self):
+        index = MergedIndex([self.math20, self.math21])
+
+        assert len(index) == 2
+        assert index[("2017-2018", 1)].course_code == ("MATH 20",)
+
+        untouched = index.get("2017-2018", 2)
+        updated = index.add([self.stats20])
+
+        assert [m.course_code for m in updated] == [("MATH 20", "STATS 20")]
+        assert index[("2017-2018", 1)].course_code == ("MATH 20", "STATS 20")
+        assert index.get("2017-2018", 2) is untouched
+
+        refreshed = course(
+            subject="MATH", code="20", course_id=1,
+            sections=[section_xml(course_id=1, num_enrolled=5)],
+        )
+        index.add([refreshed])
+
+        assert len(index[("2017-2018", 1)]) == 2
+        assert index[("2017-2018", 1)][0] is refreshed
+
+
+    def test_moved_and_removed(self):
+        index = MergedIndex([self.math20, self.stats20, self.math21])
+        moved = course(subject="STATS", code="20", course_id=3)
+
+        updated = index.add([moved])
+
+        assert sorted(m.course_code for m in updated) == [("MATH 20",), ("STATS 20",)]
+        assert index[("2017-2018", 1)].course_code == ("MATH 20",)
+        assert index[("2017-2018", 3)][0] is moved
+
+        assert index.remove([self.math21, moved]) == []
+        assert index.remove([self.math21]) == []
+        assert ("2017-2018", 2) not in index
+        assert [m.course_code for m in index] == [("MATH 20",)]
+
+
+    def test_moved_within_batch(self):
+        moved = course(subject="MATH", code="20", course_id=2)
+        index = MergedIndex([self.math20, moved])
+
+        assert len(index) == 1
+        assert index[("2017-2018", 2)][0] is moved
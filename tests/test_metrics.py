@@ -0,0 +1,94 @@
+import pytest
+import requests
+
+from explorecourses import *
+from explorecourses.fixture_server import FixtureServer
+
+from tests.fakes import FakeTransport, make_response
+from tests.samples import course_xml, search_xml
+
+
+class TestMetricsTotals(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.doc = search_xml(
+            course_xml(course_id=1, code="1"), course_xml(course_id=2, code="2")
+        )
+
+    def test_server(self):
+        metrics = MetricsTotals()
+        with FixtureServer({"MATH": self.doc}) as server:
+            with CourseConnection(server.url, metrics=metrics) as connection:
+                connection.courses_by_subject("MATH")
+                connection.courses_by_subject("MATH")
+
+        assert metrics.requests == 2
+        assert metrics.not_modified == 1
+        assert metrics.bytes == len(self.doc)
+        assert metrics.first_byte > 0
+        assert metrics.parses == 1
+        assert metrics.courses == 2
+        assert metrics.fromstring > 0
+        assert metrics.from_xml > 0
+
+
+    def test_memo_and_retries(self):
+        metrics = MetricsTotals()
+        transport = FakeTransport([
+            make_response(503),
+            make_response(200, self.doc),
+            make_response(200, self.doc + b" "),
+        ])
+        connection = CourseConnection(transport=transport, backoff=0, metrics=metrics)
+        connection.courses_by_subject("MATH")
+        connection.courses_by_subject("MATH")
+
+        assert metrics.retries == 1
+        assert metrics.requests == 3
+        assert metrics.parses == 2
+        assert metrics.courses == 4
+        assert metrics.reused == 2
+
+        metrics.reset()
+        assert metrics == MetricsTotals()
+
+
+    def test_error_not_retried(self):
+        metrics = MetricsTotals()
+        transport = FakeTransport([make_response(404)])
+        connection = CourseConnection(transport=transport, metrics=metrics)
+
+        with pytest.raises(requests.HTTPError):
+            connection.schools()
+        assert metrics.requests == 1
+        assert metrics.retries == 0
+
+
+class TestPrometheusMetrics(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.prometheus_client = pytest.importorskip("prometheus_client")
+
+    def test_export(self):
+        registry = self.prometheus_client.CollectorRegistry()
+        metrics = PrometheusMetrics(registry=registry)
+        doc = search_xml(course_xml())
+        transport = FakeTransport([make_response(200, doc)])
+        CourseConnection(transport=transport, metrics=metrics).courses_by_subject("X")
+
+        value = registry.get_sample_value
+        labels = {"endpoint": "search", "status": "200"}
+        assert value("explorecourses_requests_total", labels) == 1
+        assert value(
+            "explorecourses_response_bytes_total", {"endpoint": "search"}
+        ) == len(doc)
+        assert value("explorecourses_courses_total") == 1
+        assert value(
+            "explorecourses_parse_seconds_count", {"phase": "from_xml"}
+        ) == 1
+        assert value(
+            "explorecourses_request_seconds_count",
+            {"endpoint": "search", "phase": "download"},
+        ) == 1
@@ -0,0 +1,49 @@
+from explorecourses import *
+
+from tests.fakes import CatalogTransport
+from tests.samples import course_xml, search_xml
+
+
+def catalog(year, *codes, title="Calculus"):
+    return search_xml(*(
+        course_xml(year=year, code=code, course_id=int(code), title=title)
+        for code in codes
+    ))
+
+
+class TestMultiYearCatalog(object):
+
+    @classmethod
+    def setup_class(cls):
+        transport = CatalogTransport({
+            ("20172018", "MATH"): catalog("2017-2018", "19", "20"),
+            ("20182019", "MATH"): catalog("2018-2019", "20", "21"),
+            ("20192020", "MATH"): catalog("2019-2020", "20", title="Integrals"),
+        })
+        connection = CourseConnection(transport=transport, retries=0)
+        cls.catalog = MultiYearCatalog.load(
+            ["2019-2020", "2017-2018", "2018-2019"], ["MATH"], connection=connection
+        )
+
+    def test_load(self):
+        assert self.catalog.years == ["2017-2018", "2018-2019", "2019-2020"]
+        assert len(self.catalog) == 5
+        assert [c.code for c in self.catalog["2018-2019"]] == ["20", "21"]
+
+
+    def test_timeline(self):
+        timeline = self.catalog.timeline(20)
+
+        assert list(timeline) == ["2017-2018", "2018-2019", "2019-2020"]
+        assert timeline["2019-2020"][0].title == "Integrals"
+        assert list(self.catalog.timeline(19)) == ["2017-2018"]
+        assert self.catalog.timeline(99) == {}
+
+
+    def test_shared_values(self):
+        old, new = self.catalog["2017-2018"][1], self.catalog["2018-2019"][0]
+
+        assert old is not new
+        assert old.description is new.description
+        assert old.learning_objectives is new.learning_objectives
+        assert old.administrative_information is new.administrative_information
@@ -0,0 +1,163 @@
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from explorecourses import *
+from explorecourses.parsing import CourseParser
+from explorecourses.serialization import dumps
+
+from tests.samples import course_xml, section_xml, search_xml
+
+
+class TestCourseParser(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.math19 = course_xml(code="19", course_id=117227)
+        cls.math20 = course_xml(code="20", course_id=117229)
+        cls.math20_full = course_xml(
+            code="20",
+            course_id=117229,
+            sections=[section_xml(num_enrolled=60, enroll_status="Closed")],
+        )
+
+    def test_parse(self):
+        courses = CourseParser().parse(search_xml(self.math19, self.math20))
+
+        assert [c.course_code for c in courses] == ["MATH 19", "MATH 20"]
+        assert courses[1] == Course.from_xml(ET.fromstring(self.math20))
+
+
+    def test_reuse_unchanged(self):
+        parser = CourseParser()
+        math19, math20 = parser.parse(search_xml(self.math19, self.math20))
+        new19, new20 = parser.parse(search_xml(self.math19, self.math20_full))
+
+        assert new19 is math19
+        assert new20 is not math20
+        assert next(iter(new20.sections)).num_enrolled == 60
+        assert len(parser) == 3
+
+
+    def test_bounded(self):
+        parser = CourseParser(maxsize=1)
+        math19, _ = parser.parse(search_xml(self.math19, self.math20))
+        new19, _ = parser.parse(search_xml(self.math19, self.math20))
+
+        assert len(parser) == 1
+        assert new19 is not math19
+
+
+    def test_bounded_pool(self):
+        parser = CourseParser(maxsize=0, pool_size=10)
+        for _ in range(3):
+            parser.parse(search_xml(self.math19, self.math20))
+
+            assert 0 < len(parser.pool) <= 10
+
+        pool = Pool(2)
+        first = pool(str(12345))
+        pool("b")
+        pool("c")
+        assert len(pool) == 1
+        assert pool(str(12345)) is not first
+
+
+    def test_truncated(self):
+        doc = search_xml(self.math19, self.math20)
+
+        with pytest.raises(ET.ParseError):
+            CourseParser().parse(doc[:len(doc) // 2])
+        with pytest.raises(ET.ParseError):
+            CourseParser().parse(doc[:-10])
+
+
+    def test_parse_chunks(self):
+        doc = search_xml(self.math19, self.math20, self.math19)
+        parser = CourseParser()
+        courses = parser.parse(doc)
+
+        for size in (1, 7, 9, len(doc)):
+            chunks = (doc[i:i + size] for i in range(0, len(doc), size))
+            assert CourseParser().parse_chunks(chunks) == courses
+        chunks = (doc[i:i + 7] for i in range(0, len(doc), 7))
+        assert all(
+            new is old for new, old in zip(parser.parse_chunks(chunks), courses)
+        )
+
+
+    def test_chunks_truncated(self):
+        doc = search_xml(self.math19, self.math20)
+        half = doc[:len(doc) // 2]
+
+        with pytest.raises(ET.ParseError):
+            CourseParser().parse_chunks(half[i:i + 5] for i in range(0, len(half), 5))
+
+
+    def test_lazy_description(self):
+        doc = search_xml(course_xml(description="R&amp;amp;D &amp;lt;3"), self.math19)
+        rd, math19 = CourseParser().parse(doc)
+
+        assert rd.raw_description == "R&amp;D &lt;3"
+        assert "description" not in vars(rd)
+        assert rd.description == "R&D <3"
+        assert rd.description is rd.description
+        assert math19.description is math19.raw_description
+
+
+    def test_invalid_fields(self):
+        doc = search_xml(
+            course_xml(code="21", course_id="", sections=[]),
+            course_xml(sections=[
+                section_xml(class_id=1, num_enrolled=""),
+                section_xml(class_id="x"),
+            ]),
+        )
+
+        with pytest.warns(DecodeWarning) as record:
+            courses = CourseParser().parse(doc)
+
+        assert [c.course_code for c in courses] == ["MATH 20"]
+        (section,) = courses[0].sections
+        assert section.class_id == 1
+        assert section.num_enrolled == 0
+        assert len(record) == 3
+
+
+    def test_missing_required_field(self):
+        elem = ET.fromstring("<administrativeInformation/>")
+
+        with pytest.raises(DecodeError):
+            AdministrativeInformation.from_xml(elem)
+
+
+    def test_invalid_course_fields(self):
+        empty_units = course_xml(code="21").replace(
+            "<unitsMin>3</unitsMin>", "<unitsMin></unitsMin>"
+        )
+        no_children = course_xml(code="22", objectives=()).replace(
+            "<learningObjectives></learningObjectives>", ""
+        )
+        head, rest = course_xml(code="23").split("<administrativeInformation>")
+        no_admin = head + rest.split("</administrativeInformation>")[1]
+        doc = search_xml(empty_units, no_children, no_admin, course_xml())
+
+        with pytest.warns(DecodeWarning) as record:
+            courses = CourseParser().parse(doc)
+
+        assert [c.course_code for c in courses] == ["MATH 21", "MATH 22", "MATH 20"]
+        assert courses[0].units_min == 0
+        assert courses[0].units_max == 3
+        assert courses[1].learning_objectives == frozenset()
+        assert len(record) == 2
+
+
+    def test_missing_description(self):
+        description = "<description>The definite integral.</description>"
+        doc = search_xml(course_xml().replace(description, ""))
+
+        (course,) = CourseParser().parse(doc)
+
+        assert course.raw_description == ""
+        assert course.description == ""
+        assert dumps(course)
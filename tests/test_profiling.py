@@ -0,0 +1,66 @@
+import pytest
+
+from explorecourses import *
+from explorecourses.cli import main
+from explorecourses.profiling import Profile
+
+from tests.samples import course_xml, search_xml
+
+
+class TestProfile(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.doc = search_xml(*(
+            course_xml(course_id=i, code=str(i)) for i in range(50)
+        ))
+
+    def test_folded(self):
+        with Profile() as profile:
+            courses = CourseParser(maxsize=0).parse(self.doc)
+
+        assert len(courses) == 50
+        folded = profile.folded()
+        leaves = [
+            stack.split(";")[-1] for stack in folded if "parsing:parse:" in stack
+        ]
+        assert any(leaf.startswith("classes:from_xml") for leaf in leaves)
+        assert all(weight >= 1 for weight in folded.values())
+
+
+    def test_allocations(self):
+        with Profile(memory=True) as profile:
+            courses = CourseParser(maxsize=0).parse(self.doc)
+
+        allocations = {alloc.function: alloc for alloc in profile.allocations()}
+        assert allocations["classes.Course.from_xml"].calls == len(courses)
+        assert allocations["classes.Section.from_xml"].size > 0
+        assert "Memory held" in profile.report()
+
+
+    def test_no_memory(self):
+        with Profile() as profile:
+            pass
+
+        with pytest.raises(ValueError):
+            profile.allocations()
+
+
+class TestProfileCommand(object):
+
+    def test_file(self, tmp_path, capsys):
+        path = tmp_path / "math.xml"
+        path.write_bytes(search_xml(course_xml(), course_xml(code="21")))
+        output = str(tmp_path / "out")
+
+        assert main(["profile", "--file", str(path), "--output", output]) == 0
+        assert "2 courses" in capsys.readouterr().out
+        assert (tmp_path / "out.prof").exists()
+        assert "from_xml" in (tmp_path / "out.folded").read_text()
+
+
+    def test_synthetic(self, tmp_path, capsys):
+        output = str(tmp_path / "out")
+
+        assert main(["profile", "--synthetic", "100", "-m", "-o", output]) == 0
+        assert "classes.Section.from_xml" in (tmp_path / "out.txt").read_text()
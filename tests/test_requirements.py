@@ -0,0 +1,42 @@
+import pytest
+
+from explorecourses import *
+
+from tests.samples import course_xml, search_xml
+
+
+class TestRequirementIndex(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.courses = CourseParser().parse(search_xml(
+            course_xml(code="19", course_id=1, gers="GER:DB-Math, WAY-FR"),
+            course_xml(code="20", course_id=2, gers="WAY-FR", objectives=("WAY-AQR",)),
+            course_xml(code="21", course_id=3, gers="", objectives=()),
+            course_xml(code="22", course_id=4, gers="WAY-SMA", objectives=()),
+        ))
+        cls.index = RequirementIndex(cls.courses)
+
+    def codes(self, courses):
+        return [course.code for course in courses]
+
+    def test_codes(self):
+        assert set(self.index.codes) == {"GER:DB-Math", "WAY-FR", "WAY-AQR", "WAY-SMA"}
+        assert self.index.masks[2] == 0
+        assert self.index.masks[1] == self.index.mask(["WAY-FR", "WAY-AQR"])
+
+
+    def test_query(self):
+        assert self.codes(self.index.query(all_of=["WAY-FR"])) == ["19", "20"]
+        assert self.codes(self.index.query(all_of=["WAY-FR", "WAY-AQR"])) == ["20"]
+        assert self.codes(self.index.query(any_of=["WAY-AQR", "WAY-SMA"])) == [
+            "20", "22"
+        ]
+        assert self.codes(self.index.query(all_of=["WAY-FR"], none_of=["WAY-AQR"])) == [
+            "19"
+        ]
+        assert self.index.query(all_of=["WAY-ER"]) == []
+        assert len(self.index.query()) == 4
+
+        with pytest.raises(KeyError):
+            self.index.mask(["WAY-ER"])
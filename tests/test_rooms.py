@@ -0,0 +1,60 @@
+from datetime import time
+
+from explorecourses import *
+
+from tests.samples import course_xml, schedule_xml, search_xml, section_xml
+
+
+class TestRoom(object):
+
+    def test_from_location(self):
+        assert Room.from_location("380-380C") == Room("380", "380C")
+        assert Room.from_location("Hewlett  200") == Room(None, "Hewlett 200")
+        assert Room.from_location("TBA") is None
+        assert Room.from_location(None) is None
+        assert str(Room("380", "380C")) == "380-380C"
+
+
+class TestRoomIndex(object):
+
+    @classmethod
+    def setup_class(cls):
+        courses = CourseParser().parse(search_xml(course_xml(sections=[
+            section_xml(class_id=1, schedules=[
+                schedule_xml("380-380C", "Monday Wednesday", "9:00:00 AM", "10:00:00 AM"),
+                schedule_xml("380-380C", "Monday", "9:30:00 AM", "11:00:00 AM"),
+                schedule_xml("380-380C", "Monday", "1:00:00 PM", "2:00:00 PM"),
+            ]),
+            section_xml(class_id=2, term_id=1184, schedules=[
+                schedule_xml("200-203", "Monday", "9:00:00 AM", "5:00:00 PM"),
+            ]),
+        ])))
+        cls.room = Room("380", "380C")
+        cls.index = RoomIndex(courses, term_id=1182)
+
+    def test_rooms(self):
+        assert len(self.index) == 1
+        assert self.index.rooms("380") == [self.room]
+        assert [o.start for o in self.index.occupancy(self.room, "Monday")] == [
+            540, 570, 780
+        ]
+
+
+    def test_utilization(self):
+        assert self.index.utilization(
+            self.room, time(8), time(12), ["Monday"]
+        ) == 0.5
+        assert self.index.utilization(
+            self.room, time(9, 30), time(13, 30), ["Monday", "Wednesday"]
+        ) == (120 + 30) / 480
+        assert self.index.utilization(Room("1", "2")) == 0
+
+
+    def test_free_slots(self):
+        assert self.index.free_slots(self.room, "Monday", time(8), time(15)) == [
+            (time(8), time(9)), (time(11), time(13)), (time(14), time(15))
+        ]
+        assert self.index.free_slots(
+            self.room, "Monday", time(8), time(15), min_length=90
+        ) == [(time(11), time(13))]
+        assert self.index.free_slots(self.room, "Friday") == [(time(8), time(18))]
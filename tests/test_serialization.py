@@ -0,0 +1,139 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from explorecourses import *
+from explorecourses.diff import diff_course
+from explorecourses.serialization import (
+    dumps,
+    from_dict,
+    iter_jsonl,
+    load_jsonl,
+    loads,
+    to_dict,
+    write_jsonl,
+)
+
+from tests.samples import (
+    course_xml,
+    instructor_xml,
+    schedule_xml,
+    schools_xml,
+    search_xml,
+    section_xml,
+)
+
+
+class TestSerialization(object):
+
+    @classmethod
+    def setup_class(cls):
+        instructors = [instructor_xml(), instructor_xml("ada", "Lovelace, Ada")]
+        sections = [
+            section_xml(class_id=2, schedules=[schedule_xml(instructors=instructors)]),
+            section_xml(class_id=1, schedules=[]),
+        ]
+        cls.courses = CourseParser().parse(search_xml(
+            course_xml(
+                title="Calculus (MATH 20, CME 20)",
+                description="Limits &amp;amp; series",
+                sections=sections,
+            ),
+            course_xml(subject="CME", title="Calculus (MATH 20, CME 20)"),
+            course_xml(code="21", course_id=117230, objectives=()),
+        ))
+
+    def assert_same(self, a, b):
+        # Courses compare by key only, so compare all fields
+        assert to_dict(a) == to_dict(b)
+        assert a.sections == b.sections
+        assert a.administrative_information == b.administrative_information
+
+    def test_course_round_trip(self):
+        for course in self.courses:
+            loaded = loads(Course, dumps(course))
+            self.assert_same(loaded, course)
+            assert diff_course(course, loaded).changes == ()
+
+
+    def test_course_dict(self):
+        record = to_dict(self.courses[0])
+
+        assert record["description"] == "Limits & series"
+        assert record["gers"] == ["GER:DB-Math", "WAY-FR"]
+        assert [section["class_id"] for section in record["sections"]] == [1, 2]
+        assert len(record["sections"][1]["schedules"][0]["instructors"]) == 2
+        assert json.loads(json.dumps(record)) == record
+
+
+    def test_deterministic(self):
+        # Set iteration order depends on string hashing, which varies between runs
+        script = (
+            "from explorecourses.serialization import dumps\n"
+            "from tests.test_serialization import TestSerialization as T\n"
+            "T.setup_class()\n"
+            "print(dumps(T.courses[0]))\n"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                env={**os.environ, "PYTHONHASHSEED": str(seed)},
+                capture_output=True,
+                check=True,
+            ).stdout
+            for seed in range(5)
+        }
+
+        assert len(outputs) == 1
+
+
+    def test_merged_course(self):
+        merged = merge_crosslistings(self.courses)
+        crosslisted = next(course for course in merged if len(course) == 2)
+        loaded = loads(MergedCourse, dumps(crosslisted))
+
+        assert loaded == crosslisted
+        assert loaded.title == "Calculus"
+        for a, b in zip(loaded, crosslisted):
+            self.assert_same(a, b)
+
+
+    def test_school(self):
+        doc = schools_xml({"School of Engineering": ["CS", "EE"]})
+        school = School.from_xml(ET.fromstring(doc).find(".//school"))
+
+        assert from_dict(School, to_dict(school)) == school
+
+
+    def test_unsupported(self):
+        with pytest.raises(TypeError):
+            to_dict({"title": "Calculus"})
+        with pytest.raises(TypeError):
+            from_dict(dict, {})
+
+
+    def test_jsonl(self, tmp_path):
+        path = str(tmp_path / "courses.jsonl")
+
+        assert write_jsonl(iter(self.courses), path) == 3
+        pool = Pool()
+        loaded = load_jsonl(path, Course, pool)
+        assert len(loaded) == 3
+        for a, b in zip(loaded, self.courses):
+            self.assert_same(a, b)
+        # Values shared across the records are stored once
+        assert loaded[0].gers is loaded[2].gers
+
+
+    def test_iter_jsonl(self):
+        buffer = io.StringIO()
+        write_jsonl(self.courses, buffer)
+        buffer.seek(0)
+
+        codes = [course.course_code for course in iter_jsonl(buffer)]
+        assert codes == [course.course_code for course in self.courses]
@@ -0,0 +1,258 @@
+import asyncio
+import json
+
+import requests
+
+from explorecourses import *
+from explorecourses.service import CatalogService, CatalogSnapshot, jsonl_loader
+from explorecourses.serialization import write_jsonl
+
+from tests.samples import (
+    course_xml,
+    instructor_xml,
+    schedule_xml,
+    search_xml,
+    section_xml,
+)
+
+
+def catalog(title="Calculus"):
+    ada = [instructor_xml("ada", "Lovelace, Ada")]
+    return CourseParser().parse(search_xml(
+        course_xml(title=title, sections=[
+            section_xml(class_id=1, schedules=[schedule_xml(
+                days="Monday Wednesday", start="10:30:00 AM", end="11:50:00 AM"
+            )]),
+        ]),
+        course_xml(
+            subject="CS",
+            code="106A",
+            course_id=2,
+            title="Programming Methodology",
+            gers="WAY-AQR",
+            objectives=("WAY-AQR",),
+            sections=[
+                section_xml(
+                    class_id=2,
+                    course_id=2,
+                    subject="CS",
+                    code="106A",
+                    schedules=[schedule_xml(
+                        days="Wednesday", start="11:30:00 AM", end="12:20:00 PM",
+                        instructors=ada,
+                    )],
+                ),
+                section_xml(
+                    class_id=3,
+                    course_id=2,
+                    subject="CS",
+                    code="106A",
+                    term="2017-2018 Winter",
+                    term_id=1184,
+                    component="DIS",
+                    schedules=[schedule_xml(days="Wednesday", instructors=ada)],
+                ),
+            ],
+        ),
+    ))
+
+
+class TestCatalogSnapshot(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.snapshot = CatalogSnapshot(catalog())
+
+    def codes(self, courses):
+        return [course.course_code for course in courses]
+
+
+    def test_lookups(self):
+        assert self.codes(self.snapshot.subject("cs")) == ["CS 106A"]
+        assert self.codes(self.snapshot.course("cs 106a")) == ["CS 106A"]
+        assert self.codes(self.snapshot.search("programming cs")) == ["CS 106A"]
+        assert self.codes(self.snapshot.instructor("ada")) == ["CS 106A"]
+
+
+    def test_filter(self):
+        assert self.codes(self.snapshot.filter(gers=["WAY-AQR"])) == ["CS 106A"]
+        assert self.snapshot.filter(gers=["WAY-XX"]) == []
+        assert self.codes(self.snapshot.filter(term_id=1184)) == ["CS 106A"]
+        assert self.codes(self.snapshot.filter(component="LEC")) == [
+            "CS 106A",
+            "MATH 20",
+        ]
+        assert self.snapshot.filter(subject="MATH", units=5) == []
+        # The component must be offered in the term
+        assert self.snapshot.filter(term_id=1184, component="LEC") == []
+        assert self.codes(self.snapshot.filter(term_id=1184, component="DIS")) == [
+            "CS 106A"
+        ]
+        assert self.snapshot.filter(term_id=1186) == []
+
+
+    def test_conflicts(self):
+        conflicts = self.snapshot.conflicts([1, 2, 3, 99])
+
+        assert [c.to_dict() for c in conflicts] == [
+            {"class_ids": [1, 2], "term_id": 1182, "days": ["Wednesday"]}
+        ]
+
+
+    def test_encode(self):
+        records = json.loads(self.snapshot.encode(self.snapshot.courses))
+
+        assert [r["code"] for r in records] == ["106A", "20"]
+
+
+class TestCatalogService(object):
+
+    def run(self, scenario, loader, **kwargs):
+        async def main():
+            service = await CatalogService(loader, **kwargs).start()
+            try:
+                return await scenario(service)
+            finally:
+                await service.stop()
+
+        return asyncio.run(main())
+
+    async def get(self, service, path):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: requests.get(service.url + path, timeout=5)
+        )
+
+
+    def test_endpoints(self):
+        async def scenario(service):
+            return [
+                await self.get(service, path)
+                for path in (
+                    "health",
+                    "subjects/MATH",
+                    "courses/CS%20106A",
+                    "search?q=calc",
+                    "filter?ger=WAY-AQR&term_id=1184",
+                    "instructors/ada",
+                    "conflicts?class_id=1&class_id=2",
+                    "courses/CS%20999",
+                    "filter?units=many",
+                    "search?q=x&limit=-1",
+                    "nowhere",
+                )
+            ]
+
+        responses = self.run(scenario, catalog)
+
+        assert responses[0].json()["courses"] == 2
+        assert [r.json()[0]["code"] for r in responses[1:6]] == [
+            "20",
+            "106A",
+            "20",
+            "106A",
+            "106A",
+        ]
+        assert responses[6].json()[0]["class_ids"] == [1, 2]
+        assert [r.status_code for r in responses[7:]] == [404, 400, 400, 404]
+
+
+    def test_head(self):
+        async def scenario(service):
+            loop = asyncio.get_running_loop()
+            head = await loop.run_in_executor(
+                None, lambda: requests.head(service.url + "subjects/MATH", timeout=5)
+            )
+            get = await self.get(service, "subjects/MATH")
+            return head, get
+
+        head, get = self.run(scenario, catalog)
+
+        assert head.status_code == 200
+        assert head.content == b""
+        assert int(head.headers["Content-Length"]) == len(get.content)
+
+
+    def test_connections(self):
+        async def exchange(service, request):
+            host, port = service._server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            # Read until the server closes the connection, or time out if it does not
+            try:
+                data = await asyncio.wait_for(reader.read(), 0.5)
+                closed = True
+            except asyncio.TimeoutError:
+                data = b""
+                closed = False
+            writer.close()
+            return closed, data
+
+        async def scenario(service):
+            return (
+                # A body is skipped, such that the next request is answered
+                await exchange(
+                    service,
+                    b"GET /health HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello"
+                    b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n",
+                ),
+                await exchange(service, b"GET /health HTTP/1.0\r\n\r\n"),
+                await exchange(
+                    service,
+                    b"GET /health HTTP/1.0\r\nConnection: keep-alive\r\n\r\n",
+                ),
+            )
+
+        body, http10, http10_keep_alive = self.run(scenario, catalog)
+
+        assert body[0] and body[1].count(b"HTTP/1.1 200 OK") == 2
+        assert http10[0] and b"Connection: close" in http10[1]
+        assert not http10_keep_alive[0]
+
+
+    def test_internal_error(self, monkeypatch, caplog):
+        def fail(snapshot, arg, params):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(CatalogService, "_health", staticmethod(fail))
+
+        async def scenario(service):
+            return [
+                await self.get(service, "health"),
+                await self.get(service, "subjects/MATH"),
+            ]
+
+        error, ok = self.run(scenario, catalog)
+
+        assert error.status_code == 500
+        assert ok.status_code == 200
+        assert "boom" in caplog.text
+
+
+    def test_refresh(self):
+        titles = iter(["Calculus", "Integral Calculus"])
+
+        async def scenario(service):
+            first = await self.get(service, "subjects/MATH")
+            await asyncio.sleep(0.2)
+            second = await self.get(service, "subjects/MATH")
+            return first.json()[0]["title"], second.json()[0]["title"]
+
+        def loader():
+            return catalog(next(titles, "Integral Calculus"))
+
+        assert self.run(scenario, loader, refresh_interval=0.05) == (
+            "Calculus",
+            "Integral Calculus",
+        )
+
+
+    def test_jsonl_snapshot(self, tmp_path):
+        path = str(tmp_path / "catalog.jsonl")
+        write_jsonl(catalog(), path)
+
+        async def scenario(service):
+            return (await self.get(service, "health")).json()
+
+        assert self.run(scenario, jsonl_loader(path))["courses"] == 2
@@ -0,0 +1,56 @@
+import pytest
+
+from explorecourses import *
+from explorecourses.fixture_server import FixtureServer
+from explorecourses.synthetic import SyntheticCatalog
+
+
+class TestSyntheticCatalog(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.catalog = SyntheticCatalog(300, seed=1)
+        cls.courses = CourseParser().parse(cls.catalog.document())
+
+    def test_deterministic(self):
+        assert SyntheticCatalog(300, seed=1).document() == self.catalog.document()
+        assert SyntheticCatalog(300, seed=2).document() != self.catalog.document()
+
+
+    def test_capacity(self):
+        full = SyntheticCatalog(2997, n_subjects=1)
+
+        assert len(full) == 2997
+        with pytest.raises(ValueError):
+            SyntheticCatalog(4000, n_subjects=1)
+        with pytest.raises(ValueError):
+            SyntheticCatalog(5900, n_subjects=2, crosslist_rate=1.0)
+
+
+    def test_shape(self):
+        merged = merge_crosslistings(self.courses, validate=True)
+
+        assert len(merged) == 300
+        assert len(self.courses) > 300
+        assert len(self.catalog.subjects) == 4
+        assert all(course.sections for course in self.courses)
+        assert {c.year for c in self.courses} == {"2017-2018"}
+        assert {s.term_id for c in self.courses for s in c.sections} <= {
+            1182, 1184, 1186, 1188
+        }
+
+
+    def test_subject_documents(self):
+        for subject in self.catalog.subjects:
+            courses = CourseParser().parse(self.catalog.document(subject))
+
+            assert courses
+            assert all(course.subject == subject for course in courses)
+
+
+    def test_fixture_server(self):
+        with FixtureServer(self.catalog.documents) as server:
+            connection = CourseConnection(server.url)
+            crawled = [c for _, courses in connection.crawl() for c in courses]
+
+        assert sorted(crawled) == sorted(self.courses)
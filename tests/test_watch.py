@@ -0,0 +1,42 @@
+from itertools import islice
+
+from explorecourses import *
+
+from tests.fakes import RoundTransport
+from tests.samples import course_xml, section_xml, search_xml
+
+
+def subject_doc(subject, code, course_id, **section):
+    return search_xml(course_xml(
+        subject=subject,
+        code=code,
+        course_id=course_id,
+        sections=[section_xml(
+            class_id=course_id, course_id=course_id, subject=subject, code=code,
+            **section
+        )],
+    ))
+
+
+class TestWatch(object):
+
+    def test_watch(self):
+        transport = RoundTransport({
+            "MATH": [
+                subject_doc("MATH", "20", 1),
+                subject_doc("MATH", "20", 1, num_enrolled=52),
+            ],
+            "CS": [
+                subject_doc("CS", "106A", 2),
+                subject_doc("CS", "106A", 2),
+                subject_doc("CS", "106A", 2, num_waitlist=3, enroll_status="Closed"),
+            ],
+        })
+        connection = CourseConnection(transport=transport, retries=0)
+        events = list(islice(connection.watch(["MATH", "CS"], interval=0), 3))
+
+        assert [(e.class_id, e.field, e.old, e.new) for e in events] == [
+            (1, "num_enrolled", 51, 52),
+            (2, "num_waitlist", 0, 3),
+            (2, "enroll_status", "Open", "Closed"),
+        ]